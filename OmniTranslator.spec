@@ -10,7 +10,7 @@ a = Analysis(
     datas=[
         ('config.json', '.'),
     ],
-    hiddenimports=['PySide6.QtXml'],
+    hiddenimports=['PySide6.QtXml', 'psutil'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -10,8 +10,10 @@ from dataclasses import dataclass
 
 from core.logging_config import setup_logging, get_logger
 from core.config_schema import ConfigSchema
+from core.model_admission import admit_model, report_rss_growth
 from core.audio import AudioCapture
 from core.transcriber import Transcriber
+from core.multi_translator import translator_from_config
 from core.translator import Translator
 from download_models import is_model_installed
 
@@ -139,7 +141,16 @@ class AppInitializer:
     def _init_transcriber(self, model_path: str) -> Transcriber:
         """Inicializa o transcritor com o modelo especificado."""
         try:
-            transcriber = Transcriber(model_path)
+            # Confere a RAM livre; pode cair para um modelo menor ou recusar
+            decision = admit_model(self.config.model_dump(), model_path)
+            if decision.message:
+                logger.warning(decision.message)
+            model_path = decision.model_path
+            with report_rss_growth(
+                f"Modelo {decision.model_type}", decision.required_mb
+            ):
+                transcriber = Transcriber(model_path, options=decision.options)
+            transcriber.warmup()
             logger.info(f"✓ Transcritor inicializado: {model_path}")
             return transcriber
         except Exception as e:
@@ -150,8 +161,8 @@ class AppInitializer:
     def _init_translator(self) -> Optional[Translator]:
         """Inicializa o tradutor se disponível."""
         try:
-            translator = Translator(
-                from_code=self.config.source_lang, to_code=self.config.target_lang
+            translator = translator_from_config(
+                self.config.model_dump(), from_code=self.config.source_lang
             )
             logger.info(
                 f"✓ Tradutor inicializado: {self.config.source_lang} -> {self.config.target_lang}"
@@ -0,0 +1,131 @@
+"""
+Tradução offline com pacotes Argos (modelos OPUS-MT em CTranslate2).
+Roda na CPU com pesos quantizados (int8), sem ida à rede: cada frase deixa
+de pagar a latência do servidor e a tradução continua sem conexão.
+
+Mesma interface do GoogleTranslateClient (`translate(text) -> str`), mais
+`translate_batch` para o micro-batching traduzir o lote numa só chamada.
+"""
+
+import time
+from typing import List, Optional
+
+from core.google_translate import TranslationError
+from core.logging_config import get_logger
+from core.metrics import metrics
+from core.model_admission import model_cache
+
+logger = get_logger("ArgosTranslate")
+
+try:
+    import ctranslate2
+    import sentencepiece
+
+    HAS_ARGOS = True
+except ImportError:
+    HAS_ARGOS = False
+
+
+def _load_leg(package_dir: str, compute_type: str, inter: int, intra: int):
+    translator = ctranslate2.Translator(
+        f"{package_dir}/model",
+        device="cpu",
+        compute_type=compute_type,
+        inter_threads=inter,
+        intra_threads=intra,
+    )
+    tokenizer = sentencepiece.SentencePieceProcessor(
+        model_file=f"{package_dir}/sentencepiece.model"
+    )
+    return translator, tokenizer
+
+
+class ArgosTranslateClient:
+    """
+    Args:
+        packages: Pastas dos pacotes na ordem da tradução (duas com pivô)
+        compute_type: Quantização do CTranslate2 ("int8" = menor e mais rápido)
+        inter_threads: Traduções simultâneas (cada uma com intra_threads)
+        intra_threads: Threads por tradução (0 = automático)
+        beam_size: Largura do beam (1 = greedy, mais rápido)
+    """
+
+    def __init__(
+        self,
+        packages: List[str],
+        compute_type: str = "int8",
+        inter_threads: int = 1,
+        intra_threads: int = 0,
+        beam_size: int = 2,
+    ):
+        if not HAS_ARGOS:
+            raise TranslationError("ctranslate2/sentencepiece não instalados")
+        if not packages:
+            raise TranslationError("Nenhum pacote Argos para o par de idiomas")
+        self.beam_size = beam_size
+        try:
+            self._legs = [
+                model_cache.get(
+                    ("argos", path, compute_type, inter_threads, intra_threads),
+                    lambda path=path: _load_leg(
+                        path, compute_type, inter_threads, intra_threads
+                    ),
+                    owner=self,
+                )
+                for path in packages
+            ]
+        except (OSError, RuntimeError, ValueError) as e:
+            raise TranslationError(f"Falha ao carregar o modelo Argos: {e}")
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """Traduz o lote numa só chamada por modelo (frases já separadas)."""
+        for translator, tokenizer in self._legs:
+            tokens = tokenizer.encode(texts, out_type=str)
+            results = translator.translate_batch(
+                tokens, beam_size=self.beam_size, max_batch_size=16
+            )
+            texts = [tokenizer.decode(r.hypotheses[0]) for r in results]
+        return texts
+
+    def translate(self, text: str) -> str:
+        start = time.perf_counter()
+        try:
+            return self.translate_batch([text])[0]
+        except (RuntimeError, ValueError) as e:
+            metrics.increment("translate.errors")
+            raise TranslationError(f"Falha na tradução offline: {e}")
+        finally:
+            metrics.observe("translate.latency_s", time.perf_counter() - start)
+
+    def close(self):
+        self._legs = []
+
+
+def argos_client_from_config(
+    options, from_code: str, to_code: str
+) -> Optional[ArgosTranslateClient]:
+    """Cliente offline para o par, ou None (pacote ausente ou sem dependências)."""
+    from download_models import argos_route
+
+    if not HAS_ARGOS:
+        logger.warning(
+            "Tradução offline indisponível: instale ctranslate2 e sentencepiece"
+        )
+        return None
+    route = argos_route(
+        from_code, to_code, options.get("argos_model_dir", "model_argos")
+    )
+    if not route:
+        logger.warning(f"Pacote Argos {from_code} -> {to_code} não instalado")
+        return None
+    try:
+        return ArgosTranslateClient(
+            route,
+            compute_type=options.get("argos_compute_type", "int8"),
+            inter_threads=options.get("argos_inter_threads", 1),
+            intra_threads=options.get("argos_intra_threads", 0),
+            beam_size=options.get("argos_beam_size", 2),
+        )
+    except TranslationError as e:
+        logger.warning(str(e))
+        return None
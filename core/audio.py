@@ -104,10 +104,7 @@ class AudioCapture:
         audio_bytes = indata.tobytes()
         if len(audio_bytes) == 0: return
 
-        # 1. Store in pre-roll buffer
-        self.pre_roll_buffer.append(audio_bytes)
-
-        # 2. Basic detection (Energy + WebRTC)
+        # 1. Basic detection (Energy + WebRTC)
         audio_np = np.frombuffer(audio_bytes, dtype=np.int16)
         energy = np.sqrt(np.mean(audio_np.astype(np.float32)**2)) if len(audio_np) > 0 else 0
         
@@ -117,6 +114,9 @@ class AudioCapture:
                 raw_speech = self.vad.is_speech(audio_bytes, self.sample_rate) and raw_speech
             except: raw_speech = True
 
+        # 2. Store in pre-roll buffer, with the frame's own VAD decision
+        self.pre_roll_buffer.append((audio_bytes, bool(raw_speech), int(energy)))
+
         # 3. Duration Filtering (Ignore short noises like snaps)
         if raw_speech:
             self.speech_frames_count += 1
@@ -125,8 +125,8 @@ class AudioCapture:
                     print(f"VAD: Fala detectada (Energia: {energy:.0f})")
                     # When starting, push the pre-roll buffer so we don't lose the start of the word
                     if self.running:
-                        for frame in list(self.pre_roll_buffer)[:-1]: # All but current
-                            self.audio_queue.put((frame, True, energy))
+                        for frame, frame_speech, frame_energy in list(self.pre_roll_buffer)[:-1]: # All but current
+                            self.audio_queue.put((frame, True, frame_energy, frame_speech))
                 self.is_listening = True
                 self.silence_frames = 0
         else:
@@ -138,8 +138,9 @@ class AudioCapture:
                 self.is_listening = False
 
         # 4. Push current frame if listening
+        # (frame, is_listening with post-roll, energy, raw per-frame VAD decision)
         if self.running:
-            self.audio_queue.put((audio_bytes, bool(self.is_listening), int(energy)))
+            self.audio_queue.put((audio_bytes, bool(self.is_listening), int(energy), bool(raw_speech)))
 
     def get_audio(self):
         try:
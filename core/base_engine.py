@@ -3,10 +3,114 @@ Classe base abstrata para engines de reconhecimento de áudio.
 Reduz duplicação de código entre GoogleEngine, WhisperEngine, etc.
 """
 
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
+from dataclasses import dataclass, field
+from typing import Any, Tuple, Optional
 import numpy as np
 
+from core.metrics import metrics
+
+
+class RecognitionError(Exception):
+    """Falha ao executar o reconhecimento (rede, timeout, resposta inválida)."""
+
+    pass
+
+
+class SpeculativeDecision:
+    """
+    Decisão pendente de um segmento despachado especulativamente.
+
+    O engine confirma (commit) quando o silêncio se mantém até o limiar
+    completo, ou cancela quando a fala recomeça; o pipeline aguarda.
+    """
+
+    PENDING = "pending"
+    COMMITTED = "committed"
+    CANCELLED = "cancelled"
+
+    def __init__(self):
+        self.state = self.PENDING
+        self._event = threading.Event()
+
+    def commit(self) -> None:
+        if self.state == self.PENDING:
+            self.state = self.COMMITTED
+            self._event.set()
+
+    def cancel(self) -> None:
+        if self.state == self.PENDING:
+            self.state = self.CANCELLED
+            self._event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> str:
+        """Aguarda a decisão; sem decisão no timeout, considera cancelado."""
+        if not self._event.wait(timeout):
+            self.cancel()
+        return self.state
+
+
+@dataclass
+class AudioSegment:
+    """
+    Segmento de fala pronto para reconhecimento.
+
+    Attributes:
+        audio: Bytes PCM int16 do segmento completo
+        stream: Upload em streaming já em andamento (StreamingRecognizerClient)
+        speculative: Decisão pendente se o segmento foi despachado antes do
+            limiar de silêncio completo
+        previous: Chunk anterior do mesmo monólogo (cortado por tamanho);
+            o início deste segmento repete `overlap_s` segundos dele
+        text: Transcrição bruta, publicada pelo pipeline via set_text()
+            (no modo de tradução direta, o texto traduzido)
+        source_text: No modo de tradução direta, a transcrição original
+        features: Features já extraídas durante a fala (ex.: log-mel do Whisper)
+    """
+
+    audio: bytes
+    stream: Optional[Any] = None
+    speculative: Optional[SpeculativeDecision] = None
+    previous: Optional["AudioSegment"] = None
+    overlap_s: float = 0.0
+    features: Optional[Any] = None
+    text: Optional[str] = None
+    source_text: Optional[str] = None
+    _text_ready: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def duration(self, sample_rate: int = 16000) -> float:
+        return len(self.audio) / (sample_rate * 2)
+
+    def set_text(self, text: str, source_text: Optional[str] = None) -> None:
+        """Publica a transcrição bruta (usada na costura do chunk seguinte)."""
+        self.text = text
+        self.source_text = source_text
+        self._text_ready.set()
+
+    def wait_text(self, timeout: Optional[float] = None) -> Optional[str]:
+        self._text_ready.wait(timeout)
+        return self.text
+
+
+def synthetic_audio(sample_rate: int = 16000, duration_s: float = 1.0) -> bytes:
+    """
+    Gera áudio sintético (tom + ruído baixo) em PCM int16 para warm-up.
+
+    Args:
+        sample_rate: Taxa de amostragem
+        duration_s: Duração em segundos
+
+    Returns:
+        Bytes de áudio int16 mono
+    """
+    n = int(sample_rate * duration_s)
+    t = np.arange(n, dtype=np.float32) / sample_rate
+    rng = np.random.default_rng(0)
+    audio = 3000.0 * np.sin(2 * np.pi * 220.0 * t) + rng.normal(0, 300.0, n)
+    return np.clip(audio, -32768, 32767).astype(np.int16).tobytes()
+
 
 class BaseAudioEngine(ABC):
     """
@@ -23,6 +127,29 @@ class BaseAudioEngine(ABC):
         # Configuráveis por subclasses
         self.silence_threshold_frames = 15  # ~450ms padrão
         self.max_buffer_seconds = 6  # Segurança
+        self.min_segment_seconds = 0.4  # Evita ruídos/clicks
+
+        # Endpoint especulativo: despacha após uma pausa provisória do VAD
+        # bruto (None = desativado) e cancela se a fala recomeçar
+        self.speculative_silence_frames: Optional[int] = None
+        self.speech_resume_frames = 2
+        self.raw_silence_frames = 0
+        self.raw_speech_frames = 0
+        self._speculative: Optional[AudioSegment] = None
+
+        # Segmentador adaptativo (core.segmenter.AdaptiveSegmenter); quando
+        # presente, substitui os limiares fixos acima
+        self.segmenter = None
+
+        # Fala longa: corta no mínimo de energia perto do limite e repete
+        # `chunk_overlap_seconds` no início do chunk seguinte
+        self.chunk_overlap_seconds = 0.5
+        self.cut_search_seconds = 1.0
+        self._frames = []  # (offset no buffer, energia, fala bruta)
+        self._last_chunk: Optional[AudioSegment] = None
+
+        # Verificador de presença de fala (core.speech_gate.SpeechVerifier)
+        self.verifier = None
 
     @abstractmethod
     def recognize(self, audio_data_bytes: bytes) -> str:
@@ -32,60 +159,244 @@ class BaseAudioEngine(ABC):
         """
         pass
 
+    def recognize_segment(self, segment: AudioSegment) -> str:
+        """
+        Reconhece um AudioSegment. Subclasses podem sobrescrever para usar
+        dados extras do segmento; o padrão reconhece apenas o áudio.
+        """
+        return self.recognize(segment.audio)
+
+    def _on_audio(self, audio_bytes: bytes, is_speech: bool) -> None:
+        """Gancho chamado a cada chunk adicionado ao buffer."""
+        pass
+
+    def _build_segment(self, data: bytes) -> AudioSegment:
+        """Gancho para montar o segmento despachado ao pipeline."""
+        return AudioSegment(data)
+
+    def _discard_segment(self) -> None:
+        """
+        Gancho chamado quando o buffer é esvaziado sem despachar um segmento
+        novo (curto demais, rejeitado ou especulativo confirmado).
+        """
+        pass
+
+    def _buffer_seconds(self) -> float:
+        return len(self.buffer) / (self.sample_rate * 2)
+
+    def _find_cut(self) -> int:
+        """
+        Escolhe onde cortar um buffer que atingiu o tamanho máximo: o frame
+        de menor energia na janela final, preferindo silêncio do VAD bruto.
+
+        Returns:
+            Offset em bytes do corte (fim do frame escolhido)
+        """
+        window_start = len(self.buffer) - int(
+            min(self.cut_search_seconds, self._buffer_seconds() / 2)
+            * self.sample_rate
+            * 2
+        )
+        candidates = [f for f in self._frames if f[0] >= window_start]
+        if not candidates:
+            return len(self.buffer)
+        offset, _, _ = min(candidates, key=lambda f: (f[2], f[1]))
+        frame_end = [f[0] for f in self._frames if f[0] > offset]
+        return frame_end[0] if frame_end else len(self.buffer)
+
+    def _cut_long_segment(self) -> Tuple[bytes, list]:
+        """
+        Corta o buffer cheio, mantendo o resto (mais a sobreposição) para o
+        próximo chunk.
+
+        Returns:
+            Tupla (áudio do chunk, frames do chunk)
+        """
+        cut = self._find_cut()
+        overlap = int(self.chunk_overlap_seconds * self.sample_rate) * 2
+        keep_from = max(0, cut - overlap)
+        data = bytes(self.buffer[:cut])
+        frames = [f for f in self._frames if f[0] < cut]
+        self.buffer = self.buffer[keep_from:]
+        self._frames = [
+            (o - keep_from, e, r) for o, e, r in self._frames if o >= keep_from
+        ]
+        return data, frames
+
+    def _endpoint_reached(self) -> bool:
+        if self.segmenter:
+            return self.raw_silence_frames >= self.segmenter.silence_threshold_frames
+        return self.silence_frames >= self.silence_threshold_frames
+
+    def _max_segment_seconds(self) -> float:
+        if self.segmenter:
+            return self.segmenter.max_segment_seconds
+        return self.max_buffer_seconds
+
+    def _track_speculation(self, raw_speech: bool) -> Optional[AudioSegment]:
+        """
+        Atualiza o estado da especulação a partir do VAD bruto.
+
+        Returns:
+            Segmento especulativo a despachar, ou None
+        """
+        if raw_speech:
+            self.raw_silence_frames = 0
+            self.raw_speech_frames += 1
+            pending = self._speculative
+            if pending and self.raw_speech_frames >= self.speech_resume_frames:
+                # Fala recomeçou: descarta o resultado em voo e estende o segmento
+                pending.speculative.cancel()
+                self._speculative = None
+                metrics.increment("speculative.cancelled")
+                metrics.increment(
+                    "speculative.wasted_audio_s", pending.duration(self.sample_rate)
+                )
+            return None
+
+        self.raw_speech_frames = 0
+        self.raw_silence_frames += 1
+        if (
+            self.speculative_silence_frames
+            and self._speculative is None
+            and self.raw_silence_frames == self.speculative_silence_frames
+            and not self._endpoint_reached()
+            and self._buffer_seconds() >= self.min_segment_seconds
+            and (
+                self.verifier is None
+                or self.verifier.accept(
+                    self._frames, len(self.buffer), self.sample_rate, record=False
+                )
+            )
+        ):
+            segment = self._build_segment(bytes(self.buffer))
+            segment.speculative = SpeculativeDecision()
+            self._speculative = segment
+            metrics.increment("speculative.dispatched")
+            return segment
+        return None
+
     def process_audio(
-        self, audio_bytes: bytes, is_speech: bool
-    ) -> Tuple[Optional[str], Optional[bytes]]:
+        self, audio_bytes: bytes, is_speech: bool, raw_speech: Optional[bool] = None
+    ) -> Tuple[Optional[str], Optional[AudioSegment]]:
         """
         Processa um chunk de áudio e decide quando acionar o reconhecimento.
 
         Args:
             audio_bytes: Chunk de áudio em bytes
-            is_speech: Estado atual do VAD
+            is_speech: Estado atual do VAD (com post-roll)
+            raw_speech: Decisão do VAD só deste frame (None = usa is_speech)
 
         Returns:
             Tupla (status, data):
             - status: String vazia se processando, ou None
-            - data: Bytes do áudio para reconhecimento, ou None
+            - data: AudioSegment para reconhecimento, ou None
         """
+        raw = is_speech if raw_speech is None else raw_speech
         if audio_bytes:
+            samples = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32)
+            energy = float(np.sqrt(np.mean(samples**2))) if len(samples) else 0.0
+            self._frames.append((len(self.buffer), energy, bool(raw)))
             self.buffer.extend(audio_bytes)
-
-            # Proteção contra buffer muito grande
-            max_bytes = self.sample_rate * 2 * self.max_buffer_seconds
-            if len(self.buffer) > max_bytes:
-                # Mantém apenas os últimos 2 segundos
-                self.buffer = self.buffer[-(self.sample_rate * 2 * 2) :]
+            self._on_audio(audio_bytes, is_speech)
 
         if not is_speech:
             self.silence_frames += 1
         else:
             self.silence_frames = 0
 
+        if self.segmenter:
+            self.segmenter.observe_frame(raw)
+        speculative = self._track_speculation(raw)
+
         # Trigger: silêncio suficiente OU buffer muito cheio
-        silence_trigger = (
-            self.silence_frames >= self.silence_threshold_frames
-            and len(self.buffer) > 0
-        )
+        silence_trigger = self._endpoint_reached() and len(self.buffer) > 0
         safety_trigger = (
-            len(self.buffer) > self.sample_rate * 2 * self.max_buffer_seconds
+            len(self.buffer) > self.sample_rate * 2 * self._max_segment_seconds()
         )
 
         if silence_trigger or safety_trigger:
-            data = bytes(self.buffer)
-            duration_s = len(data) / (self.sample_rate * 2)
+            pending, self._speculative = self._speculative, None
+            if pending:
+                # Silêncio se manteve: o resultado especulativo vale
+                self.buffer.clear()
+                self._frames.clear()
+                self.silence_frames = 0
+                self._last_chunk = None
+                self._discard_segment()  # Ex.: log-mel do Whisper volta a zero
+                pending.speculative.commit()
+                metrics.increment("speculative.committed")
+                if self.segmenter:
+                    self.segmenter.observe_segment(pending.duration(self.sample_rate))
+                return None, None
 
-            # Reset
-            self.buffer.clear()
+            previous, overlap_s = self._last_chunk, 0.0
+            if previous is not None:
+                overlap_s = self.chunk_overlap_seconds
+            if silence_trigger:
+                data, frames = bytes(self.buffer), self._frames
+                self.buffer.clear()
+                self._frames = []
+                self._last_chunk = None
+            else:
+                # Fala contínua: corta em um vale de energia, com sobreposição
+                data, frames = self._cut_long_segment()
+            duration_s = len(data) / (self.sample_rate * 2)
             self.silence_frames = 0
 
             # Filtro de duração mínima (evita ruídos/clicks)
-            if duration_s < 0.4:  # 400ms mínimo
+            if duration_s < self.min_segment_seconds:
+                self._discard_segment()
+                if self.segmenter:
+                    self.segmenter.observe_endpoint()
                 return None, None
 
-            return ("", data)  # Status vazio = processando
+            # Verificador de fala: tosse/teclado/ruído não chegam ao ASR
+            if self.verifier and not self.verifier.accept(
+                frames, len(data), self.sample_rate
+            ):
+                self._discard_segment()
+                self._last_chunk = None
+                if self.segmenter:
+                    self.segmenter.observe_endpoint()
+                return None, None
+
+            # Só segmentos reconhecidos entram no tamanho típico do segmentador
+            if self.segmenter:
+                self.segmenter.observe_segment(duration_s)
+            segment = self._build_segment(data)
+            segment.previous, segment.overlap_s = previous, overlap_s
+            if (
+                safety_trigger
+                and not silence_trigger
+                and self.chunk_overlap_seconds > 0
+            ):
+                self._last_chunk = segment
+            return ("", segment)  # Status vazio = processando
+
+        if speculative:
+            speculative.previous = self._last_chunk
+            if self._last_chunk is not None:
+                speculative.overlap_s = self.chunk_overlap_seconds
+            return ("", speculative)
 
         return None, None
 
+    def warmup(self, duration_s: float = 1.0) -> float:
+        """
+        Executa um reconhecimento sobre áudio sintético para inicializar
+        kernels e alocadores antes da primeira fala real.
+
+        Args:
+            duration_s: Duração do áudio sintético em segundos
+
+        Returns:
+            Duração do warm-up em segundos
+        """
+        start = time.perf_counter()
+        self.recognize(synthetic_audio(self.sample_rate, duration_s))
+        return time.perf_counter() - start
+
     def normalize_audio(
         self, audio_np: np.ndarray, target_peak: float = 30000.0
     ) -> np.ndarray:
@@ -133,3 +444,10 @@ class BaseAudioEngine(ABC):
         self.buffer.clear()
         self.silence_frames = 0
         self.thinking = False
+        self.raw_silence_frames = 0
+        self.raw_speech_frames = 0
+        self._frames.clear()
+        self._last_chunk = None
+        if self._speculative:
+            self._speculative.speculative.cancel()
+            self._speculative = None
@@ -0,0 +1,130 @@
+"""
+Benchmark de fator de tempo real (RTF) dos engines na CPU local.
+
+Uso:
+    python -m core.benchmark whisper [--duration 5] [--runs 3] [--audio fala.wav]
+    python -m core.benchmark vosk --model models/small --grammar frases.txt
+
+RTF = tempo de reconhecimento / duração do áudio (abaixo de 1 = mais rápido
+que o tempo real).
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.base_engine import synthetic_audio
+
+
+def measure_rtf(
+    recognize: Callable[[bytes], str],
+    audio: bytes,
+    sample_rate: int = 16000,
+    runs: int = 3,
+) -> float:
+    """
+    Mede o RTF mediano de uma função de reconhecimento.
+
+    A primeira chamada é descartada (aquecimento de kernels/alocadores).
+    """
+    duration_s = len(audio) / (sample_rate * 2)
+    recognize(audio)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        recognize(audio)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) / duration_s
+
+
+def load_audio(path: Optional[str], sample_rate: int, duration_s: float) -> bytes:
+    """Lê um WAV mono 16 kHz (via soundfile) ou gera áudio sintético."""
+    if not path:
+        return synthetic_audio(sample_rate, duration_s)
+    import soundfile as sf
+
+    data, rate = sf.read(path, dtype="int16")
+    if rate != sample_rate:
+        raise ValueError(f"Esperado {sample_rate} Hz, arquivo tem {rate} Hz")
+    if data.ndim > 1:
+        data = data[:, 0]
+    return data.tobytes()
+
+
+def benchmark_whisper_profiles(
+    profiles: Optional[Iterable[str]] = None,
+    audio: Optional[bytes] = None,
+    sample_rate: int = 16000,
+    runs: int = 3,
+) -> Dict[str, float]:
+    """Retorna o RTF de cada perfil de decodificação do Whisper."""
+    from core.transcriber import WHISPER_PROFILES, WhisperEngine
+
+    audio = audio or synthetic_audio(sample_rate, 5.0)
+    results = {}
+    for profile in profiles or WHISPER_PROFILES:
+        engine = WhisperEngine(sample_rate, profile=profile)
+        results[profile] = measure_rtf(engine.recognize, audio, sample_rate, runs)
+        del engine
+    return results
+
+
+def benchmark_vosk_grammar(
+    model_path: str,
+    phrases: List[str],
+    audio: Optional[bytes] = None,
+    sample_rate: int = 16000,
+    runs: int = 3,
+) -> Dict[str, float]:
+    """
+    Compara o RTF do Vosk com vocabulário aberto e com gramática restrita,
+    no mesmo modelo carregado.
+    """
+    from core.transcriber import VoskEngine
+
+    audio = audio or synthetic_audio(sample_rate, 5.0)
+    engine = VoskEngine(model_path, sample_rate)
+    if not engine.model:
+        raise ValueError(f"Modelo Vosk não encontrado em {model_path}")
+    results = {"aberto": measure_rtf(engine.recognize, audio, sample_rate, runs)}
+    engine.set_grammar(phrases)
+    results["gramática"] = measure_rtf(engine.recognize, audio, sample_rate, runs)
+    return results
+
+
+def print_results(title: str, results: Dict[str, float]) -> None:
+    print(f"\n{title}")
+    print(f"{'perfil':<12}{'RTF':>8}  tempo real")
+    for name, rtf in results.items():
+        verdict = "sim" if rtf < 1.0 else "NÃO"
+        print(f"{name:<12}{rtf:>8.2f}  {verdict}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("engine", choices=["whisper", "vosk"])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--audio", help="WAV mono 16 kHz (padrão: sintético)")
+    parser.add_argument("--profiles", nargs="*")
+    parser.add_argument("--model", help="Vosk: caminho do modelo")
+    parser.add_argument("--grammar", help="Vosk: arquivo de frases (uma por linha)")
+    args = parser.parse_args(argv)
+
+    audio = load_audio(args.audio, 16000, args.duration)
+    if args.engine == "whisper":
+        results = benchmark_whisper_profiles(args.profiles, audio, runs=args.runs)
+        print_results("Whisper (RTF por perfil, CPU local)", results)
+    elif args.engine == "vosk":
+        if not args.model or not args.grammar:
+            parser.error("vosk requer --model e --grammar")
+        from core.transcriber import load_grammar
+
+        phrases = load_grammar({"vosk_grammar_file": args.grammar})
+        results = benchmark_vosk_grammar(args.model, phrases, audio, runs=args.runs)
+        print_results(f"Vosk ({len(phrases)} frases, CPU local)", results)
+
+
+if __name__ == "__main__":
+    main()
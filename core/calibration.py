@@ -0,0 +1,220 @@
+"""
+Calibração do fator de tempo real (RTF) dos engines locais nesta CPU.
+Mede cada engine instalado num clipe curto e recomenda o mais preciso que
+fica abaixo do RTF alvo; acima de 1 o backlog de áudio cresce sem parar.
+
+O clipe é fala de verdade: `calibration_audio` ou, por padrão, alguns
+segundos da própria fala do usuário gravados pelo pipeline. Num tom
+sintético os decodificadores quase não emitem texto e o RTF sai otimista.
+"""
+
+import os
+import wave
+from typing import Callable, Dict, List, Optional
+
+from core.benchmark import load_audio, measure_rtf
+from core.logging_config import get_logger
+from core.metrics import metrics
+from core.model_admission import (
+    available_memory_mb,
+    expected_resident_mb,
+    model_cache,
+)
+
+logger = get_logger("Calibration")
+
+# Engines locais, do mais preciso ao menos preciso
+ENGINE_RANKING = [
+    "whisper-accurate",
+    "big",
+    "whisper-balanced",
+    "whisper-fast",
+    "small",
+]
+
+# Folga para VAD, tradução e rajadas de fala
+DEFAULT_TARGET_RTF = 0.5
+
+CLIP_SECONDS = 5.0
+
+# Fala do usuário gravada para a calibração (ao lado do config.json)
+SPEECH_CLIP_PATH = "calibration_speech.wav"
+
+
+def calibration_clip(options: Optional[dict] = None) -> Optional[str]:
+    """WAV de fala para a calibração, ou None se ainda não houver um."""
+    path = (options or {}).get("calibration_audio")
+    if path:
+        return path
+    return SPEECH_CLIP_PATH if os.path.exists(SPEECH_CLIP_PATH) else None
+
+
+class SpeechClipRecorder:
+    """
+    Junta os frames com fala (VAD) até CLIP_SECONDS e grava o WAV do clipe.
+
+    Args:
+        path: Destino do WAV
+        sample_rate: Taxa do áudio capturado (mono int16)
+    """
+
+    def __init__(
+        self,
+        path: str = SPEECH_CLIP_PATH,
+        sample_rate: int = 16000,
+        seconds: float = CLIP_SECONDS,
+    ):
+        self.path = path
+        self.sample_rate = sample_rate
+        self._needed = int(seconds * sample_rate) * 2
+        self._audio = bytearray()
+
+    def feed(self, audio_bytes: bytes, is_speech: bool) -> bool:
+        """Acrescenta o frame se for fala; True quando o clipe foi gravado."""
+        if not is_speech or not audio_bytes:
+            return False
+        self._audio.extend(audio_bytes)
+        if len(self._audio) < self._needed:
+            return False
+        with wave.open(self.path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(self.sample_rate)
+            f.writeframes(bytes(self._audio[: self._needed]))
+        logger.info(f"Clipe de fala para calibração gravado em {self.path}")
+        return True
+
+
+def engine_options(key: str) -> dict:
+    """Campos de configuração que selecionam o engine da chave."""
+    if key.startswith("whisper-"):
+        return {"model_type": "whisper", "whisper_profile": key.partition("-")[2]}
+    return {"model_type": key}
+
+
+def engine_key(config: dict) -> str:
+    """Chave de calibração do engine configurado."""
+    model_type = config.get("model_type", "small")
+    if model_type == "whisper":
+        return f"whisper-{config.get('whisper_profile', 'balanced')}"
+    return model_type
+
+
+def _whisper_downloaded(profile: str) -> bool:
+    from core.transcriber import WHISPER_PROFILES
+
+    cache = os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+        "whisper",
+    )
+    return os.path.exists(
+        os.path.join(cache, f"{WHISPER_PROFILES[profile]['model']}.pt")
+    )
+
+
+def installed_engines() -> List[str]:
+    """Engines da classificação com modelo já presente (nada é baixado)."""
+    from core.transcriber import HAS_WHISPER
+    from download_models import is_model_installed
+
+    installed = []
+    for key in ENGINE_RANKING:
+        if key.startswith("whisper-"):
+            if HAS_WHISPER and _whisper_downloaded(key.partition("-")[2]):
+                installed.append(key)
+        elif is_model_installed(key):
+            installed.append(key)
+    return installed
+
+
+def load_engine(key: str, sample_rate: int = 16000):
+    """Carrega o engine da chave para medição."""
+    from core.transcriber import VoskEngine, WhisperEngine
+
+    options = engine_options(key)
+    if options["model_type"] == "whisper":
+        return WhisperEngine(sample_rate, profile=options["whisper_profile"])
+    from download_models import is_model_installed
+
+    return VoskEngine(is_model_installed(key), sample_rate)
+
+
+def calibrate(
+    engines: Optional[List[str]] = None,
+    audio: Optional[bytes] = None,
+    sample_rate: int = 16000,
+    runs: int = 1,
+    options: Optional[dict] = None,
+    load: Callable[[str, int], object] = load_engine,
+    available: Callable[[], Optional[float]] = available_memory_mb,
+) -> Dict[str, float]:
+    """
+    Mede o RTF de cada engine (padrão: os instalados).
+
+    Engines que não cabem na RAM livre ou falham ao carregar ficam de fora.
+    Sem `audio` nem clipe de fala gravado, nada é medido.
+    """
+    options = options or {}
+    if audio is None:
+        path = calibration_clip(options)
+        if path is None:
+            logger.info("Calibração adiada: ainda sem clipe de fala gravado")
+            return {}
+        audio = load_audio(path, sample_rate, CLIP_SECONDS)
+    headroom = options.get("memory_headroom_mb", 512)
+    results = {}
+    for key in installed_engines() if engines is None else engines:
+        free = available()
+        need = expected_resident_mb({**options, **engine_options(key)})
+        if free is not None and need + headroom > free:
+            logger.info(
+                f"Calibração: {key} ignorado (~{need} MB, {free:.0f} MB livres)"
+            )
+            continue
+        try:
+            loaded_before = set(model_cache.keys())
+            engine = load(key, sample_rate)
+            rtf = measure_rtf(engine.recognize, audio, sample_rate, runs)
+            # Libera o modelo antes de carregar o próximo; só os que a própria
+            # calibração carregou (os do engine em uso ou recém-trocados ficam)
+            del engine
+            model_cache.evict_cold(float("inf"), keep=loaded_before)
+        except Exception as e:
+            logger.warning(f"Calibração de {key} falhou: {e}")
+            continue
+        results[key] = round(rtf, 3)
+        metrics.set_gauge(f"calibration.rtf.{key}", rtf)
+        logger.info(f"Calibração: {key} RTF={rtf:.2f}")
+    return results
+
+
+def recommend(
+    rtfs: Dict[str, float], target_rtf: float = DEFAULT_TARGET_RTF
+) -> Optional[str]:
+    """Engine mais preciso com RTF abaixo do alvo (None se nenhum serve)."""
+    for key in ENGINE_RANKING:
+        if key in rtfs and rtfs[key] <= target_rtf:
+            return key
+    return None
+
+
+def apply_engine(config: dict, key: str) -> None:
+    """Seleciona o engine da chave na configuração."""
+    config.update(engine_options(key))
+
+
+def format_results(
+    rtfs: Dict[str, float], target_rtf: float = DEFAULT_TARGET_RTF
+) -> str:
+    """Resumo legível (uma linha por engine) para a interface."""
+    if not rtfs:
+        return 'Nenhuma medição. Use "Calibrar agora".'
+    best = recommend(rtfs, target_rtf)
+    lines = []
+    for key in ENGINE_RANKING:
+        if key not in rtfs:
+            continue
+        mark = "✓" if rtfs[key] <= target_rtf else "✗"
+        suffix = "  ← recomendado" if key == best else ""
+        lines.append(f"{mark} {key}: RTF {rtfs[key]:.2f}{suffix}")
+    return "\n".join(lines)
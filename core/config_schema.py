@@ -4,7 +4,7 @@ Garante que todas as configurações estejam dentro dos ranges válidos.
 """
 
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal
 from pathlib import Path
 
 
@@ -36,7 +36,134 @@ class ConfigSchema(BaseModel):
     vad_threshold: int = Field(default=300, ge=100, le=5000)
 
     # Modelo
-    model_type: Literal["small", "big", "google", "whisper"] = Field(default="google")
+    model_type: Literal["small", "big", "google", "whisper", "hybrid"] = Field(
+        default="google"
+    )
+
+    # Tradutor: endpoint configurável (servidor local em testes), timeouts e retries
+    translate_endpoint: Optional[str] = Field(default=None)
+    translate_connect_timeout: float = Field(default=3.0, gt=0.0, le=30.0)
+    translate_read_timeout: float = Field(default=8.0, gt=0.0, le=60.0)
+    translate_max_retries: int = Field(default=2, ge=0, le=5)
+    # Requisição duplicada quando a primeira passa do p95 da latência
+    translate_hedging: bool = Field(default=False)
+
+    # Idiomas traduzidos junto com target_lang (mesma transcrição); o overlay
+    # mostra target_lang e translations_log grava todos (JSON por linha)
+    extra_target_langs: List[str] = Field(default_factory=list)
+    translations_log: Optional[str] = Field(default=None)
+
+    # Backend de tradução: "argos" traduz offline (CTranslate2, CPU quantizada);
+    # "libretranslate" usa um servidor próprio compatível (rede local)
+    translation_backend: Literal["google", "argos", "libretranslate"] = Field(
+        default="google"
+    )
+    libretranslate_url: str = Field(default="http://localhost:5000")
+    libretranslate_api_key: Optional[str] = Field(default=None)
+    libretranslate_max_concurrency: int = Field(default=4, ge=1, le=64)
+    argos_model_dir: str = Field(default="model_argos")
+    argos_compute_type: Literal["int8", "int8_float32", "float32"] = Field(
+        default="int8"
+    )
+    argos_inter_threads: int = Field(default=1, ge=1, le=16)
+    argos_intra_threads: int = Field(default=0, ge=0, le=64)  # 0 = automático
+    argos_beam_size: int = Field(default=2, ge=1, le=8)
+
+    # Cache de traduções (LRU + TTL); persistência em SQLite é opcional
+    translation_cache_enabled: bool = Field(default=True)
+    translation_cache_size: int = Field(default=2048, ge=16, le=1000000)
+    translation_cache_ttl_hours: float = Field(default=168, ge=0.0)  # 0 = sem TTL
+    translation_cache_persist: bool = Field(default=False)
+    translation_cache_path: str = Field(default="cache/translations.db")
+
+    # Memória de tradução aproximada: frases que só diferem em preenchimentos
+    # ("né", "então"...) reutilizam a tradução (desligada por padrão)
+    translation_memory_enabled: bool = Field(default=False)
+    translation_memory_threshold: float = Field(default=0.9, ge=0.5, le=1.0)
+    translation_memory_min_chars: int = Field(default=16, ge=1, le=500)
+    # Retraduz em segundo plano a frase servida por aproximação
+    translation_memory_refresh: bool = Field(default=True)
+
+    # Micro-batching: traduções simultâneas na janela viram uma requisição
+    # (0 = desligado; só compensa com várias frases chegando juntas, ex.: vários
+    # idiomas de destino ou falantes, pois a primeira espera a janela inteira)
+    translation_batch_window_ms: int = Field(default=0, ge=0, le=1000)
+
+    # Transcrições longas são divididas em frases traduzidas em paralelo
+    # (0 = não divide; as partes vão sem o contexto das vizinhas, ex.: 80)
+    translation_split_chars: int = Field(default=0, ge=0, le=2000)
+    translation_split_concurrency: int = Field(default=4, ge=1, le=16)
+
+    # Tradução incremental: traduz o início estável das parciais antes do final
+    incremental_translation: bool = Field(default=False)
+    incremental_interval_ms: int = Field(default=500, ge=100, le=5000)
+    incremental_min_words: int = Field(default=3, ge=1, le=20)
+
+    # Calibração: RTF medido de cada engine local nesta CPU (vazio = não calibrado)
+    calibration_rtf: Dict[str, float] = Field(default_factory=dict)
+    calibration_target_rtf: float = Field(default=0.5, gt=0.0, le=1.0)
+    # Troca automaticamente para o engine recomendado após a calibração
+    calibration_auto_select: bool = Field(default=False)
+    calibration_audio: Optional[str] = Field(default=None)  # WAV gravado (16 kHz)
+
+    # Admissão por memória: confere a RAM livre antes de carregar o modelo
+    memory_admission: bool = Field(default=True)
+    memory_headroom_mb: int = Field(default=512, ge=0, le=16384)
+    # "fallback" carrega um modelo menor quando não cabe; "refuse" só recusa
+    memory_policy: Literal["fallback", "refuse"] = Field(default="fallback")
+
+    # Vosk com gramática: só reconhece as frases listadas (quiosques, comandos)
+    vosk_grammar: List[str] = Field(default_factory=list)
+    vosk_grammar_file: Optional[str] = Field(default=None)  # uma frase por linha
+
+    # Whisper: perfil de decodificação (tamanho do modelo, beam, fallback de temperatura)
+    whisper_profile: Literal["fast", "balanced", "accurate"] = Field(default="balanced")
+    # Alvo em inglês: o Whisper traduz direto (task="translate"), sem o tradutor
+    whisper_direct_translation: bool = Field(default=True)
+    # Também decodifica a transcrição original (mesmo encoder, após a tradução)
+    whisper_direct_source: bool = Field(default=True)
+
+    # Google Speech (endpoint configurável permite servidor local em testes)
+    google_speech_endpoint: Optional[str] = Field(default=None)
+    google_connect_timeout: float = Field(default=3.0, gt=0.0, le=30.0)
+    google_read_timeout: float = Field(default=10.0, gt=0.0, le=60.0)
+    # Upload em streaming: envia o áudio enquanto o usuário ainda fala
+    google_streaming: bool = Field(default=False)
+    google_stream_chunk_ms: int = Field(default=250, ge=60, le=2000)
+
+    # Endpoint especulativo: reconhece após uma pausa curta e descarta se a fala continuar
+    speculative_endpointing: bool = Field(default=False)
+    speculative_silence_ms: int = Field(default=150, ge=30, le=450)
+
+    # Segmentação adaptativa: ajusta endpoint e tamanho máximo à meta de latência
+    adaptive_segmentation: bool = Field(default=False)
+    latency_target_ms: int = Field(default=2500, ge=500, le=10000)
+
+    # Híbrido: Vosk ao vivo; finais com confiança abaixo do limiar vão ao engine pesado
+    hybrid_heavy_engine: Literal["google", "whisper"] = Field(default="google")
+    hybrid_confidence_threshold: float = Field(default=0.75, ge=0.0, le=1.0)
+
+    # Hedging: após o atraso (0 = p95 do primário), envia o segmento também ao secundário
+    hedging_enabled: bool = Field(default=False)
+    hedge_secondary_engine: Literal[
+        "small", "big", "google", "whisper", "whisper-tiny"
+    ] = Field(default="small")
+    hedge_delay_ms: int = Field(default=0, ge=0, le=10000)
+
+    # Roteamento por saúde: circuito abre com SLO violado e usa o Vosk offline
+    routing_enabled: bool = Field(default=False)
+    fallback_engine: Literal["small", "big"] = Field(default="small")
+    route_latency_slo_ms: int = Field(default=3000, ge=200, le=30000)
+    route_max_error_rate: float = Field(default=0.5, ge=0.0, le=1.0)
+    route_probe_interval_s: float = Field(default=15.0, ge=1.0, le=300.0)
+
+    # Verificador de fala: descarta segmentos com pouca fala antes do ASR/rede
+    speech_gate_enabled: bool = Field(default=True)
+    speech_gate_min_ratio: float = Field(default=0.3, ge=0.0, le=1.0)
+    speech_gate_min_voiced_ms: int = Field(default=250, ge=0, le=3000)
+
+    # Fala longa: sobreposição entre chunks cortados por tamanho (0 = sem costura)
+    chunk_overlap_ms: int = Field(default=500, ge=0, le=2000)
 
     # Cores
     text_color: str = Field(default="white", pattern=r"^[a-zA-Z]+$|^#[0-9A-Fa-f]{6}$")
@@ -146,5 +273,5 @@ class ConfigSchema(BaseModel):
 
 # Constantes de validação
 VALID_LANGUAGES = ["en", "es", "fr", "de", "it", "ja", "zh-CN", "pt"]
-VALID_MODELS = ["small", "big", "google", "whisper"]
+VALID_MODELS = ["small", "big", "google", "whisper", "hybrid"]
 VALID_ALIGNMENTS = ["top", "center", "bottom"]
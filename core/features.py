@@ -0,0 +1,100 @@
+"""
+Extração incremental do log-mel do Whisper.
+Os frames do STFT dependem só de amostras locais, então são calculados à
+medida que os blocos de captura chegam; no endpoint resta só a normalização
+global (barata) e os últimos frames da borda.
+
+Reproduz whisper.audio.log_mel_spectrogram como usado por transcribe():
+janela de Hann periódica de 400 amostras, hop de 160, center=True (reflexo
+no início) e áudio seguido de zeros no fim.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+N_FFT = 400
+HOP_LENGTH = 160
+N_FRAMES = 3000  # 30 s, tamanho da janela do encoder
+_PAD = N_FFT // 2
+_LOG_FLOOR = -10.0  # log10(1e-10)
+
+
+class IncrementalLogMel:
+    """
+    Acumula áudio e mantém o log10 da energia mel por frame.
+
+    Args:
+        filters: Banco de filtros mel (n_mels, N_FFT // 2 + 1), ex.:
+            whisper.audio.mel_filters("cpu", n_mels).numpy()
+    """
+
+    def __init__(self, filters: np.ndarray):
+        self.filters = np.asarray(filters, dtype=np.float32)
+        self.n_mels = self.filters.shape[0]
+        self._window = (
+            0.5 - 0.5 * np.cos(2 * np.pi * np.arange(N_FFT) / N_FFT)
+        ).astype(np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        self._samples = np.zeros(16000 * 8, dtype=np.float32)
+        self.num_samples = 0
+        self._log_frames = np.zeros((self.n_mels, 0), dtype=np.float32)
+
+    def feed(self, audio_bytes: bytes) -> None:
+        """Adiciona PCM int16 e calcula os frames que já têm amostras suficientes."""
+        if not audio_bytes:
+            return
+        chunk = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+        end = self.num_samples + len(chunk)
+        if end > len(self._samples):
+            grown = np.zeros(max(end, 2 * len(self._samples)), dtype=np.float32)
+            grown[: self.num_samples] = self._samples[: self.num_samples]
+            self._samples = grown
+        self._samples[self.num_samples : end] = chunk
+        self.num_samples = end
+
+        ready = self._ready_frames(self.num_samples)
+        done = self._log_frames.shape[1]
+        if ready > done:
+            new = self._compute(done, ready, self.num_samples)
+            self._log_frames = np.concatenate([self._log_frames, new], axis=1)
+
+    @staticmethod
+    def _ready_frames(n: int) -> int:
+        # Frame t usa as amostras [t*hop - 200, t*hop + 200): pronto quando a borda chega
+        return 0 if n < _PAD else (n - _PAD) // HOP_LENGTH + 1
+
+    def _compute(self, start: int, stop: int, n: int) -> np.ndarray:
+        """log10 da energia mel dos frames [start, stop) sobre as primeiras n amostras."""
+        if stop <= start:
+            return np.zeros((self.n_mels, 0), dtype=np.float32)
+        idx = (
+            np.arange(start, stop)[:, None] * HOP_LENGTH
+            - _PAD
+            + np.arange(N_FFT)[None, :]
+        )
+        idx = np.abs(idx)  # reflexo no início (sem repetir a borda)
+        frames = np.where(idx < n, self._samples[np.minimum(idx, n - 1)], 0.0)
+        spectrum = np.fft.rfft(frames * self._window, axis=1)
+        power = (spectrum.real**2 + spectrum.imag**2).astype(np.float32)
+        mel = self.filters @ power.T
+        return np.log10(np.maximum(mel, 1e-10))
+
+    def features(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Log-mel normalizado das primeiras n amostras (padrão: todas), com
+        n // 160 frames, pronto para pad_or_trim/decode. Não altera o estado.
+        """
+        n = self.num_samples if n is None else min(n, self.num_samples)
+        content = n // HOP_LENGTH
+        valid = min(self._log_frames.shape[1], self._ready_frames(n))
+        # Frames da borda final (e os de logo após, que entram no máximo global)
+        tail_stop = max(content, -(-(n + _PAD) // HOP_LENGTH))
+        tail = self._compute(valid, tail_stop, n)
+        log_spec = np.concatenate([self._log_frames[:, :valid], tail], axis=1)
+
+        peak = max(float(log_spec.max()) if log_spec.size else _LOG_FLOOR, _LOG_FLOOR)
+        log_spec = np.maximum(log_spec[:, :content], peak - 8.0)
+        return (log_spec + 4.0) / 4.0
@@ -0,0 +1,54 @@
+"""
+Cliente HTTP para o Google Translate (endpoint translate_a/single).
+O transporte (sessão keep-alive, timeouts, novas tentativas, hedge) é o de
+HttpTranslateClient; aqui ficam só o formato da requisição e da resposta.
+"""
+
+from typing import Optional
+
+# TranslationError e RETRYABLE_STATUS continuam importáveis daqui
+from core.http_translate import RETRYABLE_STATUS, HttpTranslateClient, TranslationError
+
+DEFAULT_ENDPOINT = "https://translate.googleapis.com/translate_a/single"
+
+
+def parse_translation(payload) -> str:
+    """
+    Junta os trechos traduzidos da resposta ([[["trad", "orig", ...], ...], ...]).
+
+    Raises:
+        TranslationError: Se a resposta não tiver o formato esperado
+    """
+    try:
+        return "".join(part[0] for part in payload[0] if part and part[0])
+    except (TypeError, IndexError, KeyError) as e:
+        raise TranslationError(f"Resposta inválida do servidor: {e}")
+
+
+class GoogleTranslateClient(HttpTranslateClient):
+    """
+    Args:
+        source, target: Códigos de idioma
+        endpoint: URL base (permite servidor local em testes)
+        Demais argumentos: ver HttpTranslateClient
+    """
+
+    backend = "google"
+
+    def __init__(
+        self,
+        source: str = "pt",
+        target: str = "en",
+        endpoint: Optional[str] = None,
+        **kwargs,
+    ):
+        super().__init__(source, target, endpoint or DEFAULT_ENDPOINT, **kwargs)
+
+    @property
+    def params(self) -> dict:
+        return {"client": "gtx", "sl": self.source, "tl": self.target, "dt": "t"}
+
+    def _request(self, text: str) -> str:
+        """Uma tentativa. O texto vai no corpo (lotes não cabem na URL)."""
+        payload, _ = self._post(params=self.params, data={"q": text})
+        return parse_translation(payload)
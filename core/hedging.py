@@ -0,0 +1,147 @@
+"""
+Hedging de reconhecimento: o segmento vai ao engine primário e, se ele
+demorar mais que o atraso de hedge, também ao secundário. Vale o primeiro
+resultado não vazio; o perdedor é cancelado (se ainda não começou) ou ignorado.
+Se os dois falharem, a exceção do primeiro a falhar é propagada.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+
+from core.logging_config import get_logger
+from core.metrics import metrics
+
+logger = get_logger("Hedging")
+
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
+
+
+class HedgedEngine:
+    """
+    Envolve um engine com segmentação própria (BaseAudioEngine) e adiciona um
+    segundo reconhecedor disparado só na cauda de latência.
+
+    A segmentação, o segmentador e os demais atributos continuam sendo os do
+    primário (acesso delegado). O secundário só precisa de recognize(bytes).
+
+    Args:
+        primary: Engine principal (segmenta o áudio)
+        secondary: Engine de reserva com recognize(bytes)
+        hedge_delay_s: Atraso antes de disparar o secundário. None = p95 da
+            latência recente do primário (com `initial_delay_s` até haver dados)
+    """
+
+    def __init__(
+        self,
+        primary,
+        secondary,
+        hedge_delay_s: Optional[float] = None,
+        initial_delay_s: float = 1.0,
+        min_samples: int = 20,
+        window: int = 100,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_delay_s = hedge_delay_s
+        self.initial_delay_s = initial_delay_s
+        self.min_samples = min_samples
+        self._primary_latencies = deque(maxlen=window)
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hedge")
+
+    def __getattr__(self, name):
+        # Só chamado para atributos ausentes no wrapper: delega ao primário
+        if name == "primary":
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+    def current_delay(self) -> float:
+        if self.hedge_delay_s is not None:
+            return self.hedge_delay_s
+        if len(self._primary_latencies) < self.min_samples:
+            return self.initial_delay_s
+        return _percentile(self._primary_latencies, 95)
+
+    def process_audio(self, audio_bytes, is_speech, raw_speech=None):
+        return self.primary.process_audio(audio_bytes, is_speech, raw_speech)
+
+    def warmup(self, duration_s=1.0):
+        elapsed = self.primary.warmup(duration_s)
+        if hasattr(self.secondary, "warmup"):
+            elapsed += self.secondary.warmup(duration_s)
+        return elapsed
+
+    def reset(self):
+        self.primary.reset()
+
+    def _timed(self, name, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.observe(f"hedge.{name}_latency_s", elapsed)
+            if name == "primary":
+                self._primary_latencies.append(elapsed)
+
+    def recognize(self, audio_data_bytes):
+        return self.primary.recognize(audio_data_bytes)
+
+    def recognize_segment(self, segment):
+        """Reconhece o segmento com hedge (chamado na thread do executor)."""
+        start = time.perf_counter()
+        futures = {
+            self._executor.submit(
+                self._timed, "primary", self.primary.recognize_segment, segment
+            ): "primary"
+        }
+        done, _ = wait(futures, timeout=self.current_delay())
+        errors = {}
+
+        if not done or not self._result_of(next(iter(done)), errors):
+            # Primário lento (ou falhou cedo): dispara o secundário
+            metrics.increment("hedge.fired")
+            futures[
+                self._executor.submit(
+                    self._timed, "secondary", self.secondary.recognize, segment.audio
+                )
+            ] = "secondary"
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                text = self._result_of(future, errors)
+                if text:
+                    winner = futures[future]
+                    for loser in pending:
+                        loser.cancel()  # Sem efeito se já começou: resultado ignorado
+                    metrics.increment(f"hedge.wins.{winner}")
+                    if len(futures) > 1:
+                        loser_name = "secondary" if winner == "primary" else "primary"
+                        metrics.increment(f"hedge.losses.{loser_name}")
+                    metrics.observe("hedge.latency_s", time.perf_counter() - start)
+                    return text
+
+        metrics.observe("hedge.latency_s", time.perf_counter() - start)
+        if len(errors) == len(futures):
+            # Todos falharam: o erro chega a quem chama (ex.: circuit breaker)
+            metrics.increment("hedge.errors")
+            raise next(iter(errors.values()))
+        metrics.increment("hedge.empty")
+        return ""
+
+    @staticmethod
+    def _result_of(future, errors) -> str:
+        """Texto do reconhecedor; falhas ficam em `errors` (futuro -> exceção)."""
+        try:
+            return future.result() or ""
+        except Exception as e:
+            if future not in errors:
+                logger.warning(f"Reconhecedor falhou no hedge: {e}")
+            errors[future] = e
+            return ""
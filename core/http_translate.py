@@ -0,0 +1,216 @@
+"""
+Transporte HTTP comum aos backends de tradução por rede (Google, LibreTranslate).
+Sessão persistente (pool keep-alive) por backend, timeouts explícitos, novas
+tentativas limitadas com jitter e, opcionalmente, requisições duplicadas
+(hedge) quando a primeira passa do p95 da latência recente.
+
+Cada backend implementa só `_request(text)`: monta a requisição com `_post`
+e interpreta a resposta no seu formato.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.logging_config import get_logger
+from core.metrics import metrics
+
+logger = get_logger("HttpTranslate")
+
+# Status que valem nova tentativa (limite de taxa e falhas do servidor)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def shared_session(backend: str, pool_size: int = 8) -> requests.Session:
+    """
+    Sessão keep-alive do backend, compartilhada pelo processo: os clientes de
+    cada idioma de destino (e os recriados numa troca de idioma) usam o mesmo
+    pool; backends diferentes não disputam o mesmo pool.
+    """
+    with _sessions_lock:
+        key = (backend, pool_size)
+        if key not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+        return _sessions[key]
+
+
+class TranslationError(RuntimeError):
+    """Falha de tradução (rede, timeout, HTTP ou resposta inválida)."""
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class HttpTranslateClient:
+    """
+    Base dos clientes HTTP. Segura para uso concorrente a partir das threads
+    do executor.
+
+    Args:
+        source, target: Códigos de idioma
+        endpoint: URL da requisição de tradução
+        connect_timeout, read_timeout: Timeouts de cada tentativa (s)
+        max_retries: Novas tentativas após a primeira (erros transitórios)
+        backoff_s: Base do backoff exponencial com jitter completo
+        hedge: Dispara uma requisição duplicada na cauda de latência
+        hedge_delay_s: Atraso do hedge; None = p95 da latência recente
+            (com `initial_hedge_delay_s` até haver `min_samples` medições)
+        pool_size: Conexões keep-alive do pool do backend
+    """
+
+    backend = "http"
+
+    def __init__(
+        self,
+        source: str,
+        target: str,
+        endpoint: str,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 8.0,
+        max_retries: int = 2,
+        backoff_s: float = 0.2,
+        hedge: bool = False,
+        hedge_delay_s: Optional[float] = None,
+        initial_hedge_delay_s: float = 1.0,
+        min_samples: int = 20,
+        pool_size: int = 8,
+    ):
+        self.source = source
+        self.target = target
+        self.endpoint = endpoint
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.hedge = hedge
+        self.hedge_delay_s = hedge_delay_s
+        self.initial_hedge_delay_s = initial_hedge_delay_s
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=100)
+        self._sleep = time.sleep
+        self._jitter = random.random
+
+        self.session = shared_session(self.backend, pool_size)
+        self._executor = (
+            ThreadPoolExecutor(max_workers=4, thread_name_prefix="mt-hedge")
+            if hedge
+            else None
+        )
+
+    def _request(self, text):
+        """Uma tentativa: monta a requisição do backend e interpreta a resposta."""
+        raise NotImplementedError
+
+    def _post(self, **kwargs) -> Tuple[object, float]:
+        """
+        POST no endpoint com o timeout do cliente.
+
+        Returns:
+            Tupla (JSON da resposta, latência em segundos)
+
+        Raises:
+            TranslationError: Rede, timeout, HTTP >= 400 ou JSON inválido
+        """
+        start = time.perf_counter()
+        try:
+            response = self.session.post(self.endpoint, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise TranslationError(f"Falha na requisição de tradução: {e}", True)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.observe("translate.request_latency_s", elapsed)
+        if response.status_code >= 400:
+            raise TranslationError(
+                f"HTTP {response.status_code} do tradutor",
+                response.status_code in RETRYABLE_STATUS,
+            )
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise TranslationError(f"Resposta inválida do servidor: {e}")
+        self._latencies.append(elapsed)
+        return payload, elapsed
+
+    def _with_retries(self, text):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._request(text)
+            except TranslationError as e:
+                if not e.retryable or attempt == self.max_retries:
+                    raise
+                # Backoff exponencial com jitter completo: evita rajadas sincronizadas
+                delay = self.backoff_s * (2**attempt) * self._jitter()
+                metrics.increment("translate.retries")
+                logger.debug(f"Tradução falhou ({e}); nova tentativa em {delay:.2f}s")
+                self._sleep(delay)
+
+    def current_hedge_delay(self) -> float:
+        if self.hedge_delay_s is not None:
+            return self.hedge_delay_s
+        if len(self._latencies) < self.min_samples:
+            return self.initial_hedge_delay_s
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+    def translate(self, text: str) -> str:
+        """
+        Traduz o texto.
+
+        Raises:
+            TranslationError: Se todas as tentativas falharem
+        """
+        start = time.perf_counter()
+        try:
+            if self._executor is None:
+                return self._with_retries(text)
+            return self._hedged(text)
+        except TranslationError:
+            metrics.increment("translate.errors")
+            raise
+        finally:
+            metrics.observe("translate.latency_s", time.perf_counter() - start)
+
+    def _hedged(self, text: str) -> str:
+        first = self._executor.submit(self._with_retries, text)
+        done, _ = wait([first], timeout=self.current_hedge_delay())
+        if done:
+            return first.result()
+
+        metrics.increment("translate.hedge.fired")
+        futures = {
+            first: "primary",
+            self._executor.submit(self._request, text): "hedge",
+        }
+        pending, error = set(futures), None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except TranslationError as e:
+                    error = error or e
+                    continue
+                for loser in pending:
+                    loser.cancel()  # Sem efeito se já começou: resultado ignorado
+                metrics.increment(f"translate.hedge.wins.{futures[future]}")
+                return result
+        raise error
+
+    def close(self):
+        # A sessão é compartilhada: só o executor do hedge é deste cliente
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
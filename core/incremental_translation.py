@@ -0,0 +1,124 @@
+"""
+Tradução incremental de parciais estáveis.
+Enquanto a pessoa fala, o reconhecedor reescreve o fim da frase a cada
+parcial; o início que se repete em parciais consecutivas já não muda e pode
+ser traduzido antes do resultado final. Quando o final chega, sua tradução
+costuma já estar no cache (a última parcial estável é a própria frase).
+
+As requisições são limitadas a uma em andamento e a um intervalo mínimo
+entre envios; um prefixo novo substitui o que ainda esperava a vez, e a
+resposta de um prefixo que o reconhecedor revisou é descartada.
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional
+
+from core.metrics import metrics
+
+
+def stable_prefix(previous: List[str], current: List[str]) -> List[str]:
+    """Palavras iniciais iguais em duas parciais consecutivas."""
+    prefix = []
+    for a, b in zip(previous, current):
+        if a.lower() != b.lower():
+            break
+        prefix.append(b)
+    return prefix
+
+
+class IncrementalTranslator:
+    """
+    Args:
+        translate: Traduz um texto (bloqueante; roda em `submit`)
+        submit: Executa `fn(*args)` em segundo plano (ex.: executor.submit)
+        emit: Recebe (prefixo, tradução) de cada prévia válida
+        min_interval_s: Intervalo mínimo entre requisições (debounce)
+        min_words: Prefixos mais curtos não são traduzidos
+    """
+
+    def __init__(
+        self,
+        translate: Callable[[str], str],
+        submit: Callable,
+        emit: Callable[[str, str], None],
+        min_interval_s: float = 0.5,
+        min_words: int = 3,
+        clock=time.monotonic,
+    ):
+        self.translate = translate
+        self.submit = submit
+        self.emit = emit
+        self.min_interval_s = min_interval_s
+        self.min_words = min_words
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._last_words: List[str] = []
+        self._current = ""
+        self._requested: Optional[List[str]] = None
+        self._pending: Optional[List[str]] = None
+        self._in_flight = False
+        self._last_start = float("-inf")
+
+    def update(self, partial: str) -> None:
+        """Registra uma parcial (não bloqueia)."""
+        words = partial.split()
+        with self._lock:
+            prefix = stable_prefix(self._last_words, words)
+            self._last_words = words
+            self._current = " ".join(words).lower()
+            if len(prefix) < self.min_words or prefix == self._requested:
+                return
+            if self._pending is not None:
+                metrics.increment("incremental.superseded")
+            self._pending = prefix
+            task = self._next_task()
+        self._start(task)
+
+    def reset(self) -> None:
+        """Fim da frase: descarta a prévia pendente e as respostas em andamento."""
+        with self._lock:
+            if self._pending is not None:
+                metrics.increment("incremental.superseded")
+            self._generation += 1
+            self._last_words = []
+            self._current = ""
+            self._requested = None
+            self._pending = None
+
+    def _next_task(self):
+        """Reserva a vaga para o prefixo pendente (chamado com self._lock)."""
+        if self._in_flight or self._pending is None:
+            return None
+        if self._clock() - self._last_start < self.min_interval_s:
+            return None
+        prefix, self._pending = self._pending, None
+        self._requested = prefix
+        self._in_flight = True
+        self._last_start = self._clock()
+        return " ".join(prefix), self._generation
+
+    def _start(self, task) -> None:
+        # Fora do lock: `submit` pode executar a tarefa na hora
+        if task is not None:
+            metrics.increment("incremental.requests")
+            self.submit(self._run, *task)
+
+    def _run(self, text: str, generation: int) -> None:
+        translation = None
+        try:
+            translation = self.translate(text)
+        finally:
+            with self._lock:
+                self._in_flight = False
+                # Válida só se a frase é a mesma e o prefixo não foi revisado
+                fresh = generation == self._generation and (
+                    self._current + " "
+                ).startswith(text.lower() + " ")
+                task = self._next_task()
+            if not fresh:
+                metrics.increment("incremental.discarded")
+            elif translation:
+                self.emit(text, translation)
+            self._start(task)
@@ -0,0 +1,116 @@
+"""
+Cliente para servidores de tradução compatíveis com a API do LibreTranslate
+(POST /translate), comuns em instalações próprias na rede local.
+
+Usa o transporte de HttpTranslateClient (sessão keep-alive própria,
+timeouts, novas tentativas, hedge) e acrescenta lotes nativos (`q` como
+lista) e um limite de requisições simultâneas para não sobrecarregar o
+servidor.
+"""
+
+import threading
+import time
+from typing import List, Optional, Union
+
+from core.http_translate import HttpTranslateClient, TranslationError
+from core.metrics import metrics
+
+DEFAULT_URL = "http://localhost:5000"
+
+_slots = {}
+_slots_lock = threading.Lock()
+
+
+def _server_slots(endpoint: str, limit: int) -> threading.BoundedSemaphore:
+    """Limite de concorrência por servidor, comum a todos os idiomas de destino."""
+    with _slots_lock:
+        if (endpoint, limit) not in _slots:
+            _slots[(endpoint, limit)] = threading.BoundedSemaphore(limit)
+        return _slots[(endpoint, limit)]
+
+
+def libre_code(lang: str) -> str:
+    # LibreTranslate usa códigos ISO curtos ("zh-CN" -> "zh")
+    return lang.split("-")[0].lower()
+
+
+def parse_libre_response(payload, expected: Optional[int] = None):
+    """
+    Extrai `translatedText` (texto ou lista, conforme o pedido).
+
+    Raises:
+        TranslationError: Se a resposta não tiver o formato esperado
+    """
+    try:
+        translated = payload["translatedText"]
+    except (TypeError, KeyError) as e:
+        raise TranslationError(f"Resposta inválida do servidor: {e}")
+    if expected is None:
+        if not isinstance(translated, str):
+            raise TranslationError("Resposta inválida do servidor: esperado texto")
+        return translated
+    if not isinstance(translated, list) or len(translated) != expected:
+        raise TranslationError(
+            f"Resposta inválida do servidor: esperadas {expected} traduções"
+        )
+    return translated
+
+
+class LibreTranslateClient(HttpTranslateClient):
+    """
+    Args:
+        url: URL base do servidor (ex.: http://tradutor.lan:5000)
+        api_key: Chave da API, se o servidor exigir
+        max_concurrency: Requisições simultâneas no servidor, somando todos
+            os idiomas de destino (também o tamanho do pool de conexões)
+        Demais argumentos: ver HttpTranslateClient
+    """
+
+    backend = "libretranslate"
+
+    def __init__(
+        self,
+        source: str = "pt",
+        target: str = "en",
+        url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_concurrency: int = 4,
+        **kwargs,
+    ):
+        base = (url or DEFAULT_URL).rstrip("/")
+        super().__init__(
+            libre_code(source),
+            libre_code(target),
+            f"{base}/translate",
+            pool_size=max_concurrency,
+            **kwargs,
+        )
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self._slots = _server_slots(self.endpoint, max_concurrency)
+
+    def _request(self, text: Union[str, List[str]]):
+        """Uma tentativa; `text` pode ser uma lista (lote numa requisição)."""
+        body = {
+            "q": text,
+            "source": self.source,
+            "target": self.target,
+            "format": "text",
+        }
+        if self.api_key:
+            body["api_key"] = self.api_key
+        with self._slots:
+            payload, _ = self._post(json=body)
+        expected = len(text) if isinstance(text, list) else None
+        return parse_libre_response(payload, expected)
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """Traduz o lote numa só requisição (frases já separadas)."""
+        start = time.perf_counter()
+        try:
+            return self._with_retries(list(texts))
+        except TranslationError:
+            metrics.increment("translate.errors")
+            raise
+        finally:
+            metrics.observe("translate.latency_s", time.perf_counter() - start)
@@ -0,0 +1,100 @@
+"""
+Métricas de execução (contadores e latências) compartilhadas pelos módulos.
+Thread-safe: atualizadas a partir das threads de captura e do executor.
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+from core.logging_config import get_logger
+
+logger = get_logger("Metrics")
+
+
+class Metrics:
+    """Registro simples de contadores, gauges e observações em janela móvel."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._observations: Dict[str, deque] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Registra uma observação (ex.: latência em segundos)."""
+        with self._lock:
+            if name not in self._observations:
+                self._observations[name] = deque(maxlen=self.window)
+            self._observations[name].append(value)
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def gauge(self, name: str) -> Optional[float]:
+        with self._lock:
+            return self._gauges.get(name)
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        """
+        Percentil das observações recentes.
+
+        Args:
+            name: Nome da série
+            q: Percentil entre 0 e 100
+
+        Returns:
+            Valor do percentil ou None se não houver observações
+        """
+        with self._lock:
+            values = sorted(self._observations.get(name, ()))
+        if not values:
+            return None
+        idx = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+        return values[idx]
+
+    def snapshot(self) -> dict:
+        """Retorna cópia de contadores, gauges e p50/p95 das observações."""
+        with self._lock:
+            names = list(self._observations)
+            data = {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+            }
+        data["latency"] = {
+            name: {
+                "p50": self.percentile(name, 50),
+                "p95": self.percentile(name, 95),
+            }
+            for name in names
+        }
+        return data
+
+    def log_summary(self) -> None:
+        snap = self.snapshot()
+        if snap["counters"]:
+            logger.info(f"Métricas: {snap['counters']}")
+        for name, stats in snap["latency"].items():
+            logger.info(
+                f"Latência {name}: p50={stats['p50']:.3f} p95={stats['p95']:.3f}"
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+# Registro global usado pela aplicação
+metrics = Metrics()
@@ -0,0 +1,417 @@
+"""
+Controle de admissão de modelos por memória disponível.
+Antes de carregar um modelo grande (Vosk big, Whisper) compara o tamanho
+residente esperado com a RAM livre; se não couber, descarrega modelos frios
+do cache, cai para um modelo menor ou recusa com uma mensagem clara, em vez
+de empurrar o sistema para o swap.
+"""
+
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+from weakref import WeakSet
+
+from core.logging_config import get_logger
+from core.metrics import metrics
+
+logger = get_logger("ModelAdmission")
+
+try:
+    import psutil
+
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+# Tamanho residente esperado (MB, CPU) de cada modelo, já com o runtime
+MODEL_RESIDENT_MB = {
+    "small": 300,
+    "big": 3000,
+    "google": 0,
+    "whisper-tiny": 450,
+    "whisper-base": 650,
+    "whisper-small": 1500,
+    "whisper-medium": 4000,
+    "whisper-large": 8000,
+}
+
+# Perfis do Whisper do mais pesado ao mais leve (queda progressiva)
+_WHISPER_DOWNGRADE = ["accurate", "balanced", "fast"]
+
+_MB = 1024 * 1024
+
+# Modelos frios mantidos para trocas rápidas; acima disso são descarregados
+MAX_COLD_MB = 1024
+
+
+class AdmissionError(RuntimeError):
+    """Nenhum modelo candidato cabe na memória disponível."""
+
+
+def _windows_available_mb() -> Optional[float]:
+    """RAM disponível via GlobalMemoryStatusEx (Windows sem psutil)."""
+    import ctypes
+    from ctypes import wintypes
+
+    class MEMORYSTATUSEX(ctypes.Structure):
+        _fields_ = [
+            ("dwLength", wintypes.DWORD),
+            ("dwMemoryLoad", wintypes.DWORD),
+            ("ullTotalPhys", ctypes.c_ulonglong),
+            ("ullAvailPhys", ctypes.c_ulonglong),
+            ("ullTotalPageFile", ctypes.c_ulonglong),
+            ("ullAvailPageFile", ctypes.c_ulonglong),
+            ("ullTotalVirtual", ctypes.c_ulonglong),
+            ("ullAvailVirtual", ctypes.c_ulonglong),
+            ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+        ]
+
+    status = MEMORYSTATUSEX()
+    status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+    if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+        return None
+    return status.ullAvailPhys / _MB
+
+
+def _windows_rss_mb() -> Optional[float]:
+    """Working set do processo via GetProcessMemoryInfo (Windows sem psutil)."""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    # K32GetProcessMemoryInfo: kernel32 no Windows 7+ (sem carregar psapi.dll)
+    if not kernel32.K32GetProcessMemoryInfo(
+        kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+    ):
+        return None
+    return counters.WorkingSetSize / _MB
+
+
+def available_memory_mb() -> Optional[float]:
+    """RAM disponível (MemAvailable) em MB, ou None se não for possível medir."""
+    if HAS_PSUTIL:
+        return psutil.virtual_memory().available / _MB
+    if os.name == "nt":
+        try:
+            return _windows_available_mb()
+        except (OSError, AttributeError):
+            return None
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def process_rss_mb() -> Optional[float]:
+    """Memória residente do processo em MB, ou None se não for possível medir."""
+    if HAS_PSUTIL:
+        return psutil.Process().memory_info().rss / _MB
+    if os.name == "nt":
+        try:
+            return _windows_rss_mb()
+        except (OSError, AttributeError):
+            return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / _MB
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _whisper_key(model_type: str, options: dict) -> str:
+    if model_type != "whisper":
+        return model_type  # "whisper-<tamanho>"
+    from core.transcriber import WHISPER_PROFILES
+
+    profile = options.get("whisper_profile", "balanced")
+    return f"whisper-{WHISPER_PROFILES[profile]['model']}"
+
+
+def model_keys(options: dict) -> List[str]:
+    """Modelos (chaves de MODEL_RESIDENT_MB) que a configuração carrega."""
+    model_type = options.get("model_type", "small")
+    if model_type == "hybrid":
+        keys = ["small", options.get("hybrid_heavy_engine", "google")]
+    else:
+        keys = [model_type]
+    if options.get("hedging_enabled", False):
+        keys.append(options.get("hedge_secondary_engine", "small"))
+    if options.get("routing_enabled", False):
+        keys.append(options.get("fallback_engine", "small"))
+    resolved = []
+    for key in keys:
+        key = _whisper_key(key, options) if key.startswith("whisper") else key
+        if key not in resolved:
+            resolved.append(key)
+    return resolved
+
+
+def expected_resident_mb(options: dict) -> float:
+    """Soma do tamanho residente esperado dos modelos da configuração."""
+    return sum(MODEL_RESIDENT_MB.get(key, 0) for key in model_keys(options))
+
+
+def candidate_configs(options: dict) -> List[dict]:
+    """Configuração pedida seguida das alternativas menores, em ordem."""
+    model_type = options.get("model_type", "small")
+    candidates = [dict(options)]
+    if model_type in ("big", "hybrid"):
+        candidates.append({**options, "model_type": "small"})
+    elif model_type == "whisper":
+        profile = options.get("whisper_profile", "balanced")
+        if profile in _WHISPER_DOWNGRADE:
+            for lighter in _WHISPER_DOWNGRADE[_WHISPER_DOWNGRADE.index(profile) + 1 :]:
+                candidates.append({**options, "whisper_profile": lighter})
+    return candidates
+
+
+@dataclass
+class _CacheEntry:
+    model: object
+    resident_mb: float
+    users: WeakSet = field(default_factory=WeakSet)
+    last_used: float = 0.0
+
+
+class ModelCache:
+    """
+    Cache de modelos carregados, compartilhado entre engines (ex.: o Vosk
+    small do engine principal e o de reserva do roteamento usam a mesma
+    instância). Um modelo sem engines vivos usando-o é "frio" e pode ser
+    descarregado quando a admissão precisar de memória.
+    """
+
+    def __init__(self, max_cold_mb: float = MAX_COLD_MB):
+        self.max_cold_mb = max_cold_mb
+        self._entries: "OrderedDict[Tuple, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, loader: Callable[[], object], owner=None):
+        """Retorna o modelo da chave, carregando-o (e medindo o RSS) se preciso."""
+        self._trim()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                before = process_rss_mb()
+                model = loader()
+                after = process_rss_mb()
+                growth = after - before if before is not None else 0.0
+                entry = _CacheEntry(model, max(growth, 0.0))
+                self._entries[key] = entry
+                metrics.set_gauge(f"model.rss_mb.{key[0]}", entry.resident_mb)
+                logger.info(f"Modelo {key} carregado: RSS +{growth:.0f} MB")
+            else:
+                metrics.increment("model.cache_hits")
+            self._entries.move_to_end(key)
+            entry.last_used = time.monotonic()
+            if owner is not None:
+                entry.users.add(owner)
+            return entry.model
+
+    def keys(self) -> List[Tuple]:
+        with self._lock:
+            return list(self._entries)
+
+    def loaded_keys(self, kind: str, name: str) -> List[Tuple]:
+        """
+        Chaves carregadas de um modelo: ("whisper", tamanho) ou ("vosk", caminho),
+        incluindo subpastas do caminho (modelo extraído numa subpasta).
+        """
+        root = os.path.abspath(name)
+        with self._lock:
+            if kind != "vosk":
+                return [(kind, name)] if (kind, name) in self._entries else []
+            return [
+                key
+                for key in self._entries
+                if key[0] == "vosk"
+                and (key[1] == root or key[1].startswith(root + os.sep))
+            ]
+
+    def cold_mb(self) -> float:
+        with self._lock:
+            return sum(e.resident_mb for e in self._entries.values() if not e.users)
+
+    def evict_cold(self, needed_mb: float, keep=()) -> float:
+        """
+        Descarrega modelos frios (LRU) até liberar `needed_mb`, exceto os de
+        `keep`. Retorna o liberado.
+        """
+        freed = 0.0
+        with self._lock:
+            cold = [k for k, e in self._entries.items() if not e.users]
+            for key in [k for k in cold if k not in keep]:
+                if freed >= needed_mb:
+                    break
+                freed += self._entries.pop(key).resident_mb
+                metrics.increment("model.evictions")
+                logger.info(f"Modelo frio {key} descarregado")
+        if freed:
+            gc.collect()
+        return freed
+
+    def _trim(self) -> None:
+        """Mantém no máximo max_cold_mb em modelos frios."""
+        excess = self.cold_mb() - self.max_cold_mb
+        if excess > 0:
+            self.evict_cold(excess)
+
+    def trim(self) -> None:
+        """
+        Chamado depois de trocar de engine: o modelo que o engine antigo
+        largou (ex.: Vosk big após mudar para o small) não espera o próximo
+        carregamento para sair da memória.
+        """
+        # Engines descartados com ciclos de referência só saem dos WeakSets aqui
+        gc.collect()
+        self._trim()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Cache global usado pelos engines
+model_cache = ModelCache()
+
+
+@dataclass
+class AdmissionDecision:
+    """Resultado da admissão: a configuração a carregar e o motivo da troca."""
+
+    options: dict
+    model_path: str
+    required_mb: float
+    available_mb: Optional[float]
+    message: Optional[str] = None  # preenchido quando caiu para outro modelo
+
+    @property
+    def model_type(self) -> str:
+        return self.options.get("model_type", "small")
+
+
+def _describe(options: dict) -> str:
+    return "+".join(model_keys(options))
+
+
+def _loaded_keys(cache: ModelCache, key: str, find_path) -> List[Tuple]:
+    """Chaves do cache em que o modelo `key` da configuração já está carregado."""
+    if key.startswith("whisper-"):
+        return cache.loaded_keys("whisper", key.partition("-")[2])
+    if key in ("small", "big"):
+        path = find_path(key)
+        return cache.loaded_keys("vosk", path) if path else []
+    return []
+
+
+def admit_model(
+    options: dict,
+    model_path: Optional[str] = None,
+    available: Callable[[], Optional[float]] = available_memory_mb,
+    resolve_path: Optional[Callable[[str], object]] = None,
+    cache: ModelCache = model_cache,
+) -> AdmissionDecision:
+    """
+    Decide qual configuração de modelo carregar.
+
+    Para cada candidata (pedida, depois as menores) verifica se o tamanho
+    esperado mais a folga (memory_headroom_mb) cabe na RAM disponível,
+    descarregando modelos frios do cache antes de desistir dela. Modelos que
+    já estão no cache não contam (nem são descarregados para a candidata). Com
+    memory_policy="refuse" não há queda para modelos menores.
+
+    Raises:
+        AdmissionError: Se nenhuma candidata couber
+    """
+    required = expected_resident_mb(options)
+    if not options.get("memory_admission", True) or not model_path:
+        # Desativado, ou modelo ausente (tratado por quem chama)
+        return AdmissionDecision(dict(options), model_path, required, None)
+    if resolve_path is None:
+        from download_models import is_model_installed as resolve_path
+
+    headroom = options.get("memory_headroom_mb", 512)
+    candidates = candidate_configs(options)
+    if options.get("memory_policy", "fallback") == "refuse":
+        candidates = candidates[:1]
+
+    free = available()
+    for i, candidate in enumerate(candidates):
+        model_type = candidate.get("model_type", "small")
+        path = model_path if i == 0 else resolve_path(model_type)
+        if not path:
+            continue
+        find_path = lambda key: path if key == model_type else resolve_path(key)
+        loaded = {
+            key: _loaded_keys(cache, key, find_path) for key in model_keys(candidate)
+        }
+        need = sum(
+            MODEL_RESIDENT_MB.get(k, 0) for k, found in loaded.items() if not found
+        )
+        keep = {cache_key for found in loaded.values() for cache_key in found}
+        if free is not None and need + headroom > free:
+            free += cache.evict_cold(need + headroom - free, keep)
+        if free is None or need + headroom <= free:
+            message = None
+            if i > 0:
+                message = (
+                    f"Memória insuficiente para {_describe(options)} "
+                    f"(~{required:.0f} MB, {free or 0:.0f} MB livres): "
+                    f"usando {_describe(candidate)}"
+                )
+                metrics.increment("model.admission_fallbacks")
+                logger.warning(message)
+            return AdmissionDecision(candidate, path, need, free, message)
+
+    metrics.increment("model.admission_refusals")
+    raise AdmissionError(
+        f"Memória insuficiente para carregar {_describe(options)}: requer "
+        f"~{required:.0f} MB + {headroom} MB de folga, há {free or 0:.0f} MB livres. "
+        "Feche outros programas ou escolha um modelo menor."
+    )
+
+
+@contextmanager
+def report_rss_growth(label: str, expected_mb: float = 0.0):
+    """Mede o crescimento do RSS durante o carregamento e registra no log/métricas."""
+    before = process_rss_mb()
+    yield
+    after = process_rss_mb()
+    if before is None or after is None:
+        return
+    growth = after - before
+    metrics.set_gauge("model.rss_growth_mb", growth)
+    metrics.set_gauge("process.rss_mb", after)
+    logger.info(
+        f"{label} carregado: RSS +{growth:.0f} MB (esperado ~{expected_mb:.0f} MB, "
+        f"total {after:.0f} MB)"
+    )
@@ -0,0 +1,187 @@
+"""
+Tradução para vários idiomas de destino a partir de uma só transcrição.
+Cada idioma tem o seu Translator (mesmo cache, mesma sessão keep-alive); a
+transcrição é enviada a todos ao mesmo tempo. O overlay recebe o idioma
+selecionado assim que ele fica pronto; os ouvintes (arquivo, transmissão)
+recebem o mapa completo {idioma: tradução} quando todos terminam.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from core.logging_config import get_logger
+from core.metrics import metrics
+from core.translator import Translator
+
+logger = get_logger("MultiTranslator")
+
+Listener = Callable[[str, Dict[str, str]], None]
+
+
+class MultiTranslator:
+    """
+    Mesma interface do Translator (`translate(text) -> str`, no idioma
+    principal), mais `translate_all` e ouvintes com todas as traduções.
+
+    Args:
+        translators: {idioma: Translator}
+        primary: Idioma exibido no overlay (trocável sem recarregar nada)
+    """
+
+    def __init__(self, translators: Dict[str, Translator], primary: str):
+        if primary not in translators:
+            raise ValueError(f"Idioma principal {primary} fora dos destinos")
+        self.translators = translators
+        self.primary = primary
+        self.from_code = translators[primary].from_code
+        self._listeners: List[Listener] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=2 * len(translators), thread_name_prefix="mt-fanout"
+        )
+
+    @classmethod
+    def from_config(
+        cls, options, from_code: str = "pt", targets: Optional[List[str]] = None
+    ) -> "MultiTranslator":
+        """Um Translator por idioma (target_lang + extra_target_langs)."""
+        primary = options.get("target_lang", "en")
+        targets = targets or [primary] + list(options.get("extra_target_langs", []))
+        translators = {
+            lang: Translator.from_config(options, from_code=from_code, to_code=lang)
+            for lang in dict.fromkeys(targets)
+            if lang != from_code or lang == primary
+        }
+        multi = cls(translators, primary)
+        if options.get("translations_log"):
+            multi.add_listener(JsonlWriter(options["translations_log"]))
+        return multi
+
+    @property
+    def to_code(self) -> str:
+        return self.primary
+
+    @property
+    def targets(self) -> List[str]:
+        return list(self.translators)
+
+    def set_primary(self, lang: str) -> bool:
+        """Troca o idioma exibido; False se não for um dos destinos."""
+        if lang not in self.translators:
+            return False
+        self.primary = lang
+        return True
+
+    def add_listener(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    def translate(self, text: str, fuzzy: bool = True, on_piece=None) -> str:
+        """
+        Tradução no idioma principal. Os demais idiomas seguem em segundo
+        plano e os ouvintes recebem o mapa completo. Prévias (fuzzy=False)
+        só vão ao idioma principal, assim como `on_piece` (partes de textos
+        longos).
+        """
+        if not fuzzy or not text or not text.strip():
+            return self.translators[self.primary].translate(
+                text, fuzzy=fuzzy, on_piece=on_piece
+            )
+        futures = self._fan_out(text, on_piece)
+        if self._listeners:
+            self._notify_when_done(text, futures)
+        return futures[self.primary].result()
+
+    def translate_all(self, text: str) -> Dict[str, str]:
+        """Traduções em todos os idiomas (bloqueia até a última)."""
+        futures = self._fan_out(text)
+        wait(futures.values())
+        return {lang: future.result() for lang, future in futures.items()}
+
+    def complete(self, text: str, known: Dict[str, str]) -> None:
+        """
+        Traduz em segundo plano para os destinos ausentes de `known` (ex.: o
+        inglês que o Whisper já traduziu) e avisa os ouvintes com o mapa
+        completo. Não bloqueia.
+        """
+        futures, requests = {}, 0
+        for lang, translator in self.translators.items():
+            if lang in known:
+                futures[lang] = Future()
+                futures[lang].set_result(known[lang])
+            else:
+                futures[lang] = self._executor.submit(translator.translate, text)
+                requests += 1
+        metrics.increment("multi_translate.fan_out")
+        metrics.increment("multi_translate.requests", requests)
+        if self._listeners:
+            self._notify_when_done(text, futures)
+
+    def _fan_out(self, text: str, on_piece=None):
+        metrics.increment("multi_translate.fan_out")
+        metrics.increment("multi_translate.requests", len(self.translators))
+        return {
+            lang: self._executor.submit(
+                translator.translate,
+                text,
+                on_piece=on_piece if lang == self.primary else None,
+            )
+            for lang, translator in self.translators.items()
+        }
+
+    def _notify_when_done(self, text: str, futures) -> None:
+        # Sem bloquear um worker: a última tradução a terminar chama os ouvintes
+        start = time.perf_counter()
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            metrics.observe("multi_translate.all_s", time.perf_counter() - start)
+            # Idiomas cuja tradução falhou ficam fora do mapa
+            results = {
+                lang: future.result()
+                for lang, future in futures.items()
+                if future.exception() is None
+            }
+            for listener in self._listeners:
+                try:
+                    listener(text, results)
+                except Exception as e:
+                    logger.warning(f"Ouvinte de traduções falhou: {e}")
+
+        for future in futures.values():
+            future.add_done_callback(done)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class JsonlWriter:
+    """Ouvinte que grava cada frase com todas as traduções (uma linha JSON)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, text: str, translations: Dict[str, str]) -> None:
+        line = json.dumps(
+            {"time": time.time(), "text": text, "translations": translations},
+            ensure_ascii=False,
+        )
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def translator_from_config(options, from_code: str = "pt", to_code=None):
+    """MultiTranslator se houver idiomas extras; senão um Translator simples."""
+    if not options.get("extra_target_langs"):
+        return Translator.from_config(options, from_code=from_code, to_code=to_code)
+    if to_code:
+        options = {**options, "target_lang": to_code}
+    return MultiTranslator.from_config(options, from_code=from_code)
@@ -6,8 +6,20 @@ import logging
 logger = logging.getLogger("Pipeline")
 from concurrent.futures import ThreadPoolExecutor
 from PySide6.QtCore import QThread, Signal
+from core.base_engine import AudioSegment
+from core.calibration import calibrate
+from core.http_translate import TranslationError
+from core.incremental_translation import IncrementalTranslator
+from core.metrics import metrics
+from core.model_admission import admit_model, report_rss_growth
+from core.stitching import stitch
 from core.transcriber import Transcriber
-from download_models import setup_vosk
+from download_models import argos_route, setup_argos, setup_vosk
+
+# Tempo máximo aguardando a confirmação de um segmento especulativo
+SPECULATIVE_DECISION_TIMEOUT = 5.0
+# Tempo máximo esperando a transcrição do chunk anterior para costurar
+STITCH_WAIT_TIMEOUT = 10.0
 
 
 class DownloadWorker(QThread):
@@ -32,41 +44,104 @@ class DownloadWorker(QThread):
 class LoaderWorker(QThread):
     finished_signal = Signal(object, object)  # transcriber, translator
     error_signal = Signal(str)
+    # Aviso ao usuário (ex.: modelo menor carregado por falta de memória)
+    notice_signal = Signal(str)
 
-    def __init__(self, m_path, target_lang, has_translator):
+    def __init__(self, m_path, target_lang, has_translator, options=None):
         super().__init__()
         self.m_path = m_path
         self.target_lang = target_lang
         self.has_translator = has_translator
+        self.options = options or {}
 
     def run(self):
         try:
             print(f"Loading model in background: {self.m_path}")
-            new_transcriber = Transcriber(self.m_path)
+            # Confere a RAM livre antes de carregar (pode cair para um modelo menor)
+            decision = admit_model(self.options, self.m_path)
+            if decision.message:
+                self.notice_signal.emit(decision.message)
+            with report_rss_growth(
+                f"Modelo {decision.model_type}", decision.required_mb
+            ):
+                new_transcriber = Transcriber(
+                    decision.model_path, options=decision.options
+                )
+            # Aquece o engine antes de reportar "Modelo carregado"
+            new_transcriber.warmup()
             new_translator = None
             if self.has_translator:
-                from core.translator import Translator
+                from core.multi_translator import translator_from_config
 
-                new_translator = Translator(from_code="pt", to_code=self.target_lang)
+                self._ensure_offline_translation()
+                new_translator = translator_from_config(
+                    self.options, from_code="pt", to_code=self.target_lang
+                )
             self.finished_signal.emit(new_transcriber, new_translator)
         except Exception as e:
             self.error_signal.emit(str(e))
 
+    def _ensure_offline_translation(self):
+        """Baixa os pacotes Argos dos idiomas de destino se o backend offline estiver ativo."""
+        if self.options.get("translation_backend", "google") != "argos":
+            return
+        model_dir = self.options.get("argos_model_dir", "model_argos")
+        for lang in [self.target_lang, *self.options.get("extra_target_langs", [])]:
+            if argos_route("pt", lang, model_dir) is not False:
+                continue
+            self.notice_signal.emit(f"Baixando modelo de tradução offline ({lang})...")
+            path, msg = setup_argos("pt", lang, base_dir=model_dir)
+            if not path:
+                # Translator.from_config cai para a tradução online
+                self.notice_signal.emit(f"Tradução offline indisponível: {msg}")
+
+
+class CalibrationWorker(QThread):
+    finished_signal = Signal(object)  # {engine: rtf}
+
+    def __init__(self, options=None):
+        super().__init__()
+        self.options = options or {}
+
+    def run(self):
+        try:
+            rtfs = calibrate(options=self.options)
+        except Exception as e:
+            logger.error(f"CalibrationWorker thread error: {e}")
+            rtfs = {}
+        self.finished_signal.emit(rtfs)
+
 
 class ProcessingThread(QThread):
     update_text_signal = Signal(str, str)
+    # Substitui uma linha já exibida (old_transcription, transcription, translation)
+    replace_text_signal = Signal(str, str, str)
+    # Rota do reconhecimento: "primary" ou "fallback" (engine offline)
+    update_route_signal = Signal(str)
     update_status_signal = Signal(bool)
     update_thinking_signal = Signal(bool)
     update_pause_signal = Signal(bool)
+    # Prévia da tradução do trecho estável da parcial (transcription, translation)
+    update_live_translation_signal = Signal(str, str)
+    # Tradução disponível (False: falhou, linhas exibidas só com a transcrição)
+    update_translation_status_signal = Signal(bool)
+    # Clipe de fala para a calibração gravado (caminho do WAV)
+    calibration_clip_signal = Signal(str)
 
     def __init__(
-        self, audio_capture, transcriber, translator, has_translator_plugin=True
+        self,
+        audio_capture,
+        transcriber,
+        translator,
+        has_translator_plugin=True,
+        options=None,
     ):
         super().__init__()
         self.audio_capture = audio_capture
         self.transcriber = transcriber
         self.translator = translator
         self.has_translator_plugin = has_translator_plugin
+        self.options = options or {}
         self._running = True
         self._paused = False
         self._last_speech_status = False
@@ -74,8 +149,24 @@ class ProcessingThread(QThread):
             ""  # Store last few words/sentences for better translation context
         )
         self.executor = ThreadPoolExecutor(max_workers=3)
+        self._last_route = "primary"
+        self._translation_ok = True
+        # SpeechClipRecorder enquanto não houver clipe de fala para calibrar
+        self.clip_recorder = None
         # Fila thread-safe para resultados do processamento assíncrono
         self._result_queue = queue.Queue()
+        self.incremental = None
+        if self.options.get("incremental_translation", False):
+            self.incremental = IncrementalTranslator(
+                self._translate_partial,
+                self.executor.submit,
+                lambda text, translation: self._result_queue.put(
+                    {"type": "live", "text": text, "translation": translation}
+                ),
+                min_interval_s=self.options.get("incremental_interval_ms", 500)
+                / 1000.0,
+                min_words=self.options.get("incremental_min_words", 3),
+            )
 
     def run(self):
         print("Starting processing thread...")
@@ -89,15 +180,7 @@ class ProcessingThread(QThread):
             # Processa resultados pendentes da fila (thread-safe)
             try:
                 while not self._result_queue.empty():
-                    result = self._result_queue.get_nowait()
-                    result_type = result.get("type")
-
-                    if result_type == "thinking":
-                        self.update_thinking_signal.emit(result["value"])
-                    elif result_type == "text":
-                        self.update_text_signal.emit(
-                            result["text"], result["translation"]
-                        )
+                    self._dispatch_result(self._result_queue.get_nowait())
             except queue.Empty:
                 pass
             except Exception as e:
@@ -106,7 +189,18 @@ class ProcessingThread(QThread):
             try:
                 # Get audio chunk
                 item = self.audio_capture.audio_queue.get(timeout=0.1)
-                audio_bytes, is_speech, energy = item if len(item) == 3 else (*item, 0)
+                if len(item) == 4:
+                    audio_bytes, is_speech, energy, raw_speech = item
+                else:
+                    audio_bytes, is_speech, energy = (
+                        item if len(item) == 3 else (*item, 0)
+                    )
+                    raw_speech = None
+
+                recorder = self.clip_recorder
+                if recorder and recorder.feed(audio_bytes, bool(is_speech)):
+                    self.clip_recorder = None
+                    self.calibration_clip_signal.emit(recorder.path)
 
                 # Emit status
                 if self._last_speech_status != is_speech:
@@ -119,11 +213,11 @@ class ProcessingThread(QThread):
                         print("Warning: Transcriber or engine not available")
                         continue
 
-                    if hasattr(self.transcriber.engine, "recognize"):
-                        # Online/Heavy engine
+                    if hasattr(self.transcriber.engine, "recognize_segment"):
+                        # Online/Heavy engine (buffers and dispatches whole segments)
                         try:
                             status, data = self.transcriber.process_audio(
-                                audio_bytes, is_speech=is_speech
+                                audio_bytes, is_speech=is_speech, raw_speech=raw_speech
                             )
                             if status is not None:
                                 self.update_thinking_signal.emit(True)
@@ -139,12 +233,17 @@ class ProcessingThread(QThread):
                         # Standard offline logic
                         try:
                             partial, final = self.transcriber.process_audio(
-                                audio_bytes, is_speech=is_speech
+                                audio_bytes, is_speech=is_speech, raw_speech=raw_speech
                             )
                             if final:
+                                if self.incremental:
+                                    self.incremental.reset()
                                 self._sync_pipeline(final)
+                                self._submit_refinements()
                             elif partial:
                                 self.update_text_signal.emit(partial, "")
+                                if self.incremental:
+                                    self.incremental.update(partial)
                         except Exception as e:
                             print(f"Error in offline engine processing: {e}")
 
@@ -153,6 +252,76 @@ class ProcessingThread(QThread):
             except Exception as e:
                 print(f"Error in processing loop: {e}")
 
+    def _dispatch_result(self, result):
+        """Emite o sinal correspondente a um resultado da fila."""
+        result_type = result.get("type")
+        if result_type == "thinking":
+            self.update_thinking_signal.emit(result["value"])
+        elif result_type == "text":
+            self.update_text_signal.emit(result["text"], result["translation"])
+        elif result_type == "replace":
+            self.replace_text_signal.emit(
+                result["old"], result["text"], result["translation"]
+            )
+        elif result_type == "route":
+            self.update_route_signal.emit(result["route"])
+        elif result_type == "live":
+            self.update_live_translation_signal.emit(
+                result["text"], result["translation"]
+            )
+        elif result_type == "translation_status":
+            self.update_translation_status_signal.emit(result["ok"])
+
+    def _translate(self, text, **kwargs):
+        """
+        Traduz `text`; em falha (TranslationError) avisa a UI e retorna None,
+        em vez de exibir o texto original como se fosse a tradução.
+        """
+        try:
+            translation = self.translator.translate(text, **kwargs)
+        except TranslationError as e:
+            print(f"Translation unavailable: {e}")
+            self._set_translation_ok(False)
+            return None
+        self._set_translation_ok(True)
+        return translation
+
+    def _set_translation_ok(self, ok):
+        # Só as mudanças de estado vão à UI
+        if ok != self._translation_ok:
+            self._translation_ok = ok
+            self._result_queue.put({"type": "translation_status", "ok": ok})
+
+    def _translate_progressive(self, text, publish):
+        """
+        Traduz `text`. Em transcrições longas (divididas em frases pelo
+        tradutor), publica o trecho já traduzido, em ordem, antes do todo.
+
+        Returns:
+            Tupla (tradução, se algum trecho foi publicado)
+        """
+        if not (self.has_translator_plugin and self.translator):
+            return text, False
+        shown = []
+
+        def on_piece(prefix):
+            if shown:
+                publish(
+                    {
+                        "type": "replace",
+                        "old": text,
+                        "text": text,
+                        "translation": f"{prefix} …",
+                    }
+                )
+            else:
+                publish({"type": "text", "text": text, "translation": f"{prefix} …"})
+            shown.append(prefix)
+
+        translation = self._translate(text, on_piece=on_piece)
+        # Falha: a linha fica só com a transcrição (a UI indica a tradução fora)
+        return (text if translation is None else translation), bool(shown)
+
     def _async_pipeline(self, data):
         """Processa reconhecimento em thread separada e coloca resultados na fila."""
         start_t = time.time()
@@ -169,31 +338,94 @@ class ProcessingThread(QThread):
                 return
 
             # 1. Recognize
-            text = (
-                self.transcriber.engine.recognize(data)
-                if isinstance(data, (bytes, bytearray))
-                else data
-            )
+            engine = self.transcriber.engine
+            translation = None
+            source = None
+            if isinstance(data, AudioSegment):
+                text = ""
+                try:
+                    if getattr(engine, "direct_translation", False):
+                        # Whisper emite o inglês direto: sem ida e volta ao tradutor
+                        source, translation = self._recognize_direct(engine, data)
+                        text = self._direct_line(engine, source, translation)
+                    else:
+                        text = engine.recognize_segment(data)
+                finally:
+                    # Libera o chunk seguinte mesmo se o reconhecimento falhar
+                    if translation:
+                        data.set_text(translation, source_text=source)
+                    else:
+                        data.set_text(text or "")
+            elif isinstance(data, (bytes, bytearray)):
+                text = engine.recognize(data)
+            else:
+                text = data
+            route = getattr(engine, "active_route", None)
+            if route and route != self._last_route:
+                self._last_route = route
+                self._result_queue.put({"type": "route", "route": route})
+            if isinstance(data, AudioSegment):
+                self.transcriber.observe_recognition(
+                    data.duration(engine.sample_rate), time.time() - start_t
+                )
+            if isinstance(data, AudioSegment) and data.speculative:
+                # Segmento especulativo: só vale se o silêncio se confirmar
+                outcome = data.speculative.wait(timeout=SPECULATIVE_DECISION_TIMEOUT)
+                if outcome != data.speculative.COMMITTED:
+                    metrics.increment(
+                        "speculative.wasted_recognition_s", time.time() - start_t
+                    )
+                    self._result_queue.put({"type": "thinking", "value": False})
+                    return
+            if isinstance(data, AudioSegment) and data.previous is not None and text:
+                # Chunk de fala longa: descarta as palavras da sobreposição
+                previous_text = data.previous.wait_text(timeout=STITCH_WAIT_TIMEOUT)
+                if translation:
+                    # Modo direto: costura a tradução e a transcrição original
+                    # contra as do chunk anterior
+                    translation = stitch(previous_text or "", translation)
+                    if source:
+                        source = stitch(data.previous.source_text or "", source)
+                    text = self._direct_line(engine, source, translation)
+                else:
+                    text = stitch(previous_text or "", text)
+
             if not text:
                 # Coloca na fila em vez de emitir sinal diretamente (thread-safe)
                 self._result_queue.put({"type": "thinking", "value": False})
                 return
 
-            # Coloca resultado intermediário na fila
-            self._result_queue.put({"type": "text", "text": text, "translation": ""})
-
-            # 2. Translate
-            translation = (
-                self.translator.translate(text)
-                if self.has_translator_plugin and self.translator
-                else text
-            )
+            shown = False
+            if translation:
+                metrics.increment("direct_translation.segments")
+                if source:
+                    self._translate_other_targets(source, translation)
+            else:
+                # Coloca resultado intermediário na fila
+                self._result_queue.put(
+                    {"type": "text", "text": text, "translation": ""}
+                )
+
+                # 2. Translate
+                translation, shown = self._translate_progressive(
+                    text, self._result_queue.put
+                )
 
             # Coloca resultados finais na fila
             self._result_queue.put({"type": "thinking", "value": False})
-            self._result_queue.put(
-                {"type": "text", "text": text, "translation": translation}
-            )
+            if shown:
+                self._result_queue.put(
+                    {
+                        "type": "replace",
+                        "old": text,
+                        "text": text,
+                        "translation": translation,
+                    }
+                )
+            else:
+                self._result_queue.put(
+                    {"type": "text", "text": text, "translation": translation}
+                )
         except Exception as e:
             print(f"Async pipeline error: {e}")
             import traceback
@@ -202,13 +434,115 @@ class ProcessingThread(QThread):
             # Coloca erro na fila
             self._result_queue.put({"type": "thinking", "value": False})
 
-    def _sync_pipeline(self, text):
-        translation = (
-            self.translator.translate(text)
-            if self.has_translator_plugin and self.translator
-            else text
+    def _recognize_direct(self, engine, segment):
+        """
+        Tradução direta pelo Whisper. Sem costura pendente, a linha em inglês
+        aparece assim que decodificada e a transcrição original a substitui
+        quando chega.
+
+        Returns:
+            Tupla (transcrição original ou "", tradução)
+        """
+        shown = []
+
+        def show_early(translation):
+            if segment.previous is None and not segment.speculative:
+                shown.append(translation)
+                self._result_queue.put(
+                    {"type": "text", "text": translation, "translation": translation}
+                )
+
+        source, translation = engine.translate_segment(
+            segment,
+            # Outros idiomas de destino partem da transcrição original
+            with_source=bool(engine.direct_source_transcript or self._other_targets()),
+            on_translation=show_early,
         )
-        self.update_text_signal.emit(text, translation)
+        if shown and source and engine.direct_source_transcript:
+            # Já exibida: completa a linha com o original (a emissão final
+            # idêntica é ignorada pelo overlay)
+            self._result_queue.put(
+                {
+                    "type": "replace",
+                    "old": translation,
+                    "text": source,
+                    "translation": translation,
+                }
+            )
+        return source, translation
+
+    @staticmethod
+    def _direct_line(engine, source, translation):
+        """Texto exibido no modo direto: o original (se pedido) ou o inglês."""
+        return source if source and engine.direct_source_transcript else translation
+
+    def _other_targets(self):
+        """Destinos além do inglês de um MultiTranslator (modo direto)."""
+        if not (self.has_translator_plugin and self.translator):
+            return []
+        if getattr(type(self.translator), "complete", None) is None:
+            return []
+        return [lang for lang in self.translator.targets if lang != "en"]
+
+    def _translate_other_targets(self, source, translation):
+        """
+        No modo direto o inglês veio do Whisper; os demais idiomas de destino
+        (e os ouvintes, como o registro de traduções) seguem pelo tradutor.
+        """
+        if self._other_targets():
+            self.translator.complete(source, {"en": translation})
+
+    def _submit_refinements(self):
+        """Envia ao engine pesado os segmentos de baixa confiança (modo híbrido)."""
+        take = getattr(self.transcriber.engine, "take_refinement", None)
+        if not take:
+            return
+        refinement = take()
+        while refinement is not None:
+            self.update_thinking_signal.emit(True)
+            self.executor.submit(self._refine_pipeline, *refinement)
+            refinement = take()
+
+    def _refine_pipeline(self, draft, segment):
+        """Reconhece de novo um segmento e substitui a linha exibida se mudar."""
+        start_t = time.time()
+        try:
+            text = self.transcriber.engine.refine(segment)
+            metrics.observe("hybrid.refine_latency_s", time.time() - start_t)
+            if not text or text.strip().lower() == draft.strip().lower():
+                return
+            metrics.increment("hybrid.replaced")
+            translation = (
+                self._translate(text)
+                if self.has_translator_plugin and self.translator
+                else None
+            )
+            translation = text if translation is None else translation
+            self._result_queue.put(
+                {
+                    "type": "replace",
+                    "old": draft,
+                    "text": text,
+                    "translation": translation,
+                }
+            )
+        except Exception as e:
+            print(f"Refinement pipeline error: {e}")
+        finally:
+            self._result_queue.put({"type": "thinking", "value": False})
+
+    def _translate_partial(self, text):
+        """Tradução da prévia; vai ao cache, não à memória aproximada."""
+        if not (self.has_translator_plugin and self.translator):
+            return None
+        return self._translate(text, fuzzy=False)
+
+    def _sync_pipeline(self, text):
+        translation, shown = self._translate_progressive(text, self._dispatch_result)
+        if shown:
+            self.replace_text_signal.emit(text, text, translation)
+        else:
+            self.update_text_signal.emit(text, translation)
 
     def toggle_pause(self):
         self._paused = not self._paused
@@ -221,6 +555,10 @@ class ProcessingThread(QThread):
         if self._paused:
             self.update_status_signal.emit(False)
 
+    @property
+    def paused(self):
+        return self._paused
+
     def pause_audio(self):
         self._paused = True
         self.audio_capture.stop()
@@ -241,17 +579,13 @@ class ProcessingThread(QThread):
         # Aguarda processamento de resultados pendentes
         try:
             while not self._result_queue.empty():
-                result = self._result_queue.get_nowait()
-                result_type = result.get("type")
-                if result_type == "thinking":
-                    self.update_thinking_signal.emit(result["value"])
-                elif result_type == "text":
-                    self.update_text_signal.emit(result["text"], result["translation"])
+                self._dispatch_result(self._result_queue.get_nowait())
         except:
             pass
 
         # Desliga o executor de threads
         self.executor.shutdown(wait=False)
+        metrics.log_summary()
 
         # Aguarda a thread terminar
         if not self.wait(3000):  # Aguarda até 3 segundos
@@ -0,0 +1,221 @@
+"""
+Roteamento de reconhecimento por saúde do engine.
+Um circuit breaker acompanha latência e erros do engine primário (online);
+quando o SLO é violado os segmentos vão para um engine offline aquecido
+(Vosk) até que sondagens em segundo plano mostrem que o primário se recuperou.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from core.logging_config import get_logger
+from core.metrics import metrics
+
+logger = get_logger("Routing")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker com janela móvel de latência e erros.
+
+    - CLOSED: tráfego normal; abre se a taxa de erro ou o p90 da latência
+      ultrapassar os limites (com pelo menos `min_samples` amostras).
+    - OPEN: nada vai ao primário; após `open_seconds` libera uma sondagem.
+    - HALF_OPEN: uma sondagem em andamento; sucesso dentro do SLO fecha,
+      falha reabre.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        latency_slo_s: float = 3.0,
+        max_error_rate: float = 0.5,
+        window: int = 10,
+        min_samples: int = 3,
+        open_seconds: float = 15.0,
+        clock=time.monotonic,
+    ):
+        self.latency_slo_s = latency_slo_s
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._samples = deque(maxlen=window)  # (latência, ok)
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def p90_latency(self) -> float:
+        ordered = sorted(lat for lat, _ in self._samples)
+        return (
+            ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))] if ordered else 0.0
+        )
+
+    def _open(self, reason: str) -> None:
+        self.state = self.OPEN
+        self._opened_at = self._clock()
+        metrics.increment("routing.circuit_opened")
+        logger.warning(f"Circuito aberto ({reason}): usando engine offline")
+
+    def record(self, latency_s: float, ok: bool) -> None:
+        """Registra o resultado de uma requisição normal (circuito fechado)."""
+        with self._lock:
+            self._samples.append((latency_s, ok))
+            if self.state != self.CLOSED or len(self._samples) < self.min_samples:
+                return
+            if self.error_rate() > self.max_error_rate:
+                self._open(f"erros={self.error_rate():.0%}")
+            elif self.p90_latency() > self.latency_slo_s:
+                self._open(f"p90={self.p90_latency():.2f}s")
+
+    def try_probe(self) -> bool:
+        """Com o circuito aberto, libera uma sondagem quando o tempo de espera passa."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return False
+            if self._clock() - self._opened_at < self.open_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+
+    def record_probe(self, latency_s: float, ok: bool) -> None:
+        with self._lock:
+            if self.state != self.HALF_OPEN:
+                return
+            if ok and latency_s <= self.latency_slo_s:
+                self.state = self.CLOSED
+                self._samples.clear()
+                metrics.increment("routing.circuit_closed")
+                logger.info(
+                    f"Engine primário recuperado ({latency_s:.2f}s): circuito fechado"
+                )
+            else:
+                self._open("sondagem falhou")
+
+
+def innermost(engine):
+    """Engine de fato atrás de wrappers com `primary` (hedging, roteamento)."""
+    while "primary" in getattr(engine, "__dict__", {}):
+        engine = engine.primary
+    return engine
+
+
+class RoutedEngine:
+    """
+    Envolve um engine primário com segmentação própria e um engine offline
+    de reserva (recognize(bytes)). Enquanto o circuito está aberto, cada
+    segmento é reconhecido pelo reserva e, de tempos em tempos, enviado ao
+    primário em paralelo como sondagem (o resultado da sondagem é descartado).
+
+    Com o circuito fechado, uma requisição ao primário que passe de
+    `request_timeout_s` ou falhe cai no reserva, para que a legenda não trave.
+    """
+
+    PRIMARY = "primary"
+    FALLBACK = "fallback"
+
+    def __init__(self, primary, fallback, breaker=None, request_timeout_s=None):
+        self.primary = primary
+        self.fallback = fallback
+        self.breaker = breaker or CircuitBreaker()
+        # Sem timeout explícito, espera até 2x o SLO antes de cair no reserva
+        self.request_timeout_s = request_timeout_s or 2 * self.breaker.latency_slo_s
+        # Falhas do primário precisam chegar aqui em vez de virar texto vazio
+        # (no engine de fato: num wrapper como o HedgedEngine o atributo
+        # ficaria só no wrapper)
+        engine = innermost(primary)
+        if hasattr(engine, "raise_errors"):
+            engine.raise_errors = True
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="route")
+
+    def __getattr__(self, name):
+        # Só chamado para atributos ausentes no wrapper: delega ao primário
+        if name == "primary":
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+    @property
+    def active_route(self) -> str:
+        return (
+            self.PRIMARY
+            if self.breaker.state == CircuitBreaker.CLOSED
+            else self.FALLBACK
+        )
+
+    def process_audio(self, audio_bytes, is_speech, raw_speech=None):
+        return self.primary.process_audio(audio_bytes, is_speech, raw_speech)
+
+    def warmup(self, duration_s=1.0):
+        # O reserva precisa estar quente antes da primeira queda de rede
+        elapsed = self.primary.warmup(duration_s)
+        if hasattr(self.fallback, "warmup"):
+            elapsed += self.fallback.warmup(duration_s)
+        return elapsed
+
+    def reset(self):
+        self.primary.reset()
+
+    def recognize(self, audio_data_bytes):
+        return self.primary.recognize(audio_data_bytes)
+
+    def _recognize_fallback(self, segment) -> str:
+        metrics.increment("routing.fallback_segments")
+        self._abort_stream(segment)
+        try:
+            return self.fallback.recognize(segment.audio)
+        except Exception as e:
+            logger.warning(f"Engine offline falhou: {e}")
+            return ""
+
+    @staticmethod
+    def _abort_stream(segment) -> None:
+        stream = getattr(segment, "stream", None)
+        if stream is not None:
+            stream.abort()
+
+    def _probe(self, segment) -> None:
+        start = time.perf_counter()
+        try:
+            self.primary.recognize(segment.audio)
+            ok = True
+        except Exception as e:
+            logger.debug(f"Sondagem do primário falhou: {e}")
+            ok = False
+        self.breaker.record_probe(time.perf_counter() - start, ok)
+
+    def recognize_segment(self, segment):
+        """Reconhece pelo primário ou pelo reserva conforme o circuito."""
+        if self.breaker.state != CircuitBreaker.CLOSED:
+            if self.breaker.try_probe():
+                metrics.increment("routing.probes")
+                self._executor.submit(self._probe, segment)
+            return self._recognize_fallback(segment)
+
+        start = time.perf_counter()
+        future = self._executor.submit(self.primary.recognize_segment, segment)
+        try:
+            text = future.result(timeout=self.request_timeout_s)
+        except FutureTimeoutError:
+            metrics.increment("routing.primary_timeouts")
+            self.breaker.record(time.perf_counter() - start, False)
+            return self._recognize_fallback(segment)
+        except Exception as e:
+            logger.warning(f"Engine primário falhou: {e}")
+            metrics.increment("routing.primary_errors")
+            self.breaker.record(time.perf_counter() - start, False)
+            return self._recognize_fallback(segment)
+        latency = time.perf_counter() - start
+        metrics.observe("routing.primary_latency_s", latency)
+        self.breaker.record(latency, True)
+        return text
@@ -0,0 +1,129 @@
+"""
+Segmentador adaptativo compartilhado pelos engines.
+Aprende a distribuição de pausas do falante e a latência de reconhecimento
+observada para ajustar o limiar de endpoint e o tamanho máximo do segmento.
+"""
+
+import math
+from collections import deque
+from typing import Optional
+
+from core.logging_config import get_logger
+from core.metrics import metrics
+
+logger = get_logger("Segmenter")
+
+
+class AdaptiveSegmenter:
+    """
+    Ajusta limiares de segmentação a partir do comportamento observado.
+
+    - Endpoint: um pouco acima do p90 das pausas internas (pausas após as
+      quais a fala recomeçou), para não cortar frases de quem fala devagar
+      nem esperar à toa com quem fala rápido.
+    - Tamanho máximo: limitado para que a palavra mais antiga do segmento
+      apareça dentro da meta de latência, dado o fator de tempo real (RTF)
+      medido do engine.
+    """
+
+    def __init__(
+        self,
+        frame_ms: int = 30,
+        latency_target_s: float = 2.5,
+        initial_silence_frames: int = 15,
+        min_silence_frames: int = 6,
+        max_silence_frames: int = 30,
+        initial_max_segment_s: float = 6.0,
+        min_max_segment_s: float = 1.5,
+        max_max_segment_s: float = 10.0,
+        margin_frames: int = 2,
+        min_pause_samples: int = 8,
+        window: int = 50,
+    ):
+        self.frame_ms = frame_ms
+        self.latency_target_s = latency_target_s
+        self.min_silence_frames = min_silence_frames
+        self.max_silence_frames = max_silence_frames
+        self.min_max_segment_s = min_max_segment_s
+        self.max_max_segment_s = max_max_segment_s
+        self.margin_frames = margin_frames
+        self.min_pause_samples = min_pause_samples
+
+        self.silence_threshold_frames = initial_silence_frames
+        self.max_segment_seconds = initial_max_segment_s
+
+        self.pauses = deque(maxlen=window)
+        self.segment_lengths = deque(maxlen=window)
+        self.rtf: Optional[float] = None
+        self._silence_run = 0
+        self._in_speech = False
+
+    def observe_frame(self, raw_speech: bool) -> None:
+        """Registra a decisão do VAD de um frame (sem post-roll)."""
+        if raw_speech:
+            if (
+                self._in_speech
+                and 0 < self._silence_run < self.silence_threshold_frames
+            ):
+                # Pausa interna: a fala recomeçou antes do endpoint
+                self.pauses.append(self._silence_run)
+                self._update()
+            self._in_speech = True
+            self._silence_run = 0
+        else:
+            self._silence_run += 1
+
+    def observe_endpoint(self) -> None:
+        """Fim de segmento sem despacho (curto demais ou rejeitado)."""
+        self._in_speech = False
+        self._silence_run = 0
+
+    def observe_segment(self, duration_s: float) -> None:
+        """Registra o tamanho de um segmento despachado para reconhecimento."""
+        self.segment_lengths.append(duration_s)
+        self.observe_endpoint()
+
+    def observe_recognition(self, audio_s: float, latency_s: float) -> None:
+        """Registra a latência de reconhecimento para estimar o RTF (média móvel)."""
+        if audio_s <= 0:
+            return
+        sample = latency_s / audio_s
+        self.rtf = sample if self.rtf is None else 0.8 * self.rtf + 0.2 * sample
+        self._update()
+
+    def _quantile(self, values, q: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(math.ceil(q * len(ordered))) - 1)]
+
+    def _update(self) -> None:
+        old = (self.silence_threshold_frames, self.max_segment_seconds)
+
+        if len(self.pauses) >= self.min_pause_samples:
+            threshold = self._quantile(self.pauses, 0.9) + self.margin_frames
+            if self.rtf is not None and self.segment_lengths:
+                # Sob pressão de latência aceita cortar pausas mais longas
+                typical_len = sum(self.segment_lengths) / len(self.segment_lengths)
+                endpoint_s = threshold * self.frame_ms / 1000.0
+                if endpoint_s + self.rtf * typical_len > self.latency_target_s:
+                    threshold = self._quantile(self.pauses, 0.5) + self.margin_frames
+            self.silence_threshold_frames = int(
+                min(self.max_silence_frames, max(self.min_silence_frames, threshold))
+            )
+
+        if self.rtf is not None:
+            max_s = self.latency_target_s / (1.0 + self.rtf)
+            self.max_segment_seconds = round(
+                min(self.max_max_segment_s, max(self.min_max_segment_s, max_s)), 2
+            )
+
+        metrics.set_gauge("segmenter.silence_frames", self.silence_threshold_frames)
+        metrics.set_gauge("segmenter.max_segment_s", self.max_segment_seconds)
+        if self.rtf is not None:
+            metrics.set_gauge("segmenter.rtf", round(self.rtf, 3))
+
+        if (self.silence_threshold_frames, self.max_segment_seconds) != old:
+            logger.info(
+                f"Segmentação ajustada: endpoint={self.silence_threshold_frames * self.frame_ms} ms, "
+                f"máx={self.max_segment_seconds:.2f}s "
+                f"(pausas={len(self.pauses)}, rtf={self.rtf if self.rtf is None else round(self.rtf, 2)})"
+            )
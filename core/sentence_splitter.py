@@ -0,0 +1,94 @@
+"""
+Divisão de transcrições longas em frases e orações antes da tradução.
+Um segmento de 6 s do Whisper ou um final longo do Vosk vira várias partes
+curtas, traduzidas em paralelo; a primeira aparece sem esperar o bloco todo.
+
+O Whisper pontua o texto (corte nas frases); o Vosk não, então frases longas
+são cortadas antes de conjunções e, em último caso, no limite de tamanho.
+"""
+
+import re
+from typing import List
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…;])\s+")
+_CLAUSE_END = re.compile(r"(?<=[,:])\s+")
+
+# Conjunções que costumam abrir uma oração (corte antes delas)
+CLAUSE_WORDS = {
+    "mas",
+    "porém",
+    "porque",
+    "pois",
+    "então",
+    "portanto",
+    "entretanto",
+    "contudo",
+    "embora",
+    "enquanto",
+    "quando",
+}
+
+# Idiomas escritos sem espaço entre as frases traduzidas
+NO_SPACE_LANGS = {"ja", "zh"}
+
+
+def _split_words(text: str, max_chars: int, min_chars: int) -> List[str]:
+    """Corta antes de conjunções (com min_chars acumulados) ou em max_chars."""
+    pieces, current = [], []
+    for word in text.split():
+        length = len(" ".join(current))
+        if current and (
+            length + 1 + len(word) > max_chars
+            or (length >= min_chars and word.lower() in CLAUSE_WORDS)
+        ):
+            pieces.append(" ".join(current))
+            current = []
+        current.append(word)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _merge_short(pieces: List[str], min_chars: int) -> List[str]:
+    """Junta partes curtas demais à anterior (fragmento traduz mal)."""
+    merged: List[str] = []
+    for piece in pieces:
+        if merged and (len(piece) < min_chars or len(merged[-1]) < min_chars):
+            merged[-1] = f"{merged[-1]} {piece}"
+        else:
+            merged.append(piece)
+    return merged
+
+
+def split_sentences(text: str, max_chars: int = 80, min_chars: int = 20) -> List[str]:
+    """
+    Divide o texto em partes de até ~max_chars, na ordem original.
+
+    Args:
+        text: Transcrição
+        max_chars: Textos até este tamanho não são divididos
+        min_chars: Tamanho mínimo de uma parte
+
+    Returns:
+        Partes do texto (uma só se o texto for curto)
+    """
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return [text] if text else []
+    pieces: List[str] = []
+    for sentence in _SENTENCE_END.split(text):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for clause in _CLAUSE_END.split(sentence):
+            if len(clause) <= max_chars:
+                pieces.append(clause)
+            else:
+                pieces.extend(_split_words(clause, max_chars, min_chars))
+    return _merge_short(pieces, min_chars)
+
+
+def join_sentences(pieces: List[str], lang: str) -> str:
+    """Junta as partes traduzidas com o separador da escrita do idioma de destino."""
+    separator = "" if lang.split("-")[0].lower() in NO_SPACE_LANGS else " "
+    return separator.join(piece.strip() for piece in pieces)
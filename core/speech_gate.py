@@ -0,0 +1,124 @@
+"""
+Verificador de presença de fala antes do reconhecimento.
+Usa as decisões do VAD por frame e a energia já calculadas durante a
+segmentação para descartar tosses, teclado e ruído antes do ASR/rede.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from core.metrics import metrics
+
+# (offset em bytes no segmento, energia RMS, fala no VAD bruto)
+Frame = Tuple[int, float, bool]
+
+
+@dataclass
+class SegmentStats:
+    """Estatísticas de fala de um segmento."""
+
+    duration_s: float
+    voiced_s: float
+    speech_ratio: float  # fala / trecho do primeiro ao último frame com fala
+    longest_voiced_s: float
+    energy_contrast: Optional[float]  # energia média com fala / mediana sem fala
+
+
+def segment_stats(
+    frames: List[Frame], total_bytes: int, sample_rate: int
+) -> SegmentStats:
+    """Calcula as estatísticas a partir dos frames do segmento."""
+    bytes_per_s = sample_rate * 2
+    voiced_s = longest = run = 0.0
+    voiced_energy, unvoiced_energy = [], []
+    span_start = span_end = None
+    for i, (offset, energy, raw) in enumerate(frames):
+        end = frames[i + 1][0] if i + 1 < len(frames) else total_bytes
+        frame_s = max(0, end - offset) / bytes_per_s
+        if raw:
+            span_start = offset if span_start is None else span_start
+            span_end = end
+            voiced_s += frame_s
+            run += frame_s
+            longest = max(longest, run)
+            voiced_energy.append(energy)
+        else:
+            run = 0.0
+            unvoiced_energy.append(energy)
+
+    duration_s = total_bytes / bytes_per_s
+    # Pre-roll, post-roll e o silêncio do endpoint ficam fora da razão: um
+    # "sim" curto ocupa pouco do segmento, mas quase todo o trecho falado
+    span_s = (span_end - span_start) / bytes_per_s if voiced_energy else 0.0
+    contrast = None
+    if voiced_energy and unvoiced_energy:
+        floor = sorted(unvoiced_energy)[len(unvoiced_energy) // 2]
+        contrast = (sum(voiced_energy) / len(voiced_energy)) / max(floor, 1.0)
+    return SegmentStats(
+        duration_s=duration_s,
+        voiced_s=voiced_s,
+        speech_ratio=voiced_s / span_s if span_s else 0.0,
+        longest_voiced_s=longest,
+        energy_contrast=contrast,
+    )
+
+
+class SpeechVerifier:
+    """
+    Rejeita segmentos com pouca fala antes do reconhecimento.
+
+    Args:
+        min_speech_ratio: Fração mínima com fala no VAD bruto, entre o
+            primeiro e o último frame com fala
+        min_voiced_seconds: Tempo mínimo total com fala
+        min_voiced_run_seconds: Trecho contínuo mínimo com fala (cliques de
+            teclado produzem frames de fala isolados)
+        min_energy_contrast: Razão mínima entre a energia com fala e o ruído
+            de fundo do segmento (0 desativa)
+    """
+
+    def __init__(
+        self,
+        min_speech_ratio: float = 0.3,
+        min_voiced_seconds: float = 0.25,
+        min_voiced_run_seconds: float = 0.12,
+        min_energy_contrast: float = 1.5,
+    ):
+        self.min_speech_ratio = min_speech_ratio
+        self.min_voiced_seconds = min_voiced_seconds
+        self.min_voiced_run_seconds = min_voiced_run_seconds
+        self.min_energy_contrast = min_energy_contrast
+
+    def rejection_reason(self, stats: SegmentStats) -> Optional[str]:
+        """Retorna o motivo da rejeição, ou None se o segmento tem fala."""
+        if stats.voiced_s < self.min_voiced_seconds:
+            return "voiced_duration"
+        if stats.speech_ratio < self.min_speech_ratio:
+            return "speech_ratio"
+        if stats.longest_voiced_s < self.min_voiced_run_seconds:
+            return "voiced_run"
+        if (
+            self.min_energy_contrast
+            and stats.energy_contrast is not None
+            and stats.energy_contrast < self.min_energy_contrast
+        ):
+            return "energy_contrast"
+        return None
+
+    def accept(
+        self, frames: List[Frame], total_bytes: int, sample_rate: int, record=True
+    ) -> bool:
+        """
+        Verifica o segmento e, se `record`, contabiliza o resultado em
+        verifier.accepted / verifier.rejected(.<motivo>) / verifier.rejected_audio_s.
+        """
+        stats = segment_stats(frames, total_bytes, sample_rate)
+        reason = self.rejection_reason(stats)
+        if record:
+            if reason is None:
+                metrics.increment("verifier.accepted")
+            else:
+                metrics.increment("verifier.rejected")
+                metrics.increment(f"verifier.rejected.{reason}")
+                metrics.increment("verifier.rejected_audio_s", stats.duration_s)
+        return reason is None
@@ -0,0 +1,63 @@
+"""
+Costura de transcrições de chunks sobrepostos.
+Remove do início do chunk atual as palavras que repetem o fim do anterior.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import List
+
+_PUNCT = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize_word(word: str) -> str:
+    """Normaliza uma palavra para comparação (minúsculas, sem acento/pontuação)."""
+    word = unicodedata.normalize("NFKD", word.lower())
+    word = "".join(c for c in word if not unicodedata.combining(c))
+    return _PUNCT.sub("", word)
+
+
+def _normalize(words: List[str]) -> List[str]:
+    return [normalize_word(w) for w in words]
+
+
+def stitch(previous: str, current: str, window: int = 8) -> str:
+    """
+    Retorna a parte nova de `current`, descontando a sobreposição com `previous`.
+
+    O alinhamento procura o maior trecho comum entre as últimas `window`
+    palavras do chunk anterior e as primeiras do atual. Ele só é aceito se
+    encostar no fim do anterior e no começo do atual (tolerando uma palavra
+    cortada em cada borda).
+
+    Args:
+        previous: Transcrição do chunk anterior
+        current: Transcrição do chunk atual (começa no áudio sobreposto)
+        window: Número máximo de palavras consideradas em cada borda
+
+    Returns:
+        Texto do chunk atual sem as palavras duplicadas
+    """
+    prev_words = previous.split()
+    cur_words = current.split()
+    if not prev_words or not cur_words:
+        return current.strip()
+
+    tail = _normalize(prev_words[-window:])
+    head = _normalize(cur_words[:window])
+    match = SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(
+        0, len(tail), 0, len(head)
+    )
+    if match.size == 0:
+        return current.strip()
+
+    touches_end = match.a + match.size >= len(tail) - 1
+    touches_start = match.b <= 1
+    # Uma única palavra só conta se for longa e exatamente na borda
+    reliable = match.size >= 2 or (
+        len(tail[match.a]) >= 4 and match.a + 1 == len(tail) and match.b == 0
+    )
+    if touches_end and touches_start and reliable:
+        return " ".join(cur_words[match.b + match.size :])
+    return current.strip()
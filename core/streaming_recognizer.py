@@ -0,0 +1,226 @@
+"""
+Clientes de reconhecimento em streaming: o upload começa no início da fala
+e os chunks comprimidos são enviados enquanto o usuário ainda está falando.
+No endpoint só resta o último chunk em trânsito.
+"""
+
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+import requests
+
+from core.base_engine import RecognitionError
+from core.google_speech import GoogleSpeechClient, parse_response
+from core.logging_config import get_logger
+
+logger = get_logger("StreamingRecognizer")
+
+# Marca na fila de envio: derruba o upload em vez de encerrá-lo
+_ABORT = object()
+
+
+class _UploadAborted(Exception):
+    """Levantada no corpo do upload para fechar a conexão sem o chunk final."""
+
+
+class _AppendOnlySink:
+    """
+    Arquivo virtual para o libsndfile que só repassa bytes novos.
+
+    Ao fechar, o encoder volta ao início para preencher o total de amostras
+    no STREAMINFO; essas reescritas são ignoradas, pois um STREAMINFO com
+    total desconhecido (0) é válido para streams FLAC.
+    """
+
+    def __init__(self):
+        self._size = 0
+        self._pos = 0
+        self._pending = bytearray()
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        end = self._pos + len(data)
+        if end > self._size:
+            self._pending.extend(data[max(self._size - self._pos, 0) :])
+            self._size = end
+        self._pos = end
+        return len(data)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 0:
+            self._pos = offset
+        elif whence == 1:
+            self._pos += offset
+        else:
+            self._pos = self._size + offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        return b""
+
+    def take(self) -> bytes:
+        data = bytes(self._pending)
+        self._pending.clear()
+        return data
+
+
+class FlacStreamEncoder:
+    """Encoder FLAC incremental: cada chamada devolve os bytes já prontos."""
+
+    def __init__(self, sample_rate: int = 16000):
+        import soundfile as sf
+
+        self._sink = _AppendOnlySink()
+        self._file = sf.SoundFile(
+            self._sink,
+            "w",
+            samplerate=sample_rate,
+            channels=1,
+            format="FLAC",
+            subtype="PCM_16",
+        )
+
+    def encode(self, pcm_bytes: bytes) -> bytes:
+        if pcm_bytes:
+            self._file.write(np.frombuffer(pcm_bytes, dtype=np.int16))
+        return self._sink.take()
+
+    def finish(self) -> bytes:
+        if not self._file.closed:
+            self._file.close()
+        return self._sink.take()
+
+
+class StreamingRecognizerClient(ABC):
+    """
+    Interface de um upload de reconhecimento em andamento.
+
+    Ciclo de vida: open() no início da fala, push() a cada frame capturado,
+    finish() no endpoint (bloqueia até a transcrição) ou abort() se o
+    segmento for descartado.
+    """
+
+    @abstractmethod
+    def open(self) -> None:
+        pass
+
+    @abstractmethod
+    def push(self, pcm_bytes: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def finish(self) -> str:
+        pass
+
+    @abstractmethod
+    def abort(self) -> None:
+        pass
+
+
+class HttpStreamingClient(StreamingRecognizerClient):
+    """
+    Upload chunked (Transfer-Encoding: chunked) para o endpoint speech-api v2,
+    reutilizando a sessão keep-alive do GoogleSpeechClient.
+
+    O áudio é codificado em FLAC incrementalmente; os chunks são agrupados
+    em ~chunk_ms antes de entrar na fila de envio.
+    """
+
+    def __init__(self, client: GoogleSpeechClient, chunk_ms: int = 250):
+        self.client = client
+        self.chunk_bytes = int(client.sample_rate * 2 * chunk_ms / 1000)
+        self.chunks_sent = 0
+        self.bytes_sent = 0
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._pending = bytearray()
+        self._encoder: Optional[FlacStreamEncoder] = None
+        self._thread: Optional[threading.Thread] = None
+        self._result: Optional[str] = None
+        self._error: Optional[Exception] = None
+        self._aborted = False
+        self.opened_at: Optional[float] = None
+
+    def open(self) -> None:
+        self._encoder = FlacStreamEncoder(self.client.sample_rate)
+        self.opened_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _body(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            if chunk is _ABORT:
+                # Sem o chunk de tamanho zero o servidor vê um corpo incompleto
+                # e não reconhece (nem cobra) o áudio parcial
+                raise _UploadAborted()
+            self.chunks_sent += 1
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+    def _run(self):
+        headers = {"Content-Type": f"audio/x-flac; rate={self.client.sample_rate}"}
+        try:
+            response = self.client.session.post(
+                self.client.endpoint,
+                params=self.client.params,
+                data=self._body(),
+                headers=headers,
+                timeout=self.client.timeout,
+            )
+            response.raise_for_status()
+            self._result = parse_response(response.content.decode("utf-8"))
+        except (requests.RequestException, RecognitionError, _UploadAborted) as e:
+            if not self._aborted:
+                logger.debug(f"Streaming de reconhecimento falhou: {e}")
+            self._error = e
+
+    def _send(self, data: bytes):
+        if data:
+            self._queue.put(data)
+
+    def push(self, pcm_bytes: bytes) -> None:
+        if self._aborted or not pcm_bytes:
+            return
+        self._pending.extend(pcm_bytes)
+        if len(self._pending) >= self.chunk_bytes:
+            self._send(self._encoder.encode(bytes(self._pending)))
+            self._pending.clear()
+
+    def finish(self) -> str:
+        """
+        Envia o restante do áudio e aguarda a transcrição.
+
+        Raises:
+            RecognitionError: Em falha de rede, timeout ou resposta de erro
+        """
+        tail = self._encoder.encode(bytes(self._pending)) + self._encoder.finish()
+        self._send(tail)
+        self._pending.clear()
+        self._queue.put(None)
+        self._thread.join(timeout=sum(self.client.timeout))
+        if self._thread.is_alive():
+            raise RecognitionError("Timeout aguardando resposta do streaming")
+        if self._error:
+            raise RecognitionError(
+                f"Falha no streaming de reconhecimento: {self._error}"
+            )
+        return self._result or ""
+
+    def abort(self) -> None:
+        """Derruba o upload sem esperar resposta (segmento descartado)."""
+        if self._aborted:
+            return
+        self._aborted = True
+        self._pending.clear()
+        self._queue.put(_ABORT)
+        if self._encoder:
+            self._encoder.finish()
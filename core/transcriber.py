@@ -1,8 +1,29 @@
 import os
 import json
+import time
 import vosk
 import sys
-import speech_recognition as sr
+import threading
+from collections import defaultdict, deque
+
+from core.base_engine import (
+    AudioSegment,
+    BaseAudioEngine,
+    RecognitionError,
+    synthetic_audio,
+)
+from core.features import N_FRAMES, IncrementalLogMel
+from core.google_speech import GoogleSpeechClient
+from core.hedging import HedgedEngine
+from core.routing import CircuitBreaker, RoutedEngine, innermost
+from core.streaming_recognizer import HttpStreamingClient
+from core.logging_config import get_logger
+from core.metrics import metrics
+from core.model_admission import model_cache
+from core.segmenter import AdaptiveSegmenter
+from core.speech_gate import SpeechVerifier
+
+logger = get_logger("Transcriber")
 
 try:
     import whisper
@@ -13,35 +34,261 @@ except ImportError:
 
 
 class Transcriber:
-    def __init__(self, engine_type="small", sample_rate=16000):
+    def __init__(self, engine_type="small", sample_rate=16000, options=None):
         """
-        engine_type can be: "small", "big", "google", "whisper"
+        engine_type can be: "small", "big", "google", "whisper" (or a Vosk model path;
+        with options["model_type"] == "hybrid" that path drives the live pass)
+        options: config dict (ConfigSchema fields) with engine tuning values.
         """
         self.engine_type = engine_type
         self.sample_rate = sample_rate
+        self.options = options or {}
         self.engine = None
 
-        if engine_type == "google":
-            self.engine = GoogleEngine(sample_rate)
-        elif engine_type == "whisper":
-            self.engine = WhisperEngine(sample_rate)
+        if self.options.get("model_type") == "hybrid" and engine_type not in (
+            "google",
+            "whisper",
+        ):
+            # engine_type is the Vosk model path for the live pass
+            self.engine = HybridEngine(
+                VoskEngine(
+                    engine_type,
+                    sample_rate,
+                    word_confidence=True,
+                    grammar=load_grammar(self.options),
+                ),
+                self._create_engine(self.options.get("hybrid_heavy_engine", "google")),
+                confidence_threshold=self.options.get(
+                    "hybrid_confidence_threshold", 0.75
+                ),
+            )
         else:
-            # Vosk path (small/big)
-            self.engine = VoskEngine(engine_type, sample_rate)
+            self.engine = self._create_engine(engine_type)
+
+        self._configure_segmentation()
+
+        buffered = isinstance(self.engine, BaseAudioEngine)
+        secondary = None
+        if self.options.get("hedging_enabled", False) and buffered:
+            secondary = self._create_engine_for_type(
+                self.options.get("hedge_secondary_engine", "small"), "hedging"
+            )
+        if secondary is not None:
+            delay_ms = self.options.get("hedge_delay_ms", 0)
+            self.engine = HedgedEngine(
+                self.engine,
+                secondary,
+                hedge_delay_s=delay_ms / 1000.0 if delay_ms else None,
+            )
+        fallback = None
+        if self.options.get("routing_enabled", False) and buffered:
+            fallback = self._create_engine_for_type(
+                self.options.get("fallback_engine", "small"), "roteamento"
+            )
+        if fallback is not None:
+            self.engine = RoutedEngine(
+                self.engine,
+                fallback,
+                breaker=CircuitBreaker(
+                    latency_slo_s=self.options.get("route_latency_slo_ms", 3000)
+                    / 1000.0,
+                    max_error_rate=self.options.get("route_max_error_rate", 0.5),
+                    open_seconds=self.options.get("route_probe_interval_s", 15.0),
+                ),
+            )
+        self.set_target_lang(self.options.get("target_lang"))
+
+    def whisper_engine(self):
+        """The WhisperEngine behind the hedging/routing wrappers, or None."""
+        engine = innermost(self.engine)
+        return engine if isinstance(engine, WhisperEngine) else None
 
-    def process_audio(self, audio_bytes, is_speech=False):
+    def set_target_lang(self, target_lang):
+        """
+        Whisper translates speech directly only into English: direct mode is
+        on for target "en" and off for any other target.
+        """
+        engine = self.whisper_engine()
+        if engine is None:
+            return
+        engine.direct_translation = bool(
+            self.options.get("whisper_direct_translation", True)
+            and target_lang == "en"
+            and self.options.get("source_lang", "pt") != "en"
+        )
+        engine.direct_source_transcript = self.options.get(
+            "whisper_direct_source", True
+        )
+
+    def _create_engine(self, engine_type):
+        if engine_type == "google":
+            return GoogleEngine(
+                self.sample_rate,
+                endpoint=self.options.get("google_speech_endpoint"),
+                connect_timeout=self.options.get("google_connect_timeout", 3.0),
+                read_timeout=self.options.get("google_read_timeout", 10.0),
+                streaming=self.options.get("google_streaming", False),
+                stream_chunk_ms=self.options.get("google_stream_chunk_ms", 250),
+            )
+        if engine_type.startswith("whisper"):
+            # "whisper" (size from the profile) or "whisper-<size>" (e.g. whisper-tiny)
+            return WhisperEngine(
+                self.sample_rate,
+                model_name=engine_type.partition("-")[2] or None,
+                profile=self.options.get("whisper_profile", "balanced"),
+            )
+        # Vosk path (small/big)
+        return VoskEngine(
+            engine_type, self.sample_rate, grammar=load_grammar(self.options)
+        )
+
+    def _create_engine_for_type(self, model_type, purpose):
+        """
+        Like _create_engine, but resolves Vosk model types to their install path.
+        Returns None (and the wrapper for `purpose` is not enabled) when the
+        Vosk model is not installed.
+        """
+        if model_type in ("small", "big"):
+            from download_models import is_model_installed
+
+            path = is_model_installed(model_type)
+            if not path:
+                logger.warning(
+                    f"Modelo {model_type} não instalado: {purpose} desativado"
+                )
+                metrics.increment("engine.missing_auxiliary_model")
+                return None
+            return VoskEngine(path, self.sample_rate)
+        return self._create_engine(model_type)
+
+    def _configure_segmentation(self):
+        """Applies the speculative/adaptive segmentation options to the engine."""
+        if self.options.get("adaptive_segmentation", False) and hasattr(
+            self.engine, "segmenter"
+        ):
+            self.engine.segmenter = AdaptiveSegmenter(
+                latency_target_s=self.options.get("latency_target_ms", 2500) / 1000.0,
+                initial_max_segment_s=getattr(self.engine, "max_buffer_seconds", 6),
+            )
+        if not isinstance(self.engine, BaseAudioEngine):
+            return
+        self.engine.chunk_overlap_seconds = (
+            self.options.get("chunk_overlap_ms", 500) / 1000.0
+        )
+        if self.options.get("speech_gate_enabled", True):
+            self.engine.verifier = SpeechVerifier(
+                min_speech_ratio=self.options.get("speech_gate_min_ratio", 0.3),
+                min_voiced_seconds=self.options.get("speech_gate_min_voiced_ms", 250)
+                / 1000.0,
+            )
+        if self.options.get("speculative_endpointing", False):
+            frames = max(1, int(self.options.get("speculative_silence_ms", 150) / 30))
+            self.engine.speculative_silence_frames = frames
+
+    def set_grammar(self, phrases):
+        """Troca a gramática do Vosk em tempo de execução (sem recarregar o modelo)."""
+        engine = getattr(self.engine, "live", self.engine)
+        if not hasattr(engine, "set_grammar"):
+            return False
+        engine.set_grammar(phrases)
+        return True
+
+    def process_audio(self, audio_bytes, is_speech=False, raw_speech=None):
         """
         is_speech: Current VAD state from main thread.
+        raw_speech: Per-frame VAD decision (without post-roll), if known.
         """
-        return self.engine.process_audio(audio_bytes, is_speech)
+        return self.engine.process_audio(audio_bytes, is_speech, raw_speech)
+
+    def observe_recognition(self, audio_s, latency_s):
+        """Feeds a measured recognition latency back into the segmenter."""
+        metrics.observe("recognition.latency_s", latency_s)
+        segmenter = getattr(self.engine, "segmenter", None)
+        if segmenter:
+            segmenter.observe_recognition(audio_s, latency_s)
+
+    def warmup(self):
+        """
+        Aquece o engine com áudio sintético para que a primeira frase real
+        já tenha latência de regime. Retorna a duração em segundos.
+        """
+        if not self.engine or not hasattr(self.engine, "warmup"):
+            return 0.0
+        try:
+            elapsed = self.engine.warmup()
+        except Exception as e:
+            logger.warning(f"Warm-up do engine {self.engine_type} falhou: {e}")
+            return 0.0
+        logger.info(
+            f"Warm-up do engine {self.engine_type} concluído em {elapsed * 1000:.0f} ms"
+        )
+        return elapsed
+
+
+def vosk_confidence(result):
+    """Mean word confidence of a Vosk result (None without word info)."""
+    words = result.get("result") or []
+    confs = [w["conf"] for w in words if "conf" in w]
+    return sum(confs) / len(confs) if confs else None
+
+
+UNK = "[unk]"
+
+
+def grammar_json(phrases):
+    """
+    Vosk grammar (JSON list) for a phrase list, or None for open vocabulary.
+    "[unk]" is appended so out-of-grammar speech is not forced onto a phrase.
+    """
+    seen = []
+    for phrase in phrases or ():
+        phrase = " ".join(str(phrase).lower().split())
+        if phrase and phrase not in seen:
+            seen.append(phrase)
+    if not seen:
+        return None
+    return json.dumps(seen + [UNK], ensure_ascii=False)
+
+
+def load_grammar(options):
+    """Phrase list from config: vosk_grammar (list) plus vosk_grammar_file (one per line)."""
+    phrases = list(options.get("vosk_grammar") or [])
+    path = options.get("vosk_grammar_file")
+    if path:
+        try:
+            with open(path, encoding="utf-8") as f:
+                phrases += [line.strip() for line in f if line.strip()]
+        except OSError as e:
+            logger.warning(f"Falha ao ler gramática {path}: {e}")
+    return phrases
+
+
+def strip_unk(text):
+    return " ".join(w for w in text.split() if w != UNK)
 
 
 class VoskEngine:
-    def __init__(self, model_path, sample_rate):
+    def __init__(self, model_path, sample_rate, word_confidence=False, grammar=None):
+        """
+        grammar: optional phrase list. When set, recognizers decode against a
+        constrained grammar instead of the full language model graph (much
+        cheaper on small vocabularies; needs a model with a dynamic graph,
+        e.g. the "small" models).
+        """
         self.model_path = model_path
         self.sample_rate = sample_rate
+        # Word-level confidences in final results (used by the hybrid engine)
+        self.word_confidence = word_confidence
+        self.grammar = grammar_json(grammar)
+        self.last_confidence = None
         self.model = None
         self.recognizer = None
+        self.silence_frames = 0
+        self.forced_final_frames = 20  # ~600ms after AudioCapture post-roll
+        # Adaptive segmenter (shared with buffered engines); drives forced finals
+        self.segmenter = None
+        self.raw_silence_frames = 0
+        self._utterance_bytes = 0
         self._initialize()
 
     def _initialize(self):
@@ -51,9 +298,11 @@ class VoskEngine:
         def try_load(path):
             try:
                 vosk.SetLogLevel(-1)
-                m = vosk.Model(path)
-                r = vosk.KaldiRecognizer(m, self.sample_rate)
-                return m, r
+                # Shared with other engines on the same model (e.g. routing fallback)
+                m = model_cache.get(
+                    ("vosk", os.path.abspath(path)), lambda: vosk.Model(path), self
+                )
+                return m, self._new_recognizer(m)
             except:
                 return None, None
 
@@ -75,88 +324,308 @@ class VoskEngine:
                 f"Vosk Init Error: Failed to load model from {self.model_path} or subfolders."
             )
 
-    def process_audio(self, audio_bytes, is_speech):
+    def _new_recognizer(self, model=None):
+        model = model or self.model
+        if self.grammar:
+            rec = vosk.KaldiRecognizer(model, self.sample_rate, self.grammar)
+        else:
+            rec = vosk.KaldiRecognizer(model, self.sample_rate)
+        if self.word_confidence:
+            rec.SetWords(True)
+        return rec
+
+    def set_grammar(self, phrases):
+        """
+        Switches to a new phrase list (None/empty = open vocabulary) by
+        building a fresh recognizer on the already loaded model; the model
+        itself is not reloaded. The utterance in progress is dropped.
+        """
+        self.grammar = grammar_json(phrases)
+        if self.model:
+            # Swap in a ready recognizer: the audio thread never sees a half-built one
+            self.recognizer = self._new_recognizer()
+        self._end_utterance()
+        metrics.increment("vosk.grammar_switches")
+
+    def warmup(self, duration_s=1.0):
+        """Decodes synthetic audio on a throwaway recognizer (live state untouched)."""
+        if not self.model:
+            return 0.0
+        start = time.perf_counter()
+        rec = self._new_recognizer()
+        rec.AcceptWaveform(synthetic_audio(self.sample_rate, duration_s))
+        rec.FinalResult()
+        return time.perf_counter() - start
+
+    def recognize(self, audio_data_bytes):
+        """
+        One-shot decoding of a whole segment on a fresh recognizer, so Vosk can
+        serve as a hedge/fallback for buffered engines without touching the
+        live streaming state. Safe to call from executor threads.
+        """
+        if not self.model:
+            return ""
+        rec = self._new_recognizer()
+        rec.AcceptWaveform(bytes(audio_data_bytes))
+        return strip_unk(json.loads(rec.FinalResult()).get("text", ""))
+
+    def _end_utterance(self):
+        if self.segmenter:
+            self.segmenter.observe_segment(
+                self._utterance_bytes / (self.sample_rate * 2)
+            )
+        self._utterance_bytes = 0
+        self.silence_frames = 0
+
+    def process_audio(self, audio_bytes, is_speech, raw_speech=None):
         if not self.recognizer:
             return None, None
 
-        if not hasattr(self, "silence_frames"):
-            self.silence_frames = 0
-
         if not is_speech:
             self.silence_frames += 1
         else:
             self.silence_frames = 0
+        self._utterance_bytes += len(audio_bytes)
+
+        silence, threshold = self.silence_frames, self.forced_final_frames
+        if self.segmenter:
+            raw = is_speech if raw_speech is None else raw_speech
+            self.segmenter.observe_frame(raw)
+            self.raw_silence_frames = 0 if raw else self.raw_silence_frames + 1
+            silence = self.raw_silence_frames
+            threshold = self.segmenter.silence_threshold_frames
 
         # If Vosk naturally accepts the waveform (inner silence detection)
         if self.recognizer.AcceptWaveform(audio_bytes):
             res = json.loads(self.recognizer.Result())
-            self.silence_frames = 0
-            return None, res.get("text", "")
+            self.last_confidence = vosk_confidence(res)
+            self._end_utterance()
+            return None, strip_unk(res.get("text", ""))
 
         # Optimization: If our OWN VAD detects silence long enough, force a result
         # This makes the "Big" model feel much faster as it doesn't wait for its internal timeout
-        if self.silence_frames >= 20:  # ~600ms
+        if silence >= threshold:
             res = json.loads(self.recognizer.PartialResult())
             partial = res.get("partial", "")
+            self.silence_frames = 0
+            self.raw_silence_frames = 0
             if partial:
                 # We stop the current result and return it as final
-                self.recognizer.Result()  # Clear internal buffer
-                self.silence_frames = 0
-                return None, partial
-            self.silence_frames = 0
+                res = json.loads(self.recognizer.Result())  # Clear internal buffer
+                self.last_confidence = vosk_confidence(res)
+                self._end_utterance()
+                return None, strip_unk(partial)
 
         # Regular partial result
         res = json.loads(self.recognizer.PartialResult())
-        return res.get("partial", ""), None
-
-
-class GoogleEngine:
-    def __init__(self, sample_rate):
-        self.recognizer = sr.Recognizer()
-        self.sample_rate = sample_rate
-        self.buffer = bytearray()
+        return strip_unk(res.get("partial", "")), None
+
+
+class HybridEngine:
+    """
+    Two-pass recognition: Vosk runs live (partials and finals with word
+    confidences) and only finals below `confidence_threshold` are queued for
+    the heavier engine, which the pipeline runs off the audio thread.
+    """
+
+    def __init__(
+        self,
+        live,
+        heavy,
+        confidence_threshold=0.75,
+        min_refine_seconds=0.5,
+        max_utterance_seconds=30,
+    ):
+        self.live = live
+        self.heavy = heavy
+        self.sample_rate = live.sample_rate
+        self.confidence_threshold = confidence_threshold
+        self.min_refine_seconds = min_refine_seconds
+        self.max_utterance_seconds = max_utterance_seconds
+        self._utterance = bytearray()
+        self._refinements = deque()
+
+    @property
+    def segmenter(self):
+        return self.live.segmenter
+
+    @segmenter.setter
+    def segmenter(self, value):
+        self.live.segmenter = value
+
+    def warmup(self):
+        elapsed = self.live.warmup()
+        if hasattr(self.heavy, "warmup"):
+            elapsed += self.heavy.warmup()
+        return elapsed
+
+    def process_audio(self, audio_bytes, is_speech, raw_speech=None):
+        if is_speech:
+            # Keep the utterance audio (pre/post-roll included) for a second pass
+            self._utterance.extend(audio_bytes)
+            max_bytes = int(self.max_utterance_seconds * self.sample_rate) * 2
+            if len(self._utterance) > max_bytes:
+                del self._utterance[:-max_bytes]
+
+        partial, final = self.live.process_audio(audio_bytes, is_speech, raw_speech)
+        if final is None:
+            return partial, final
+
+        audio, self._utterance = bytes(self._utterance), bytearray()
+        if not final:
+            return partial, final
+
+        metrics.increment("hybrid.finals")
+        confidence = self.live.last_confidence
+        if confidence is not None:
+            metrics.observe("hybrid.confidence", confidence)
+        duration_s = len(audio) / (self.sample_rate * 2)
+        if (
+            confidence is not None
+            and confidence < self.confidence_threshold
+            and duration_s >= self.min_refine_seconds
+        ):
+            metrics.increment("hybrid.refinements")
+            self._refinements.append((final, AudioSegment(audio)))
+        return partial, final
+
+    def take_refinement(self):
+        """
+        Returns the next (draft text, AudioSegment) pair that needs the heavy
+        engine, or None.
+        """
+        return self._refinements.popleft() if self._refinements else None
+
+    def refine(self, segment):
+        """Runs the heavy engine on a low-confidence segment (executor thread)."""
+        return self.heavy.recognize_segment(segment)
+
+    def reset(self):
+        self._utterance.clear()
+        self._refinements.clear()
+
+
+class GoogleEngine(BaseAudioEngine):
+    def __init__(
+        self,
+        sample_rate,
+        endpoint=None,
+        connect_timeout=3.0,
+        read_timeout=10.0,
+        streaming=False,
+        stream_chunk_ms=250,
+    ):
+        super().__init__(sample_rate)
+        # Persistent keep-alive session + in-process FLAC (no encoder subprocess)
+        self.client = GoogleSpeechClient(
+            sample_rate,
+            language="pt-BR",
+            endpoint=endpoint,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        # Streaming upload: request opened at speech onset, chunks sent while speaking
+        self.streaming = streaming
+        self.stream_chunk_ms = stream_chunk_ms
+        self.stream = None
         self.is_processing = False
-        self.silence_frames = 0
         self.silence_threshold_frames = (
             1  # ~30ms (instant trigger after AudioCapture says ok)
         )
-        self.thinking = False
-
-    def process_audio(self, audio_bytes, is_speech):
-        if audio_bytes:
-            self.buffer.extend(audio_bytes)
-
-        if not is_speech:
-            self.silence_frames += 1
+        # Full upload: short segments keep the endpoint request small. Streaming
+        # already sent most of the audio, so a sentence stays one request
+        self.max_buffer_seconds = 10 if streaming else 2
+        # Set by RoutedEngine: network failures raise instead of returning ""
+        self.raise_errors = False
+
+    def _on_audio(self, audio_bytes, is_speech):
+        if not self.streaming:
+            return
+        if self.stream is None:
+            if not is_speech:
+                return
+            # Speech onset: open the upload and send what is buffered (pre-roll)
+            self.stream = HttpStreamingClient(self.client, self.stream_chunk_ms)
+            try:
+                self.stream.open()
+            except Exception as e:
+                print(f"LOG: Streaming indisponível, usando envio completo: {e}")
+                self.streaming = False
+                self.max_buffer_seconds = 2
+                self.stream = None
+                return
+            self.stream.push(bytes(self.buffer))
         else:
-            self.silence_frames = 0
+            self.stream.push(audio_bytes)
 
-        # Trigger on sustained silence OR if buffer is very long
-        trigger = (
-            self.silence_frames >= self.silence_threshold_frames
-            and len(self.buffer) > 0
+    def _build_segment(self, data):
+        # The stream (if any) travels with the segment; a resumed speech opens a new one
+        stream, self.stream = self.stream, None
+        print(
+            f"LOG: Segmento pronto para reconhecimento ({len(data) / (self.sample_rate * 2):.2f}s). Enviando para Google..."
         )
-        safety_trigger = len(self.buffer) > self.sample_rate * 2 * 2  # 2s max
+        return AudioSegment(data, stream=stream)
 
-        if trigger or safety_trigger:
-            data = bytes(self.buffer)
-            # Filter out very short segments (noise/clicks)
-            duration_s = len(data) / (self.sample_rate * 2)
+    def _discard_segment(self):
+        stream, self.stream = self.stream, None
+        if stream:
+            stream.abort()
 
-            # Reset for next segment
-            self.buffer.clear()
-            self.silence_frames = 0
+    def reset(self):
+        super().reset()
+        self._discard_segment()
 
-            if duration_s < 0.4:  # 400ms min
-                return None, None
+    def _preprocess(self, audio_np):
+        """Noise reduction + peak normalization applied before upload."""
+        import numpy as np
 
-            print(
-                f"LOG: Segmento pronto para reconhecimento ({duration_s:.2f}s). Enviando para Google..."
-            )
-            # Return empty status + raw data for async pipeline (UI shows icon instead of text)
-            return ("", data)
+        # 1. Noise Reduction (Studio Quality)
+        try:
+            import noisereduce as nr
 
-        return None, None
+            # Apply stationary noise reduction
+            # This removes fans, clicks and background hiss
+            audio_np = nr.reduce_noise(
+                y=audio_np, sr=self.sample_rate, prop_decrease=0.8
+            )
+        except Exception as e:
+            # Log only once to avoid spam
+            if not hasattr(self, "_nr_warned"):
+                print(f"LOG: Noise reduction inactive (using raw audio): {e}")
+                self._nr_warned = True
+
+        # 2. Normalization: significantly improves recognition for quiet mic inputs
+        max_val = np.max(np.abs(audio_np))
+        if max_val > 0:
+            audio_np = (audio_np / max_val) * 30000.0  # Normalize to near-peak 16-bit
+        return audio_np
+
+    def warmup(self, duration_s=1.0):
+        """
+        Warms the local preprocessing path (noisereduce import, numpy kernels)
+        and opens the pooled connection. No audio is sent, so there is no
+        billable recognition call.
+        """
+        import numpy as np
+
+        start = time.perf_counter()
+        audio_np = np.frombuffer(
+            synthetic_audio(self.sample_rate, duration_s), dtype=np.int16
+        ).astype(np.float32)
+        self._preprocess(audio_np).astype(np.int16).tobytes()
+        self.client.preconnect()
+        return time.perf_counter() - start
+
+    def recognize_segment(self, segment):
+        """Finishes the streaming upload if one is open, else sends the whole segment."""
+        if segment.stream is not None:
+            try:
+                return segment.stream.finish()
+            except RecognitionError as e:
+                if self.raise_errors:
+                    raise
+                print(f"Google streaming error, resending whole segment: {e}")
+        return self.recognize(segment.audio)
 
     def recognize(self, audio_data_bytes):
         """This method is called in the background thread (Executor)."""
@@ -181,39 +650,14 @@ class GoogleEngine:
                 print("LOG: Empty audio array")
                 return ""
 
-            # 1. Noise Reduction (Studio Quality)
-            try:
-                import noisereduce as nr
-
-                # Apply stationary noise reduction
-                # This removes fans, clicks and background hiss
-                audio_np = nr.reduce_noise(
-                    y=audio_np, sr=self.sample_rate, prop_decrease=0.8
-                )
-            except Exception as e:
-                # Log only once to avoid spam
-                if not hasattr(self, "_nr_warned"):
-                    print(f"LOG: Noise reduction inactive (using raw audio): {e}")
-                    self._nr_warned = True
-
-            # 2. Normalization: significantly improves recognition for quiet mic inputs
-            max_val = np.max(np.abs(audio_np))
-            if max_val > 0:
-                audio_np = (
-                    audio_np / max_val
-                ) * 30000.0  # Normalize to near-peak 16-bit
-
+            audio_np = self._preprocess(audio_np)
             normalized_bytes = audio_np.astype(np.int16).tobytes()
 
-            # Verifica se o recognizer existe
-            if not hasattr(self, "recognizer") or self.recognizer is None:
-                print("LOG: Recognizer not initialized")
-                return ""
-
-            audio_data = sr.AudioData(normalized_bytes, self.sample_rate, 2)
-            text = self.recognizer.recognize_google(audio_data, language="pt-BR")
-            return text
-        except sr.UnknownValueError:
+            return self.client.recognize(normalized_bytes)
+        except RecognitionError as e:
+            if self.raise_errors:
+                raise
+            print(f"Google API Error: {e}")
             return ""
         except Exception as e:
             print(f"Google API Error: {e}")
@@ -223,46 +667,204 @@ class GoogleEngine:
             return ""
 
 
-class WhisperEngine:
-    def __init__(self, sample_rate):
-        self.sample_rate = sample_rate
+# Live-caption decoding profiles. Library defaults are tuned for offline
+# files (temperature fallback retries, conditioning on previous text,
+# timestamp tokens, fp16 on CPU); these trade accuracy for latency instead.
+WHISPER_PROFILES = {
+    "fast": {
+        "model": "tiny",
+        "beam_size": None,  # greedy
+        "best_of": None,
+        "temperature": 0.0,  # no fallback retries
+        "without_timestamps": True,
+        "no_speech_threshold": 0.6,
+    },
+    "balanced": {
+        "model": "base",
+        "beam_size": None,
+        "best_of": None,
+        "temperature": (0.0, 0.4),
+        "without_timestamps": True,
+        "no_speech_threshold": 0.6,
+    },
+    "accurate": {
+        "model": "small",
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6),
+        "without_timestamps": True,
+        "no_speech_threshold": 0.5,
+    },
+}
+
+
+def whisper_decode_options(profile, device="cpu"):
+    """Keyword arguments for model.transcribe() from a profile name."""
+    settings = WHISPER_PROFILES[profile]
+    options = {
+        "language": "pt",
+        "temperature": settings["temperature"],
+        "condition_on_previous_text": False,
+        "without_timestamps": settings["without_timestamps"],
+        "no_speech_threshold": settings["no_speech_threshold"],
+        "fp16": device != "cpu",
+    }
+    if settings["beam_size"]:
+        options["beam_size"] = settings["beam_size"]
+    if settings["best_of"]:
+        options["best_of"] = settings["best_of"]
+    return options
+
+
+_WHISPER_MODEL_LOCKS = defaultdict(threading.Lock)
+
+
+class WhisperEngine(BaseAudioEngine):
+    def __init__(self, sample_rate, model_name=None, profile="balanced"):
+        super().__init__(sample_rate)
         self.model = None
-        self.buffer = bytearray()
-        self.silence_frames = 0
         self.silence_threshold_frames = 15  # ~450ms
-        self.thinking = False
+        self.max_buffer_seconds = 6
+        self.min_segment_seconds = 0
+        self.profile = profile
+        # Direct speech translation (task="translate"), enabled by Transcriber
+        # when the target language is English
+        self.direct_translation = False
+        self.direct_source_transcript = True
+        # An explicit model size (e.g. "whisper-tiny" hedge) overrides the profile's
+        self.model_name = model_name or WHISPER_PROFILES[profile]["model"]
+        # Decoding installs kv-cache hooks on the model, which engines of the
+        # same size share through the model cache: one decode at a time
+        self._model_lock = _WHISPER_MODEL_LOCKS[self.model_name]
 
         if HAS_WHISPER:
-            print("Loading Whisper model (base)...")
-            self.model = whisper.load_model("base")
+            print(f"Loading Whisper model ({self.model_name}, profile {profile})...")
+            self.model = model_cache.get(
+                ("whisper", self.model_name),
+                lambda: whisper.load_model(self.model_name),
+                self,
+            )
+            self.decode_options = whisper_decode_options(
+                profile, str(getattr(self.model, "device", "cpu"))
+            )
+            # Log-mel computed while the user speaks; only the model runs at the endpoint
+            self.mel = IncrementalLogMel(
+                whisper.audio.mel_filters("cpu", self.model.dims.n_mels).numpy()
+            )
         else:
             raise RuntimeError("Whisper not installed")
 
-    def process_audio(self, audio_bytes, is_speech):
-        if audio_bytes:
-            self.buffer.extend(audio_bytes)
+    def _on_audio(self, audio_bytes, is_speech):
+        self.mel.feed(audio_bytes)
 
-        if not is_speech:
-            self.silence_frames += 1
-        else:
-            self.silence_frames = 0
+    def _sync_mel(self):
+        """Re-seeds the extractor when the buffer was cleared or rebased."""
+        if self.mel.num_samples != len(self.buffer) // 2:
+            self.mel.reset()
+            self.mel.feed(bytes(self.buffer))
 
-        trigger = (
-            self.silence_frames >= self.silence_threshold_frames
-            and len(self.buffer) > 0
-        )
-        safety_trigger = len(self.buffer) > self.sample_rate * 2 * 6  # 6s max
+    def _build_segment(self, data):
+        features = self.mel.features(len(data) // 2)
+        self._sync_mel()
+        return AudioSegment(data, features=features)
 
-        if trigger or safety_trigger:
-            data = bytes(self.buffer)
-            self.buffer.clear()
-            self.silence_frames = 0
-            # Return empty status + raw data for async pipeline (UI shows icon instead of text)
-            return ("", data)
+    def _discard_segment(self):
+        self._sync_mel()
 
-        return None, None
+    def reset(self):
+        super().reset()
+        self.mel.reset()
 
-    def recognize(self, audio_data_bytes):
+    def _has_window_features(self, segment):
+        return segment.features is not None and segment.features.shape[1] <= N_FRAMES
+
+    def recognize_segment(self, segment):
+        """Decodes the precomputed log-mel; falls back to the raw audio path."""
+        if not self._has_window_features(segment):
+            return self.recognize(segment.audio)
+        try:
+            return self._decode(self._encode(segment.features), "transcribe")
+        except Exception as e:
+            print(f"Whisper decode error, retrying from audio: {e}")
+            return self.recognize(segment.audio)
+
+    def translate_segment(self, segment, with_source=False, on_translation=None):
+        """
+        Speech-to-English in one model (task="translate"), skipping the MT hop.
+        The encoder runs once; the source transcript, if requested, is decoded
+        afterwards from the same audio features, so `on_translation` lets the
+        caller show the English line before it is ready.
+
+        Returns:
+            Tuple (source transcript or "", English translation)
+        """
+        try:
+            if not self._has_window_features(segment):
+                raise ValueError("segment has no single-window features")
+            audio_features = self._encode(segment.features)
+            translation = self._decode(audio_features, "translate")
+            if on_translation and translation:
+                on_translation(translation)
+            source = self._decode(audio_features, "transcribe") if with_source else ""
+        except Exception as e:
+            print(f"Whisper translate: using the raw audio path ({e})")
+            translation = self.recognize(segment.audio, task="translate")
+            if on_translation and translation:
+                on_translation(translation)
+            source = self.recognize(segment.audio) if with_source else ""
+        return source, translation
+
+    def _encode(self, features):
+        """Runs the encoder on a log-mel padded to one 30 s window."""
+        import numpy as np
+        import torch
+
+        mel = np.zeros((features.shape[0], N_FRAMES), dtype=np.float32)
+        mel[:, : features.shape[1]] = features
+        mel = torch.from_numpy(mel).to(self.model.device)
+        if self.decode_options["fp16"]:
+            mel = mel.half()
+        with self._model_lock, torch.no_grad():
+            return self.model.embed_audio(mel.unsqueeze(0))
+
+    def _decode(self, audio_features, task):
+        """
+        Single-window equivalent of model.transcribe() on precomputed encoder
+        output, with the same temperature fallback and no-speech skip.
+        """
+        opts = self.decode_options
+        temperatures = opts["temperature"]
+        if not isinstance(temperatures, (tuple, list)):
+            temperatures = (temperatures,)
+        result = None
+        for t in temperatures:
+            kwargs = {
+                "task": task,
+                "language": opts["language"],
+                "temperature": t,
+                "without_timestamps": opts["without_timestamps"],
+                "fp16": opts["fp16"],
+            }
+            if t == 0 and "beam_size" in opts:
+                kwargs["beam_size"] = opts["beam_size"]
+            elif t > 0 and "best_of" in opts:
+                kwargs["best_of"] = opts["best_of"]
+            with self._model_lock:
+                result = whisper.decode(
+                    self.model, audio_features, whisper.DecodingOptions(**kwargs)
+                )[0]
+            if result.no_speech_prob > opts["no_speech_threshold"]:
+                break  # Silence: no point retrying
+            if result.compression_ratio <= 2.4 and result.avg_logprob >= -1.0:
+                break
+        if (
+            result.no_speech_prob > opts["no_speech_threshold"]
+            and result.avg_logprob < -1.0
+        ):
+            return ""
+        return result.text.strip()
+
+    def recognize(self, audio_data_bytes, task="transcribe"):
         """This method is called in the background thread (Executor)."""
         if not HAS_WHISPER:
             return ""
@@ -273,7 +875,10 @@ class WhisperEngine:
                 np.frombuffer(audio_data_bytes, dtype=np.int16).astype(np.float32)
                 / 32768.0
             )
-            result = self.model.transcribe(audio_np, language="pt")
+            with self._model_lock:
+                result = self.model.transcribe(
+                    audio_np, task=task, **self.decode_options
+                )
             return result.get("text", "").strip()
         except Exception as e:
             print(f"Whisper Error: {e}")
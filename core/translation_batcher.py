@@ -0,0 +1,119 @@
+"""
+Micro-batching de traduções.
+Segmentos que terminam juntos (várias fontes, replay) chamam o tradutor ao
+mesmo tempo; o primeiro a chegar espera uma janela curta, junta os que
+chegaram nesse intervalo e envia tudo numa só requisição. Cada chamador
+recebe só a sua tradução.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, List
+
+from core.metrics import metrics
+
+# Separador entre frases no texto enviado em lote (o ASR não gera quebras de linha)
+DELIMITER = "\n"
+
+
+def join_batch(texts: List[str]) -> str:
+    return DELIMITER.join(" ".join(t.split()) for t in texts)
+
+
+def split_batch(translated: str, expected: int) -> List[str]:
+    """
+    Separa a tradução do lote. Levanta ValueError se o número de linhas não
+    bater (o provedor juntou ou quebrou frases) para que o chamador traduza
+    uma a uma.
+    """
+    parts = [p.strip() for p in (translated or "").split(DELIMITER)]
+    parts = [p for p in parts if p]
+    if len(parts) != expected:
+        raise ValueError(f"Lote com {len(parts)} partes, esperado {expected}")
+    return parts
+
+
+class MicroBatcher:
+    """
+    Agrupa chamadas concorrentes de `submit` em lotes para `batch_fn`.
+
+    Args:
+        batch_fn: Recebe a lista de textos e devolve a lista de resultados
+        window_s: Espera máxima do primeiro item por companhia
+        max_batch: Tamanho máximo do lote (envia antes da janela acabar)
+        max_chars: Limite de caracteres por lote (limite do provedor)
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[str]], List[str]],
+        window_s: float = 0.03,
+        max_batch: int = 8,
+        max_chars: int = 4500,
+    ):
+        self.batch_fn = batch_fn
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.max_chars = max_chars
+        self._pending = []  # (texto, Future)
+        self._cond = threading.Condition()
+        self._collecting = False
+
+    def _full(self) -> bool:
+        return len(self._pending) >= self.max_batch or (
+            sum(len(t) + 1 for t, _ in self._pending) >= self.max_chars
+        )
+
+    def submit(self, text: str) -> str:
+        """Traduz `text` junto com o que chegar na mesma janela (bloqueia)."""
+        future = Future()
+        with self._cond:
+            self._pending.append((text, future))
+            leader = not self._collecting
+            if leader:
+                self._collecting = True
+            elif self._full():
+                self._cond.notify_all()
+        if leader:
+            with self._cond:
+                self._cond.wait_for(self._full, timeout=self.window_s)
+                batch = self._take()
+                self._collecting = False
+            self._run(batch)
+        return future.result()
+
+    def _take(self):
+        """Retira da fila o maior prefixo que respeita os limites do lote."""
+        batch, chars = [], 0
+        while self._pending and len(batch) < self.max_batch:
+            text = self._pending[0][0]
+            if batch and chars + len(text) + 1 > self.max_chars:
+                break
+            batch.append(self._pending.pop(0))
+            chars += len(text) + 1
+        return batch
+
+    def _run(self, batch) -> None:
+        metrics.increment("translation_batch.requests")
+        metrics.increment("translation_batch.segments", len(batch))
+        metrics.observe("translation_batch.size", len(batch))
+        try:
+            results = self.batch_fn([text for text, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError("batch_fn devolveu um número diferente de resultados")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        # Sobras (lote cheio): o próximo líder já pode estar coletando; senão, envia
+        self._drain()
+
+    def _drain(self) -> None:
+        with self._cond:
+            if self._collecting:
+                return
+            batch = self._take()
+        if batch:
+            self._run(batch)
@@ -0,0 +1,241 @@
+"""
+Cache de traduções com LRU, TTL e persistência opcional em SQLite.
+Saudações, frases de preenchimento e termos repetidos numa reunião são
+traduzidos uma vez; as repetições saem da memória em microssegundos, sem
+ida à rede.
+
+A chave é (backend, origem, destino, texto normalizado): cada backend
+(google, argos, libretranslate) tem as suas traduções, e a troca de backend
+não serve a saída do anterior. Maiúsculas, espaços e a pontuação final não
+mudam a chave, e são reaplicados na tradução devolvida.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from core.logging_config import get_logger
+from core.metrics import metrics
+
+logger = get_logger("TranslationCache")
+
+_TERMINAL_PUNCT = re.compile(r"[\s.!?…]+$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    backend TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    text TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (backend, source, target, text)
+)
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Forma canônica da frase para a chave do cache."""
+    text = unicodedata.normalize("NFC", text)
+    text = " ".join(text.split()).casefold()
+    return _TERMINAL_PUNCT.sub("", text)
+
+
+def _terminal_punct(text: str) -> str:
+    match = _TERMINAL_PUNCT.search(text.rstrip())
+    return match.group(0).strip() if match else ""
+
+
+def restore_surface(source: str, translation: str) -> str:
+    """Reaplica na tradução em cache a capitalização inicial e a pontuação final da frase."""
+    core = _TERMINAL_PUNCT.sub("", translation.strip())
+    if not core:
+        return translation
+    stripped = source.strip()
+    if stripped[:1].isupper():
+        core = core[0].upper() + core[1:]
+    return core + _terminal_punct(source)
+
+
+class TranslationCache:
+    """
+    Cache LRU com TTL de traduções.
+
+    Args:
+        max_entries: Entradas mantidas na memória (e no disco)
+        ttl_seconds: Validade de uma tradução (0 = sem expiração)
+        path: Arquivo SQLite para persistir entre execuções (None = só memória)
+        clock: Relógio (injetável em testes)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 7 * 24 * 3600,
+        path: Optional[str] = None,
+        clock=time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, str, str, str], Tuple[str, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._db = None
+        if path:
+            self._open_db(path)
+
+    def _open_db(self, path: str) -> None:
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            # Acessado pelas threads do executor, sempre sob self._lock
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            columns = [
+                row[1] for row in self._db.execute("PRAGMA table_info(translations)")
+            ]
+            if columns and "backend" not in columns:
+                # Cache de versão anterior, sem o backend de cada tradução
+                logger.info("Cache em disco sem backend na chave: descartado")
+                self._db.execute("DROP TABLE translations")
+            self._db.execute(_SCHEMA)
+            self._purge_db()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache em disco indisponível ({path}): {e}")
+            self._db = None
+
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.ttl_seconds) and self._clock() - created_at > self.ttl_seconds
+
+    def _purge_db(self) -> None:
+        """Remove do disco as entradas vencidas e as mais antigas além do limite."""
+        if self.ttl_seconds:
+            self._db.execute(
+                "DELETE FROM translations WHERE created_at < ?",
+                (self._clock() - self.ttl_seconds,),
+            )
+        self._db.execute(
+            "DELETE FROM translations WHERE rowid NOT IN ("
+            "SELECT rowid FROM translations ORDER BY created_at DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+        self._db.commit()
+
+    def get(
+        self, source: str, target: str, text: str, backend: str = ""
+    ) -> Optional[str]:
+        """Tradução em cache da frase (já com a superfície da frase), ou None."""
+        key = (backend, source, target, normalize_text(text))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1]):
+                del self._entries[key]
+                entry = None
+            if entry is None and self._db is not None:
+                entry = self._load(key)
+                if entry is not None:
+                    metrics.increment("translation_cache.disk_hits")
+            if entry is None:
+                self.misses += 1
+                metrics.increment("translation_cache.misses")
+                return None
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            self.hits += 1
+        metrics.increment("translation_cache.hits")
+        return restore_surface(text, entry[0])
+
+    def _load(self, key) -> Optional[Tuple[str, float]]:
+        try:
+            row = self._db.execute(
+                "SELECT translation, created_at FROM translations "
+                "WHERE backend = ? AND source = ? AND target = ? AND text = ?",
+                key,
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Leitura do cache em disco falhou: {e}")
+            return None
+        if row is None or self._expired(row[1]):
+            return None
+        return row[0], row[1]
+
+    def put(
+        self, source: str, target: str, text: str, translation: str, backend: str = ""
+    ) -> None:
+        """Armazena a tradução de uma frase feita pelo backend."""
+        key = (backend, source, target, normalize_text(text))
+        if not key[3] or not translation:
+            return
+        entry = (translation, self._clock())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                        (*key, *entry),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.debug(f"Escrita do cache em disco falhou: {e}")
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM translations")
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._purge_db()
+                self._db.close()
+                self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def cache_from_config(options) -> Optional[TranslationCache]:
+    """
+    Cache compartilhado pelo processo para a configuração (None se
+    desativado). Recriar o Translator (ex.: troca de idioma) mantém o cache.
+    """
+    if not options.get("translation_cache_enabled", True):
+        return None
+    settings = (
+        options.get("translation_cache_size", 2048),
+        options.get("translation_cache_ttl_hours", 168) * 3600,
+        (
+            options.get("translation_cache_path", "cache/translations.db")
+            if options.get("translation_cache_persist", False)
+            else None
+        ),
+    )
+    with _shared_lock:
+        if settings not in _shared:
+            _shared[settings] = TranslationCache(*settings)
+        return _shared[settings]
@@ -0,0 +1,203 @@
+"""
+Memória de tradução aproximada (fuzzy) com índice de n-gramas de caracteres.
+O ASR produz muitas frases quase iguais (uma palavra de preenchimento a mais,
+um erro de reconhecimento); acima do limiar de similaridade a tradução
+guardada da frase parecida é reutilizada em vez de ir à rede.
+
+Similaridade = coeficiente de Dice dos trigramas de caracteres das frases
+normalizadas. O índice invertido (trigrama -> entradas) limita a comparação
+às entradas que compartilham trigramas com a frase nova.
+
+Similaridade alta não garante o mesmo sentido ("quero ir" x "não quero ir",
+"aprovado" x "reprovado"): a tradução só é reutilizada se as palavras que
+diferem forem de preenchimento (FILLER_WORDS); espaços e pontuação já não
+contam.
+"""
+
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from core.metrics import metrics
+from core.translation_cache import normalize_text
+
+# Preenchimentos da fala que podem sobrar ou faltar sem mudar o sentido.
+# Negações ("não", "nunca", "nem"...) nunca entram aqui.
+FILLER_WORDS = frozenset(
+    {
+        "ah",
+        "ahn",
+        "aí",
+        "assim",
+        "eh",
+        "então",
+        "hm",
+        "hum",
+        "hã",
+        "né",
+        "olha",
+        "uh",
+        "um",
+        "uhm",
+    }
+)
+
+_WORD = re.compile(r"\w+")
+
+
+def content_words(text: str) -> Tuple[str, ...]:
+    """Palavras da frase normalizada, sem pontuação e sem preenchimentos."""
+    return tuple(w for w in _WORD.findall(text) if w not in FILLER_WORDS)
+
+
+def char_ngrams(text: str, n: int = 3) -> Counter:
+    """Multiconjunto de n-gramas de caracteres (com bordas marcadas)."""
+    padded = f" {text} "
+    if len(padded) < n:
+        return Counter([padded])
+    return Counter(padded[i : i + n] for i in range(len(padded) - n + 1))
+
+
+def dice(a: Counter, b: Counter) -> float:
+    total = sum(a.values()) + sum(b.values())
+    return 2 * sum((a & b).values()) / total if total else 0.0
+
+
+@dataclass
+class MemoryMatch:
+    """Frase parecida encontrada na memória."""
+
+    source_text: str
+    translation: str
+    similarity: float
+
+
+@dataclass
+class _Entry:
+    text: str
+    translation: str
+    grams: Counter
+    words: Tuple[str, ...]
+
+
+class TranslationMemory:
+    """
+    Args:
+        threshold: Similaridade mínima (0-1) para reutilizar uma tradução
+        min_chars: Frases mais curtas não são servidas por aproximação (em
+            frases curtas uma palavra muda todo o sentido)
+        max_entries: Entradas mantidas (as mais antigas saem primeiro)
+        n: Tamanho dos n-gramas
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        min_chars: int = 16,
+        max_entries: int = 5000,
+        n: int = 3,
+    ):
+        self.threshold = threshold
+        self.min_chars = min_chars
+        self.max_entries = max_entries
+        self.n = n
+        self._entries: "OrderedDict[Tuple[str, str, str], _Entry]" = OrderedDict()
+        self._index: Dict[Tuple[str, str, str], Set[Tuple[str, str, str]]] = (
+            defaultdict(set)
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, source: str, target: str, text: str, translation: str) -> None:
+        """Indexa a tradução de uma frase."""
+        norm = normalize_text(text)
+        if len(norm) < self.min_chars or not translation:
+            return
+        key = (source, target, norm)
+        grams = char_ngrams(norm, self.n)
+        with self._lock:
+            if key in self._entries:
+                self._unindex(key)
+            self._entries[key] = _Entry(norm, translation, grams, content_words(norm))
+            self._entries.move_to_end(key)
+            for gram in grams:
+                self._index[(source, target, gram)].add(key)
+            while len(self._entries) > self.max_entries:
+                self._unindex(next(iter(self._entries)))
+
+    def _unindex(self, key) -> None:
+        entry = self._entries.pop(key)
+        source, target, _ = key
+        for gram in entry.grams:
+            bucket = self._index.get((source, target, gram))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._index[(source, target, gram)]
+
+    def lookup(self, source: str, target: str, text: str) -> Optional[MemoryMatch]:
+        """
+        Frase mais parecida acima do limiar, ou None. Entradas que diferem
+        da frase em alguma palavra de conteúdo são ignoradas.
+        """
+        norm = normalize_text(text)
+        if len(norm) < self.min_chars:
+            return None
+        grams = char_ngrams(norm, self.n)
+        words = content_words(norm)
+        size = sum(grams.values())
+        best, best_score = None, 0.0
+        with self._lock:
+            shared = set()
+            for gram in grams:
+                shared.update(self._index.get((source, target, gram), ()))
+            for key in shared:
+                entry = self._entries[key]
+                other = sum(entry.grams.values())
+                # Limite superior do Dice só pelos tamanhos: evita a comparação
+                if 2 * min(size, other) / (size + other) < self.threshold:
+                    continue
+                if entry.words != words:
+                    continue
+                score = dice(grams, entry.grams)
+                if score > best_score:
+                    best, best_score = entry, score
+            if best is None or best_score < self.threshold:
+                self.misses += 1
+                best = None
+            else:
+                self.hits += 1
+        if best is None:
+            metrics.increment("translation_memory.misses")
+            return None
+        metrics.increment("translation_memory.hits")
+        metrics.observe("translation_memory.similarity", best_score)
+        return MemoryMatch(best.text, best.translation, best_score)
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def memory_from_config(options) -> Optional[TranslationMemory]:
+    """Memória compartilhada pelo processo para a configuração (None se desativada)."""
+    if not options.get("translation_memory_enabled", False):
+        return None
+    settings = (
+        options.get("translation_memory_threshold", 0.9),
+        options.get("translation_memory_min_chars", 16),
+    )
+    with _shared_lock:
+        if settings not in _shared:
+            _shared[settings] = TranslationMemory(*settings)
+        return _shared[settings]
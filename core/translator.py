@@ -1,23 +1,226 @@
-from deep_translator import GoogleTranslator
+from concurrent.futures import ThreadPoolExecutor
 import threading
 
+from core.google_translate import GoogleTranslateClient, TranslationError
+from core.metrics import metrics
+from core.translation_batcher import MicroBatcher, join_batch, split_batch
+from core.sentence_splitter import join_sentences, split_sentences
+from core.translation_cache import restore_surface
+
+# Translation backends: name -> factory(options, from_code, to_code) returning a
+# client with translate(text) (optionally translate_batch(texts)), or None when
+# the backend is unavailable (from_config then falls back to "google")
+BACKENDS = {}
+
+def register_backend(name, factory):
+    BACKENDS[name] = factory
+
+def _transport_options(options):
+    return dict(
+        connect_timeout=options.get("translate_connect_timeout", 3.0),
+        read_timeout=options.get("translate_read_timeout", 8.0),
+        max_retries=options.get("translate_max_retries", 2),
+        hedge=options.get("translate_hedging", False),
+    )
+
+def _google_backend(options, from_code, to_code):
+    return GoogleTranslateClient(source=from_code, target=to_code,
+                                 endpoint=options.get("translate_endpoint"),
+                                 **_transport_options(options))
+
+def _argos_backend(options, from_code, to_code):
+    # Offline model; None without the package or its deps
+    from core.argos_translate import argos_client_from_config
+    return argos_client_from_config(options, from_code, to_code)
+
+def _libretranslate_backend(options, from_code, to_code):
+    # Self-hosted LibreTranslate-compatible server (LAN)
+    from core.libretranslate import LibreTranslateClient
+    return LibreTranslateClient(source=from_code, target=to_code,
+                                url=options.get("libretranslate_url"),
+                                api_key=options.get("libretranslate_api_key"),
+                                max_concurrency=options.get("libretranslate_max_concurrency", 4),
+                                **_transport_options(options))
+
+register_backend("google", _google_backend)
+register_backend("argos", _argos_backend)
+register_backend("libretranslate", _libretranslate_backend)
+
 class Translator:
-    def __init__(self, from_code='pt', to_code='en'):
+    def __init__(self, from_code='pt', to_code='en', cache=None, memory=None,
+                 refresh_fuzzy=True, batch_window_s=0.0, batch_max=8, client=None,
+                 split_chars=0, split_concurrency=4, raise_errors=False, backend="google"):
         self.from_code = from_code
         self.to_code = to_code
-        self._translator = GoogleTranslator(source=from_code, target=to_code)
+        # Pooled HTTP client with timeouts/retries (translate(text) -> str)
+        self._translator = client or GoogleTranslateClient(source=from_code, target=to_code)
+        # Raise TranslationError on failure instead of returning the source text
+        # (set by from_config: the pipeline shows the failure instead of a fake line)
+        self.raise_errors = raise_errors
+        # Optional TranslationCache: repeated phrases skip the network
+        # (entries are per backend: switching backends never serves the old output)
+        self.cache = cache
+        self.backend = backend
+        # Optional TranslationMemory: near-duplicate phrases reuse a stored translation
+        self.memory = memory
+        # Re-translates fuzzy hits in background so the exact phrase gets cached
+        self.refresh_fuzzy = refresh_fuzzy
+        self._refresh_executor = None
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        # Micro-batching: concurrent misses within the window share one request
+        self.batcher = None
+        if batch_window_s > 0:
+            self.batcher = MicroBatcher(
+                self._translate_batch, window_s=batch_window_s, max_batch=batch_max)
+        # Long transcripts are split into sentences/clauses translated concurrently
+        # (0 = never split); pieces skip the batcher so the first one returns early
+        self.split_chars = split_chars
+        self.split_concurrency = split_concurrency
+        self._split_executor = None
         print(f"DEBUG: Translator initialized for {from_code} -> {to_code}")
 
-    def translate(self, text):
+    @classmethod
+    def from_config(cls, options, from_code='pt', to_code=None):
+        """Translator with the cache/memory/batching/transport options of a config dict."""
+        from core.translation_cache import cache_from_config
+        from core.translation_memory import memory_from_config
+
+        to_code = to_code or options.get("target_lang", "en")
+        backend = options.get("translation_backend", "google")
+        factory = BACKENDS.get(backend)
+        if factory is None:
+            print(f"DEBUG: Unknown translation backend '{backend}', using google")
+        client = factory(options, from_code, to_code) if factory else None
+        if client is None:
+            backend = "google"
+            client = BACKENDS["google"](options, from_code, to_code)
+        return cls(
+            from_code,
+            to_code,
+            cache=cache_from_config(options),
+            memory=memory_from_config(options),
+            refresh_fuzzy=options.get("translation_memory_refresh", True),
+            batch_window_s=options.get("translation_batch_window_ms", 0) / 1000.0,
+            client=client,
+            split_chars=options.get("translation_split_chars", 0),
+            split_concurrency=options.get("translation_split_concurrency", 4),
+            raise_errors=True,
+            backend=backend,
+        )
+
+    def translate(self, text, fuzzy=True, on_piece=None):
+        """
+        fuzzy=False (partial transcripts) skips the translation memory both ways.
+        on_piece(prefix) receives the in-order translated prefix of a long
+        transcript each time its next piece is done.
+        """
         if not text or text.strip() == "":
             return ""
-        
+
+        pieces = split_sentences(text, self.split_chars) if self.split_chars else [text]
+        if len(pieces) > 1:
+            return self._translate_pieces(text, pieces, fuzzy, on_piece)
+        return self._translate_one(text, fuzzy)
+
+    def _translate_pieces(self, text, pieces, fuzzy, on_piece):
+        with self._refresh_lock:
+            if self._split_executor is None:
+                self._split_executor = ThreadPoolExecutor(
+                    max_workers=self.split_concurrency, thread_name_prefix="mt-split")
+        metrics.increment("translation_split.segments")
+        metrics.observe("translation_split.pieces", len(pieces))
+        futures = [self._split_executor.submit(self._translate_one, piece, fuzzy, False, True)
+                   for piece in pieces]
+        done = []
         try:
-            # deep-translator is synchronous and uses requests internally
-            translated = self._translator.translate(text)
+            for future in futures[:-1]:
+                done.append(future.result())
+                if on_piece:
+                    on_piece(join_sentences(done, self.to_code))
+            done.append(futures[-1].result())
+        except TranslationError:
+            # One failed piece fails the whole text: never a mixed-language line
+            for future in futures:
+                future.cancel()
+            metrics.increment("translation_split.failures")
+            if self.raise_errors:
+                raise
+            return text
+        return join_sentences(done, self.to_code)
+
+    def _translate_one(self, text, fuzzy=True, batch=True, strict=False):
+        if self.cache is not None:
+            cached = self.cache.get(self.from_code, self.to_code, text, self.backend)
+            if cached is not None:
+                return cached
+
+        if fuzzy and self.memory is not None:
+            match = self.memory.lookup(self.from_code, self.to_code, text)
+            if match is not None:
+                print(f"DEBUG: Fuzzy match ({match.similarity:.2f}): '{text}' ~ '{match.source_text}'")
+                if self.refresh_fuzzy:
+                    self._refresh(text)
+                return restore_surface(text, match.translation)
+
+        return self._translate_remote(text, fuzzy, batch, strict)
+
+    def _translate_remote(self, text, fuzzy=True, batch=True, strict=False):
+        """strict=True raises on failure even without raise_errors (split pieces)."""
+        try:
+            if batch and self.batcher is not None:
+                translated = self.batcher.submit(text)
+            else:
+                translated = self._translator.translate(text)
             print(f"DEBUG: Translation result: '{text}' -> '{translated}'")
+            if translated:
+                self._remember(text, translated, fuzzy)
             return translated
         except Exception as e:
             print(f"DEBUG Translation error: {e}")
-            return text
+            if not (self.raise_errors or strict):
+                return text
+            if isinstance(e, TranslationError):
+                raise
+            # Backends outside core may raise anything: one type for the callers
+            raise TranslationError(f"Translation failed: {e}") from e
+
+    def _translate_batch(self, texts):
+        """One request for the whole batch (line-joined), split back per text."""
+        if getattr(type(self._translator), "translate_batch", None) is not None:
+            # Backend with a real batch API: no joining/splitting needed
+            return self._translator.translate_batch(texts)
+        if len(texts) == 1:
+            return [self._translator.translate(texts[0])]
+        translated = self._translator.translate(join_batch(texts))
+        try:
+            return split_batch(translated, len(texts))
+        except ValueError as e:
+            # Provider merged or split lines: fall back to one request per text
+            print(f"DEBUG: Batch split failed ({e}), translating one by one")
+            metrics.increment("translation_batch.split_fallbacks")
+            return [self._translator.translate(t) for t in texts]
 
+    def _remember(self, text, translated, fuzzy=True):
+        if self.cache is not None:
+            self.cache.put(self.from_code, self.to_code, text, translated, self.backend)
+        # A partial sentence is ~0.9 similar to the full one: keep it out of the memory
+        if fuzzy and self.memory is not None:
+            self.memory.add(self.from_code, self.to_code, text, translated)
+
+    def _refresh(self, text):
+        with self._refresh_lock:
+            if text in self._refreshing:
+                return
+            self._refreshing.add(text)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="mt-refresh")
+        self._refresh_executor.submit(self._refresh_task, text)
+
+    def _refresh_task(self, text):
+        try:
+            self._translate_remote(text)
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(text)
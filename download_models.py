@@ -1,3 +1,4 @@
+import json
 import shutil
 import sys
 import os
@@ -12,7 +13,8 @@ log_handler = RotatingFileHandler(
     'download.log',
     maxBytes=1024 * 1024,  # 1MB
     backupCount=2,  # Mantém apenas 2 backups
-    encoding='utf-8'
+    encoding='utf-8',
+    delay=True,  # Só cria o arquivo no primeiro registro (não ao importar)
 )
 log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 
@@ -35,6 +37,8 @@ MODEL_METADATA = {
 def is_model_installed(model_type):
     if model_type == "google":
         return "google"
+    if model_type == "hybrid":  # Live pass runs on the small Vosk model
+        return is_model_installed("small")
     if model_type not in MODEL_METADATA:
         if model_type == "whisper": return "whisper"
         return False
@@ -118,6 +122,8 @@ def unzip_file(zip_path, extract_to, progress_callback=None):
     print("Extraction complete.")
 
 def setup_vosk(model_type="small", progress_callback=None):
+    if model_type == "hybrid":
+        model_type = "small"
     if model_type not in MODEL_METADATA:
         print(f"Unknown model type: {model_type}")
         return None
@@ -203,14 +209,111 @@ def setup_vosk(model_type="small", progress_callback=None):
             
         return None, err_msg
 
-def setup_argos():
-    print("WARNING: Offline translation (Argos) is disabled.")
+# Tradução offline: pacotes Argos (modelos OPUS-MT convertidos para CTranslate2)
+ARGOS_INDEX_URL = "https://raw.githubusercontent.com/argosopentech/argospm-index/main/index.json"
+ARGOS_DIR = "model_argos"
+# Idioma pivô quando não há pacote direto (ex.: pt -> en -> es)
+ARGOS_PIVOT = "en"
+
+def argos_code(lang):
+    # Argos usa códigos ISO curtos ("zh-CN" -> "zh")
+    return lang.split("-")[0].lower()
+
+def argos_package_dir(from_code, to_code, base_dir=ARGOS_DIR):
+    """Pasta do pacote instalado (com model/ e sentencepiece.model), ou False."""
+    d = os.path.join(base_dir, f"{argos_code(from_code)}_{argos_code(to_code)}")
+    if os.path.exists(os.path.join(d, "model", "model.bin")):
+        return d
+    return False
+
+def argos_route(from_code, to_code, base_dir=ARGOS_DIR):
+    """Pastas dos pacotes instalados para o par (direto ou via pivô), ou False."""
+    src, tgt = argos_code(from_code), argos_code(to_code)
+    if src == tgt:
+        return []
+    direct = argos_package_dir(src, tgt, base_dir)
+    if direct:
+        return [direct]
+    if ARGOS_PIVOT in (src, tgt):
+        return False
+    legs = [argos_package_dir(src, ARGOS_PIVOT, base_dir),
+            argos_package_dir(ARGOS_PIVOT, tgt, base_dir)]
+    return legs if all(legs) else False
+
+def fetch_argos_index(url=ARGOS_INDEX_URL):
+    logger.info(f"Baixando índice de pacotes Argos: {url}")
+    req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+    with urllib.request.urlopen(req, timeout=30) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+def _install_argos_package(entry, base_dir, progress_callback=None):
+    src, tgt = entry["from_code"], entry["to_code"]
+    target_dir = os.path.join(base_dir, f"{src}_{tgt}")
+    zip_path = os.path.join(base_dir, f"argos-{src}_{tgt}.zip")
+    tmp_dir = target_dir + ".tmp"
+    try:
+        download_file(entry["links"][0], zip_path, progress_callback)
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        unzip_file(zip_path, tmp_dir)
+        # O .argosmodel traz uma pasta interna (ex.: translate-pt_en-1_0)
+        inner = tmp_dir
+        items = os.listdir(tmp_dir)
+        if len(items) == 1 and os.path.isdir(os.path.join(tmp_dir, items[0])):
+            inner = os.path.join(tmp_dir, items[0])
+        if os.path.exists(target_dir):
+            shutil.rmtree(target_dir)
+        shutil.move(inner, target_dir)
+    finally:
+        if os.path.exists(zip_path):
+            os.remove(zip_path)
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+    logger.info(f"Pacote Argos {src}->{tgt} instalado em {target_dir}")
+    return target_dir
+
+def setup_argos(from_code="pt", to_code="en", progress_callback=None,
+                base_dir=ARGOS_DIR, index=None):
+    """
+    Baixa o(s) pacote(s) Argos do par de idiomas (direto ou via inglês).
+    Retorna (lista de pastas, "OK") ou (None, mensagem de erro).
+    """
+    route = argos_route(from_code, to_code, base_dir)
+    if route is not False:
+        return route, "OK"
+
+    src, tgt = argos_code(from_code), argos_code(to_code)
+    logger.info(f"Configurando tradução offline (Argos): {src} -> {tgt}")
+    try:
+        if index is None:
+            index = fetch_argos_index()
+        available = {(e["from_code"], e["to_code"]): e for e in index if e.get("links")}
+        if (src, tgt) in available:
+            pairs = [(src, tgt)]
+        else:
+            pairs = [(src, ARGOS_PIVOT), (ARGOS_PIVOT, tgt)]
+        missing = [p for p in pairs if p not in available]
+        if missing:
+            return None, f"Sem pacote Argos para {src} -> {tgt}"
+        os.makedirs(base_dir, exist_ok=True)
+        for pair in pairs:
+            if not argos_package_dir(*pair, base_dir=base_dir):
+                _install_argos_package(available[pair], base_dir, progress_callback)
+        return argos_route(src, tgt, base_dir), "OK"
+    except Exception as e:
+        err_msg = str(e)
+        if "Errno 28" in err_msg:
+            err_msg = "Espaço insuficiente em disco (HD Cheio)."
+        logger.error(f"Erro fatal no setup_argos: {err_msg}")
+        return None, err_msg
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--small", action="store_true")
     parser.add_argument("--big", action="store_true")
+    parser.add_argument("--argos", nargs="*", metavar="LANG",
+                        help="Idiomas de destino da tradução offline (padrão: en)")
     args = parser.parse_args()
 
     if not args.small and not args.big:
@@ -219,4 +322,6 @@ if __name__ == "__main__":
     else:
         if args.small: setup_vosk("small")
         if args.big: setup_vosk("big")
-    setup_argos()
+    if args.argos is not None:
+        for lang in args.argos or ["en"]:
+            print(setup_argos("pt", lang))
@@ -5,16 +5,34 @@ import keyboard
 from PySide6.QtWidgets import QApplication
 from ui.overlay import OverlayWindow
 from core.audio import AudioCapture
-from core.transcriber import Transcriber
+from core.transcriber import Transcriber, load_grammar
 
 try:
-    from core.translator import Translator
+    from core.multi_translator import MultiTranslator, translator_from_config
 
     HAS_TRANSLATOR = True
 except Exception as e:
     print(f"Translator import failed: {e}")
     HAS_TRANSLATOR = False
-from core.pipeline import DownloadWorker, LoaderWorker, ProcessingThread
+from core.calibration import (
+    SpeechClipRecorder,
+    apply_engine,
+    calibration_clip,
+    engine_key,
+    recommend,
+)
+from core.pipeline import (
+    CalibrationWorker,
+    DownloadWorker,
+    LoaderWorker,
+    ProcessingThread,
+)
+from core.model_admission import (
+    AdmissionError,
+    admit_model,
+    model_cache,
+    report_rss_growth,
+)
 from download_models import is_model_installed
 import os
 
@@ -95,9 +113,14 @@ def main():
         )
 
         # Use LoaderWorker to avoid freezing UI
-        loader = LoaderWorker(m_path, config.get("target_lang", "en"), HAS_TRANSLATOR)
+        loader = LoaderWorker(
+            m_path, config.get("target_lang", "en"), HAS_TRANSLATOR, options=config
+        )
         loader.finished_signal.connect(on_load_finished)
         loader.error_signal.connect(on_load_error)
+        loader.notice_signal.connect(
+            lambda msg: window.update_text("Aviso", msg, to_history=False)
+        )
         window.loader_worker = loader  # Prevent GC
         loader.start()
 
@@ -105,6 +128,8 @@ def main():
         print("Model and translator loaded successfully.")
         thread.transcriber = new_transcriber
         thread.translator = new_translator
+        # Descarrega agora o modelo que o transcritor antigo deixou frio
+        model_cache.trim()
         window.update_text(
             "Concluído", "Modelo carregado com sucesso.", to_history=False
         )
@@ -124,6 +149,35 @@ def main():
         )
         thread.resume_audio()
 
+    def change_language(lang):
+        # Só o tradutor muda: o modelo de reconhecimento continua carregado
+        # (o Whisper só traduz direto para o inglês)
+        if thread.transcriber is not None:
+            thread.transcriber.set_target_lang(lang)
+        translator = thread.translator
+        if HAS_TRANSLATOR and isinstance(translator, MultiTranslator):
+            if translator.set_primary(lang):
+                print(f"Showing translations in {lang}")
+                return
+        if not HAS_TRANSLATOR or config.get("translation_backend") == "argos":
+            # Argos pode precisar baixar o pacote do idioma (LoaderWorker)
+            restart_all_modules()
+            return
+        try:
+            thread.translator = translator_from_config(config, from_code="pt")
+        except Exception as e:
+            print(f"Translator init failed: {e}")
+
+    def change_grammar():
+        # Vosk swaps the recognizer on the already loaded model
+        if thread.transcriber is None:
+            return
+        phrases = load_grammar(config)
+        if thread.transcriber.set_grammar(phrases):
+            print(f"Vosk grammar: {len(phrases)} phrases" if phrases else "Vosk grammar: open vocabulary")
+        else:
+            print("Grammar ignored: engine has no grammar support")
+
     # Function to restart audio logic
     def restart_audio_capture(device_index):
         print(f"Restarting audio on device {device_index}")
@@ -155,7 +209,23 @@ def main():
         # If still no path, we can't init Transcriber normally.
         # We will initialize with a placeholder OR just let it try and we catch it.
         # But we MUST have a Transcriber object for the thread.
-        transcriber = Transcriber(actual_path if actual_path else "missing")
+        try:
+            decision = admit_model({**config, "model_type": m_type}, actual_path)
+        except AdmissionError as e:
+            print(e)
+            decision = None
+        if decision:
+            if decision.message:
+                print(decision.message)
+            with report_rss_growth(
+                f"Modelo {decision.model_type}", decision.required_mb
+            ):
+                transcriber = Transcriber(
+                    decision.model_path or "missing", options=decision.options
+                )
+        else:
+            transcriber = Transcriber("missing")
+        transcriber.warmup()
 
         # Init Audio
         dev_idx = config.get("audio_device_index")
@@ -166,9 +236,7 @@ def main():
         translator = None
         if HAS_TRANSLATOR:
             try:
-                translator = Translator(
-                    from_code="pt", to_code=config.get("target_lang", "en")
-                )
+                translator = translator_from_config(config, from_code="pt")
             except Exception as e:
                 print(f"Translator init failed: {e}")
                 pass
@@ -188,13 +256,19 @@ def main():
     window.set_version(VERSION)
 
     # Initialize Worker Thread
-    thread = ProcessingThread(audio, transcriber, translator)
+    thread = ProcessingThread(audio, transcriber, translator, options=config)
     thread.update_text_signal.connect(window.update_text)
+    thread.replace_text_signal.connect(window.replace_text)
+    thread.update_route_signal.connect(window.update_route)
+    thread.update_live_translation_signal.connect(window.update_live_translation)
+    thread.update_translation_status_signal.connect(window.update_translation_status)
     thread.update_status_signal.connect(window.update_status)
     thread.update_thinking_signal.connect(window.set_thinking)
     thread.update_pause_signal.connect(window.update_pause)
     window.request_restart_audio.connect(restart_audio_capture)
     window.request_full_restart.connect(restart_all_modules)
+    window.request_language_change.connect(change_language)
+    window.request_grammar_change.connect(change_grammar)
 
     # Ensure clean exit
     def on_close():
@@ -213,8 +287,77 @@ def main():
     # Ctrl+Alt+C to clear
     keyboard.add_hotkey("ctrl+alt+c", lambda: window.clear_history())
 
-    print("Starting application...")
-    thread.start()
+    def start_pipeline():
+        print("Starting application...")
+        thread.start()
+
+    # Calibration measures the local engines' real-time factor on recorded
+    # speech with the live pipeline paused (its decoding would skew the RTFs)
+    calibration_state = {"resume": False}
+
+    def pause_for_calibration(running):
+        if running:
+            calibration_state["resume"] = thread.isRunning() and not thread.paused
+            if calibration_state["resume"]:
+                thread.pause_audio()
+        elif calibration_state["resume"]:
+            calibration_state["resume"] = False
+            thread.resume_audio()
+
+    def start_calibration():
+        window.update_text(
+            "Calibrando...",
+            "Medindo os motores locais com a sua fala gravada",
+            to_history=False,
+        )
+        pause_for_calibration(True)
+        calibration = CalibrationWorker(options=config)
+        calibration.finished_signal.connect(on_calibration_finished)
+        window.calibration_worker = calibration  # Prevent GC
+        calibration.start()
+
+    def on_calibration_finished(rtfs):
+        window.update_text("", "", to_history=False)
+        pause_for_calibration(False)
+        if not thread.isRunning():
+            start_pipeline()
+        if not rtfs:
+            return
+        config["calibration_rtf"] = rtfs
+        best = recommend(rtfs, config.get("calibration_target_rtf", 0.5))
+        print(f"Calibration: {rtfs} (recommended: {best})")
+        # Online engine (google) is not measured here: only switch between local ones
+        if (
+            best
+            and config.get("calibration_auto_select", False)
+            and config.get("model_type", "small") != "google"
+            and best != engine_key(config)
+        ):
+            apply_engine(config, best)
+            window.update_text(
+                "Calibração",
+                f"Usando {best} (RTF {rtfs[best]:.2f})",
+                to_history=False,
+            )
+            restart_all_modules()
+        with open("config.json", "w") as f:
+            json.dump(config, f)
+
+    def on_speech_clip_recorded(path):
+        if not config.get("calibration_rtf"):
+            start_calibration()
+
+    thread.calibration_clip_signal.connect(on_speech_clip_recorded)
+    window.request_pipeline_pause.connect(pause_for_calibration)
+
+    # First start: calibrate before the pipeline runs if there is a speech clip;
+    # otherwise record the user's first seconds of speech and calibrate then
+    if calibration_clip(config) is None:
+        thread.clip_recorder = SpeechClipRecorder()
+    if not config.get("calibration_rtf") and calibration_clip(config):
+        start_calibration()
+    else:
+        start_pipeline()
 
     # Automatic download/repair on startup removed to avoid intrusive behavior.
     # Users should manage models via Settings.
@@ -0,0 +1,39 @@
+"""
+Fixtures compartilhadas pelos testes (servidor HTTP local substituto)
+"""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    """Ignora conexões encerradas pelo cliente (timeouts/abort nos testes)."""
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """
+    Fábrica de servidores locais: `local_server(Handler, attr=valor, ...)`
+    sobe o servidor numa porta livre com os atributos dados; todos são
+    encerrados ao fim do teste.
+    """
+    servers = []
+
+    def start(handler, **attrs):
+        server = QuietHTTPServer(("127.0.0.1", 0), handler)
+        for name, value in attrs.items():
+            setattr(server, name, value)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
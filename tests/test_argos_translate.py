@@ -0,0 +1,141 @@
+"""
+Testes unitários para a tradução offline (Argos): download e seleção do backend
+"""
+
+import functools
+import logging
+import os
+import zipfile
+from http.server import SimpleHTTPRequestHandler
+
+import pytest
+
+import core.argos_translate as argos_translate
+import download_models
+from core.google_translate import GoogleTranslateClient
+from core.translator import Translator
+from download_models import argos_route, setup_argos
+
+
+@pytest.fixture(autouse=True)
+def isolated_download_log(tmp_path, monkeypatch):
+    """O log de downloads vai para a pasta do teste, não para download.log do repositório."""
+    handler = logging.FileHandler(tmp_path / "download.log", encoding="utf-8")
+    monkeypatch.setattr(download_models.logger, "handlers", [handler])
+    yield tmp_path / "download.log"
+    handler.close()
+
+
+def make_package(base, pair):
+    """Pacote instalado mínimo (só a estrutura de pastas)."""
+    model = os.path.join(base, pair, "model")
+    os.makedirs(model)
+    open(os.path.join(model, "model.bin"), "wb").close()
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def package_server(tmp_path, local_server):
+    """Servidor local com um .argosmodel pt->en (zip com pasta interna)."""
+    served = tmp_path / "served"
+    served.mkdir()
+    with zipfile.ZipFile(served / "translate-pt_en-1_0.argosmodel", "w") as z:
+        z.writestr("translate-pt_en-1_0/model/model.bin", b"\0" * 16)
+        z.writestr("translate-pt_en-1_0/sentencepiece.model", b"spm")
+    handler = functools.partial(QuietHandler, directory=str(served))
+    server = local_server(handler)
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class FakeBatchClient:
+    def __init__(self):
+        self.batches = []
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts):
+        self.batches.append(list(texts))
+        return [t.upper() for t in texts]
+
+
+class TestArgosTranslate:
+    def test_route_prefers_direct_package(self, tmp_path):
+        make_package(tmp_path, "pt_es")
+        make_package(tmp_path, "pt_en")
+        make_package(tmp_path, "en_es")
+
+        assert argos_route("pt", "es", str(tmp_path)) == [str(tmp_path / "pt_es")]
+
+    def test_route_pivots_through_english(self, tmp_path):
+        make_package(tmp_path, "pt_en")
+        make_package(tmp_path, "en_zh")
+
+        assert argos_route("pt", "zh-CN", str(tmp_path)) == [
+            str(tmp_path / "pt_en"),
+            str(tmp_path / "en_zh"),
+        ]
+        assert argos_route("pt", "fr", str(tmp_path)) is False
+
+    def test_setup_downloads_and_normalizes_package(self, tmp_path, package_server):
+        base = str(tmp_path / "model_argos")
+        index = [
+            {
+                "from_code": "pt",
+                "to_code": "en",
+                "links": [f"{package_server}/translate-pt_en-1_0.argosmodel"],
+            }
+        ]
+
+        route, msg = setup_argos("pt", "en", base_dir=base, index=index)
+
+        assert msg == "OK"
+        assert route == [os.path.join(base, "pt_en")]
+        assert os.path.exists(os.path.join(base, "pt_en", "sentencepiece.model"))
+        assert os.listdir(base) == ["pt_en"]  # sem zip nem pasta temporária
+
+    def test_setup_reports_missing_pair(self, tmp_path):
+        route, msg = setup_argos("pt", "xx", base_dir=str(tmp_path), index=[])
+
+        assert route is None
+        assert "pt -> xx" in msg
+
+    def test_backend_falls_back_to_online_without_package(self, tmp_path):
+        translator = Translator.from_config(
+            {
+                "translation_backend": "argos",
+                "argos_model_dir": str(tmp_path),
+                "translation_cache_enabled": False,
+                "translation_memory_enabled": False,
+            }
+        )
+
+        assert isinstance(translator._translator, GoogleTranslateClient)
+
+    def test_client_without_dependencies_is_none(self, tmp_path, monkeypatch):
+        make_package(tmp_path, "pt_en")
+        monkeypatch.setattr(argos_translate, "HAS_ARGOS", False)
+
+        client = argos_translate.argos_client_from_config(
+            {"argos_model_dir": str(tmp_path)}, "pt", "en"
+        )
+
+        assert client is None
+
+    def test_batch_uses_native_batch_api(self):
+        client = FakeBatchClient()
+        translator = Translator(client=client)
+
+        assert translator._translate_batch(["bom dia", "boa noite"]) == [
+            "BOM DIA",
+            "BOA NOITE",
+        ]
+        assert client.batches == [["bom dia", "boa noite"]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,16 +6,39 @@ import pytest
 import numpy as np
 from unittest.mock import Mock
 
-from core.base_engine import BaseAudioEngine
+from core.base_engine import (
+    AudioSegment,
+    BaseAudioEngine,
+    SpeculativeDecision,
+    synthetic_audio,
+)
+from core.features import N_FFT, IncrementalLogMel
+from core.metrics import metrics
+from core.transcriber import WhisperEngine
 
 
 class MockAudioEngine(BaseAudioEngine):
     """Engine mock para testes."""
 
+    def __init__(self, sample_rate: int = 16000):
+        super().__init__(sample_rate)
+        self.recognized = []
+
     def recognize(self, audio_data_bytes: bytes) -> str:
+        self.recognized.append(audio_data_bytes)
         return "recognized text"
 
 
+class MelWhisperEngine(WhisperEngine):
+    """WhisperEngine sem modelo: só o log-mel incremental."""
+
+    def __init__(self, sample_rate: int = 16000):
+        BaseAudioEngine.__init__(self, sample_rate)
+        rng = np.random.default_rng(0)
+        filters = (rng.random((80, N_FFT // 2 + 1)) * 0.01).astype(np.float32)
+        self.mel = IncrementalLogMel(filters)
+
+
 class TestBaseAudioEngine:
     """Testes para a classe base de engines."""
 
@@ -145,6 +168,259 @@ class TestBaseAudioEngine:
         assert engine.silence_frames == 0
         assert engine.thinking == False
 
+    def test_synthetic_audio(self):
+        """Testa geração de áudio sintético para warm-up."""
+        audio = synthetic_audio(16000, 0.5)
+
+        assert len(audio) == 16000 * 2 // 2  # 0.5s de int16
+        samples = np.frombuffer(audio, dtype=np.int16)
+        assert np.max(np.abs(samples)) > 0
+
+    def test_warmup(self):
+        """Testa que o warm-up reconhece áudio sintético sem alterar o estado."""
+        engine = MockAudioEngine()
+        engine.buffer.extend(b"\x00\x01")
+
+        elapsed = engine.warmup(duration_s=0.2)
+
+        assert elapsed >= 0
+        assert len(engine.recognized) == 1
+        assert len(engine.recognized[0]) == int(16000 * 0.2) * 2
+        assert engine.buffer == bytearray(b"\x00\x01")
+
+
+class TestSpeculativeEndpointing:
+    """Testes para o endpoint especulativo."""
+
+    FRAME = b"\x00\x01" * 480  # 30ms
+
+    def setup_method(self):
+        metrics.reset()
+
+    def make_engine(self):
+        engine = MockAudioEngine()
+        engine.speculative_silence_frames = 3
+        # Áudio com duração suficiente
+        for _ in range(20):
+            engine.process_audio(self.FRAME, is_speech=True, raw_speech=True)
+        return engine
+
+    def test_dispatch_then_commit(self):
+        """Testa despacho na pausa provisória e confirmação no limiar completo."""
+        engine = self.make_engine()
+
+        results = [
+            engine.process_audio(self.FRAME, is_speech=True, raw_speech=False)
+            for _ in range(3)
+        ]
+        status, segment = results[-1]
+        assert status == ""
+        assert isinstance(segment, AudioSegment)
+        assert segment.speculative.state == SpeculativeDecision.PENDING
+        assert len(engine.buffer) > 0  # Buffer mantido até a confirmação
+
+        # Post-roll termina e o silêncio completo confirma o segmento
+        result = (None, None)
+        for _ in range(engine.silence_threshold_frames):
+            result = engine.process_audio(self.FRAME, is_speech=False, raw_speech=False)
+        assert result == (None, None)
+        assert segment.speculative.state == SpeculativeDecision.COMMITTED
+        assert len(engine.buffer) == 0
+        assert metrics.counter("speculative.committed") == 1
+
+    def test_cancel_when_speech_resumes(self):
+        """Testa cancelamento e extensão do segmento quando a fala volta."""
+        engine = self.make_engine()
+        for _ in range(3):
+            _, segment = engine.process_audio(
+                self.FRAME, is_speech=True, raw_speech=False
+            )
+        speculated = len(segment.audio)
+
+        for _ in range(2):
+            engine.process_audio(self.FRAME, is_speech=True, raw_speech=True)
+        assert segment.speculative.state == SpeculativeDecision.CANCELLED
+        assert metrics.counter("speculative.cancelled") == 1
+        assert metrics.counter("speculative.wasted_audio_s") > 0
+
+        # Segmento final (não especulativo) cobre o áudio estendido
+        engine.speculative_silence_frames = None
+        result = (None, None)
+        for _ in range(engine.silence_threshold_frames):
+            result = engine.process_audio(self.FRAME, is_speech=False, raw_speech=False)
+        status, final = result
+        assert final.speculative is None
+        assert len(final.audio) > speculated
+
+    def test_single_noisy_frame_does_not_cancel(self):
+        """Testa que um frame isolado de fala não cancela a especulação."""
+        engine = self.make_engine()
+        for _ in range(3):
+            _, segment = engine.process_audio(
+                self.FRAME, is_speech=True, raw_speech=False
+            )
+
+        engine.process_audio(self.FRAME, is_speech=True, raw_speech=True)
+        engine.process_audio(self.FRAME, is_speech=True, raw_speech=False)
+
+        assert segment.speculative.state == SpeculativeDecision.PENDING
+
+    def test_decision_wait_timeout_cancels(self):
+        """Testa que decisão sem resposta é tratada como cancelada."""
+        decision = SpeculativeDecision()
+
+        assert decision.wait(timeout=0.01) == SpeculativeDecision.CANCELLED
+        decision.commit()  # Sem efeito após decisão
+        assert decision.state == SpeculativeDecision.CANCELLED
+
+    def test_commit_resets_whisper_features(self):
+        """Testa que o segmento após um commit não usa o log-mel da fala anterior."""
+        engine = MelWhisperEngine()
+        engine.speculative_silence_frames = 3
+        loud = (np.ones(480) * 8000).astype(np.int16).tobytes()
+        quiet = (np.ones(480) * 100).astype(np.int16).tobytes()
+
+        # Primeira fala: especulação confirmada pelo silêncio completo
+        for _ in range(20):
+            engine.process_audio(loud, is_speech=True, raw_speech=True)
+        for _ in range(3):
+            _, first = engine.process_audio(loud, is_speech=True, raw_speech=False)
+        for _ in range(engine.silence_threshold_frames):
+            engine.process_audio(quiet, is_speech=False, raw_speech=False)
+        assert first.speculative.state == SpeculativeDecision.COMMITTED
+
+        # Segunda fala, despachada pelo limiar completo
+        engine.speculative_silence_frames = None
+        for _ in range(20):
+            engine.process_audio(quiet, is_speech=True, raw_speech=True)
+        result = (None, None)
+        for _ in range(engine.silence_threshold_frames):
+            result = engine.process_audio(quiet, is_speech=False, raw_speech=False)
+        _, second = result
+
+        expected = IncrementalLogMel(engine.mel.filters)
+        expected.feed(second.audio)
+        np.testing.assert_allclose(second.features, expected.features(), atol=1e-5)
+
+    def test_reset_cancels_pending(self):
+        """Testa que reset cancela a especulação pendente."""
+        engine = self.make_engine()
+        for _ in range(3):
+            _, segment = engine.process_audio(
+                self.FRAME, is_speech=True, raw_speech=False
+            )
+
+        engine.reset()
+
+        assert segment.speculative.state == SpeculativeDecision.CANCELLED
+
+
+class TestLongFormChunking:
+    """Testes para cortes de fala longa com sobreposição."""
+
+    SR = 16000
+    FRAME_SAMPLES = 480  # 30ms
+
+    def frame(self, amplitude):
+        return (np.ones(self.FRAME_SAMPLES, dtype=np.int16) * amplitude).tobytes()
+
+    def make_engine(self):
+        engine = MockAudioEngine(self.SR)
+        engine.max_buffer_seconds = 3
+        engine.chunk_overlap_seconds = 0.3
+        engine.cut_search_seconds = 1.0
+        return engine
+
+    def test_cut_at_energy_minimum_with_overlap(self):
+        """Testa corte no vale de energia e repetição da sobreposição."""
+        engine = self.make_engine()
+        segment = None
+        for i in range(110):
+            # Vale de energia no frame 90 (dentro da janela de busca)
+            amplitude = 50 if i == 90 else 3000
+            _, segment = engine.process_audio(
+                self.frame(amplitude), is_speech=True, raw_speech=True
+            )
+            if segment:
+                break
+
+        frame_bytes = self.FRAME_SAMPLES * 2
+        assert segment is not None
+        assert len(segment.audio) == 91 * frame_bytes
+        assert segment.previous is None
+        # Sobreposição de 0.3s antes do corte + o que veio depois dele
+        overlap_bytes = int(0.3 * self.SR) * 2
+        assert len(engine.buffer) == overlap_bytes + (i + 1 - 91) * frame_bytes
+
+    def test_raw_silence_preferred_over_energy(self):
+        """Testa que um frame sem fala no VAD bruto é o corte preferido."""
+        engine = self.make_engine()
+        segment = None
+        for i in range(110):
+            amplitude = 50 if i == 95 else 3000
+            raw = i != 80
+            _, segment = engine.process_audio(
+                self.frame(amplitude), is_speech=True, raw_speech=raw
+            )
+            if segment:
+                break
+
+        assert len(segment.audio) == 81 * self.FRAME_SAMPLES * 2
+
+    def test_chunks_are_linked_until_silence(self):
+        """Testa encadeamento dos chunks e reinício após endpoint por silêncio."""
+        engine = self.make_engine()
+        engine.silence_threshold_frames = 5
+        chunks = []
+        for _ in range(250):
+            _, segment = engine.process_audio(
+                self.frame(3000), is_speech=True, raw_speech=True
+            )
+            if segment:
+                chunks.append(segment)
+        for _ in range(5):
+            _, segment = engine.process_audio(self.frame(0), is_speech=False)
+            if segment:
+                chunks.append(segment)
+
+        assert len(chunks) >= 3
+        assert chunks[0].previous is None
+        assert chunks[1].previous is chunks[0]
+        assert chunks[1].overlap_s == pytest.approx(0.3)
+        assert chunks[-1].previous is chunks[-2]
+
+        # Após o endpoint por silêncio, a próxima fala começa sem vínculo
+        for _ in range(20):
+            engine.process_audio(self.frame(3000), is_speech=True, raw_speech=True)
+        for _ in range(5):
+            _, segment = engine.process_audio(self.frame(0), is_speech=False)
+        assert segment is not None
+        assert segment.previous is None
+
+    def test_no_link_without_overlap(self):
+        """Testa que sem sobreposição não há costura."""
+        engine = self.make_engine()
+        engine.chunk_overlap_seconds = 0
+        chunks = []
+        for _ in range(250):
+            _, segment = engine.process_audio(
+                self.frame(3000), is_speech=True, raw_speech=True
+            )
+            if segment:
+                chunks.append(segment)
+
+        assert len(chunks) >= 2
+        assert all(chunk.previous is None for chunk in chunks)
+
+    def test_segment_text_handoff(self):
+        """Testa publicação da transcrição para o chunk seguinte."""
+        segment = AudioSegment(b"")
+        assert segment.wait_text(timeout=0.01) is None
+
+        segment.set_text("olá mundo")
+
+        assert segment.wait_text(timeout=0.01) == "olá mundo"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,64 @@
+"""
+Testes unitários para benchmark.py e perfis do Whisper
+"""
+
+import time
+
+import pytest
+
+from core.base_engine import synthetic_audio
+from core.benchmark import measure_rtf
+from core.transcriber import WHISPER_PROFILES, whisper_decode_options
+
+
+class TestBenchmark:
+    """Testes para a medição de RTF."""
+
+    def test_measure_rtf(self):
+        """Testa RTF = tempo de reconhecimento / duração do áudio."""
+        calls = []
+
+        def recognize(audio):
+            calls.append(audio)
+            time.sleep(0.05)
+            return ""
+
+        audio = synthetic_audio(16000, 0.5)
+        rtf = measure_rtf(recognize, audio, runs=2)
+
+        assert len(calls) == 3  # aquecimento + 2 medições
+        assert 0.08 <= rtf < 0.5
+
+
+class TestWhisperProfiles:
+    """Testes para os perfis de decodificação."""
+
+    def test_profiles_cover_model_sizes(self):
+        assert [
+            WHISPER_PROFILES[p]["model"] for p in ("fast", "balanced", "accurate")
+        ] == [
+            "tiny",
+            "base",
+            "small",
+        ]
+
+    def test_fast_profile_is_greedy_without_fallback(self):
+        options = whisper_decode_options("fast")
+
+        assert options["temperature"] == 0.0
+        assert "beam_size" not in options
+        assert options["condition_on_previous_text"] is False
+        assert options["without_timestamps"] is True
+        assert options["fp16"] is False  # CPU
+
+    def test_accurate_profile_uses_beam_search(self):
+        options = whisper_decode_options("accurate", device="cuda")
+
+        assert options["beam_size"] == 5
+        assert options["best_of"] == 5
+        assert len(options["temperature"]) > 1
+        assert options["fp16"] is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,134 @@
+"""
+Testes unitários para calibration.py
+"""
+
+import wave
+
+import pytest
+
+from core.base_engine import synthetic_audio
+from core.calibration import (
+    SpeechClipRecorder,
+    apply_engine,
+    calibrate,
+    calibration_clip,
+    engine_key,
+    format_results,
+    recommend,
+)
+from core.model_admission import ModelCache
+
+
+class TimedEngine:
+    """Engine fictício com RTF controlado pelo relógio simulado."""
+
+    def __init__(self, clock, seconds):
+        self.clock = clock
+        self.seconds = seconds
+
+    def recognize(self, audio):
+        self.clock[0] += self.seconds
+        return ""
+
+
+class TestCalibration:
+    def test_calibrate_measures_each_engine(self, monkeypatch):
+        clock = [0.0]
+        monkeypatch.setattr("core.benchmark.time.perf_counter", lambda: clock[0])
+        costs = {"small": 0.5, "big": 2.0}  # segundos por 1 s de áudio
+
+        rtfs = calibrate(
+            engines=["small", "big"],
+            audio=synthetic_audio(16000, 1.0),
+            load=lambda key, sr: TimedEngine(clock, costs[key]),
+            available=lambda: None,
+        )
+
+        assert rtfs == {"small": 0.5, "big": 2.0}
+
+    def test_skips_engines_that_do_not_fit_in_ram(self):
+        loaded = []
+
+        rtfs = calibrate(
+            engines=["big"],
+            audio=synthetic_audio(16000, 1.0),
+            load=lambda key, sr: loaded.append(key),
+            available=lambda: 1000,
+        )
+
+        assert rtfs == {}
+        assert loaded == []
+
+    def test_failed_engine_is_left_out(self):
+        def load(key, sr):
+            raise RuntimeError("modelo corrompido")
+
+        assert calibrate(["small"], synthetic_audio(16000, 1.0), load=load) == {}
+
+    def test_only_models_loaded_by_calibration_are_evicted(self, monkeypatch):
+        cache = ModelCache()
+        monkeypatch.setattr("core.calibration.model_cache", cache)
+        cache.get(("vosk", "liberado-pelo-engine-ao-vivo"), object)
+
+        def load(key, sr):
+            cache.get(("vosk", key), object)
+            return TimedEngine([0.0], 0.0)
+
+        calibrate(["small"], synthetic_audio(16000, 1.0), load=load)
+
+        assert cache.keys() == [("vosk", "liberado-pelo-engine-ao-vivo")]
+
+    def test_no_speech_clip_defers_calibration(self, tmp_path, monkeypatch):
+        """Testa que, sem fala gravada, não mede num tom sintético."""
+        monkeypatch.chdir(tmp_path)
+        loaded = []
+
+        rtfs = calibrate(["small"], load=lambda key, sr: loaded.append(key))
+
+        assert rtfs == {}
+        assert loaded == []
+
+    def test_recorded_speech_becomes_default_clip(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        recorder = SpeechClipRecorder(seconds=0.3)
+        frame = b"\x00\x01" * 480  # 30 ms
+
+        assert not recorder.feed(frame * 20, is_speech=False)  # silêncio ignorado
+        assert calibration_clip({}) is None
+        done = [recorder.feed(frame, is_speech=True) for _ in range(10)]
+
+        assert done == [False] * 9 + [True]
+        assert calibration_clip({}) == recorder.path
+        with wave.open(recorder.path) as f:
+            assert f.getframerate() == 16000
+            assert f.getnframes() == int(0.3 * 16000)
+        assert calibration_clip({"calibration_audio": "meu.wav"}) == "meu.wav"
+
+
+class TestRecommendation:
+    def test_recommends_most_accurate_under_target(self):
+        rtfs = {"small": 0.1, "big": 0.9, "whisper-balanced": 0.4}
+
+        assert recommend(rtfs, target_rtf=0.5) == "whisper-balanced"
+        assert recommend(rtfs, target_rtf=1.0) == "big"
+        assert recommend({"big": 1.5}, target_rtf=0.5) is None
+
+    def test_apply_engine_and_key(self):
+        config = {"model_type": "small"}
+
+        apply_engine(config, "whisper-fast")
+
+        assert config == {"model_type": "whisper", "whisper_profile": "fast"}
+        assert engine_key(config) == "whisper-fast"
+
+    def test_format_results_marks_recommendation(self):
+        text = format_results({"small": 0.1, "big": 0.9}, target_rtf=0.5)
+
+        assert text.splitlines() == [
+            "✗ big: RTF 0.90",
+            "✓ small: RTF 0.10  ← recomendado",
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -143,6 +143,14 @@ class TestConfigSchema:
         with pytest.raises(ValueError):
             ConfigSchema(win_height=50)  # Muito pequeno
 
+    def test_whisper_profile_validation(self):
+        """Testa os perfis de decodificação do Whisper."""
+        assert ConfigSchema().whisper_profile == "balanced"
+        assert ConfigSchema(whisper_profile="fast").whisper_profile == "fast"
+
+        with pytest.raises(ValueError):
+            ConfigSchema(whisper_profile="turbo")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""
+Testes unitários para features.py (log-mel incremental)
+"""
+
+import numpy as np
+import pytest
+
+from core.features import HOP_LENGTH, N_FFT, IncrementalLogMel
+
+
+def reference_log_mel(audio, filters):
+    """Log-mel como em whisper.transcribe: 30 s de zeros no fim, reflexo no início."""
+    x = np.concatenate([audio, np.zeros(480000, dtype=np.float32)])
+    padded = np.concatenate([x[1:201][::-1], x, x[-201:-1][::-1]])
+    n_frames = 1 + (len(padded) - N_FFT) // HOP_LENGTH
+    window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(N_FFT) / N_FFT)
+    idx = np.arange(n_frames)[:, None] * HOP_LENGTH + np.arange(N_FFT)[None, :]
+    power = np.abs(np.fft.rfft(padded[idx] * window, axis=1)) ** 2
+    log_spec = np.log10(np.maximum(filters @ power[:-1].T, 1e-10))
+    log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    return ((log_spec + 4.0) / 4.0)[:, : len(audio) // HOP_LENGTH]
+
+
+@pytest.fixture
+def filters():
+    rng = np.random.default_rng(0)
+    return (rng.random((80, N_FFT // 2 + 1)) * 0.01).astype(np.float32)
+
+
+def feed_in_blocks(extractor, pcm, seed=1):
+    rng = np.random.default_rng(seed)
+    data, pos = pcm.tobytes(), 0
+    while pos < len(data):
+        step = int(rng.integers(1, 1200)) * 2
+        extractor.feed(data[pos : pos + step])
+        pos += step
+
+
+class TestIncrementalLogMel:
+    """Testes para a extração incremental."""
+
+    @pytest.mark.parametrize("n_samples", [199, 200, 1000, 16000 * 2 + 77])
+    def test_matches_whole_segment_extraction(self, filters, n_samples):
+        """Testa equivalência com o cálculo sobre o segmento inteiro."""
+        rng = np.random.default_rng(n_samples)
+        pcm = (rng.standard_normal(n_samples) * 3000).astype(np.int16)
+        extractor = IncrementalLogMel(filters)
+
+        feed_in_blocks(extractor, pcm)
+
+        expected = reference_log_mel(pcm.astype(np.float32) / 32768.0, filters)
+        got = extractor.features()
+        assert got.shape == expected.shape == (80, n_samples // HOP_LENGTH)
+        np.testing.assert_allclose(got, expected, atol=1e-5)
+
+    def test_prefix_features(self, filters):
+        """Testa features de um prefixo (corte de fala longa) sem alterar o estado."""
+        rng = np.random.default_rng(3)
+        pcm = (rng.standard_normal(16000) * 3000).astype(np.int16)
+        extractor = IncrementalLogMel(filters)
+        feed_in_blocks(extractor, pcm)
+
+        prefix = extractor.features(10000)
+
+        expected = reference_log_mel(pcm[:10000].astype(np.float32) / 32768.0, filters)
+        np.testing.assert_allclose(prefix, expected, atol=1e-5)
+        assert extractor.features().shape[1] == 16000 // HOP_LENGTH
+
+    def test_frames_computed_while_feeding(self, filters):
+        """Testa que os frames são calculados durante a fala, não no endpoint."""
+        extractor = IncrementalLogMel(filters)
+
+        extractor.feed(np.zeros(4800, dtype=np.int16).tobytes())
+
+        assert extractor._log_frames.shape[1] == (4800 - 200) // HOP_LENGTH + 1
+
+        extractor.reset()
+        assert extractor.num_samples == 0
+        assert extractor.features().shape == (80, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
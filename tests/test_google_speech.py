@@ -0,0 +1,145 @@
+"""
+Testes unitários para google_speech.py (contra servidor local substituto)
+"""
+
+import io
+import json
+import time
+from http.server import BaseHTTPRequestHandler
+
+import numpy as np
+import pytest
+
+from core.base_engine import RecognitionError, synthetic_audio
+from core.google_speech import GoogleSpeechClient, encode_flac, parse_response
+
+
+class FakeSpeechHandler(BaseHTTPRequestHandler):
+    """Imita o endpoint speech-api v2: responde em linhas JSON."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.server.peers.append(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.peers.append(self.client_address)
+        self.server.requests.append((self.path, self.headers, body))
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        payload = (
+            '{"result":[]}\n'
+            + json.dumps(
+                {
+                    "result": [
+                        {"alternative": [{"transcript": "olá mundo"}], "final": True}
+                    ],
+                    "result_index": 0,
+                }
+            )
+            + "\n"
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def speech_server(local_server):
+    return local_server(FakeSpeechHandler, peers=[], requests=[], delay=0)
+
+
+def endpoint_of(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/speech-api/v2/recognize"
+
+
+class TestGoogleSpeech:
+    """Testes para o cliente HTTP do Google Speech."""
+
+    def test_encode_flac_roundtrip(self):
+        """Testa codificação FLAC no próprio processo (sem perdas)."""
+        sf = pytest.importorskip("soundfile")
+        pcm = synthetic_audio(16000, 0.5)
+
+        flac = encode_flac(pcm, 16000)
+
+        assert flac[:4] == b"fLaC"
+        decoded, rate = sf.read(io.BytesIO(flac), dtype="int16")
+        assert rate == 16000
+        assert np.array_equal(decoded, np.frombuffer(pcm, dtype=np.int16))
+
+    def test_parse_response(self):
+        """Testa extração da melhor hipótese ignorando blocos vazios."""
+        text = (
+            '{"result":[]}\n{"result":[{"alternative":[{"transcript":"um dois"}]}]}\n'
+        )
+        assert parse_response(text) == "um dois"
+        assert parse_response('{"result":[]}\n') == ""
+        assert parse_response("") == ""
+
+        with pytest.raises(RecognitionError):
+            parse_response("not json")
+
+    def test_recognize_against_local_server(self, speech_server):
+        """Testa requisição completa contra servidor substituto."""
+        pytest.importorskip("soundfile")
+        client = GoogleSpeechClient(endpoint=endpoint_of(speech_server))
+
+        text = client.recognize(synthetic_audio(16000, 0.5))
+
+        assert text == "olá mundo"
+        path, headers, body = speech_server.requests[0]
+        assert "lang=pt-BR" in path
+        assert headers["Content-Type"] == "audio/x-flac; rate=16000"
+        assert body[:4] == b"fLaC"
+        client.close()
+
+    def test_keep_alive_reuses_connection(self, speech_server):
+        """Testa que várias frases reutilizam a mesma conexão TCP."""
+        pytest.importorskip("soundfile")
+        client = GoogleSpeechClient(endpoint=endpoint_of(speech_server))
+
+        assert client.preconnect()
+        for _ in range(3):
+            client.recognize(synthetic_audio(16000, 0.2))
+
+        # Mesmo (host, porta) de origem = mesma conexão
+        assert len(set(speech_server.peers)) == 1
+        client.close()
+
+    def test_read_timeout_raises(self, speech_server):
+        """Testa que timeout de leitura vira RecognitionError."""
+        pytest.importorskip("soundfile")
+        speech_server.delay = 0.5
+        client = GoogleSpeechClient(
+            endpoint=endpoint_of(speech_server), read_timeout=0.1
+        )
+
+        with pytest.raises(RecognitionError):
+            client.recognize(synthetic_audio(16000, 0.2))
+        client.close()
+
+    def test_connection_refused_raises(self):
+        """Testa falha de conexão com endpoint inexistente."""
+        client = GoogleSpeechClient(
+            endpoint="http://127.0.0.1:9/recognize", connect_timeout=0.5
+        )
+
+        with pytest.raises(RecognitionError):
+            client.recognize(b"\x00\x00" * 1600)
+        assert client.preconnect() is False
+        client.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,161 @@
+"""
+Testes unitários para google_translate.py (contra servidor local substituto)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from core.google_translate import (
+    GoogleTranslateClient,
+    TranslationError,
+    parse_translation,
+)
+from core.metrics import metrics
+from core.translator import Translator
+
+
+class FakeTranslateHandler(BaseHTTPRequestHandler):
+    """Imita translate_a/single: ecoa o texto em maiúsculas."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        server = self.server
+        with server.lock:
+            server.requests.append((urlparse(self.path), self.client_address))
+            status = server.statuses.pop(0) if server.statuses else 200
+            delay = server.delays.pop(0) if server.delays else 0
+        if delay:
+            time.sleep(delay)
+        if status != 200:
+            body = b"erro"
+        else:
+            text = form["q"][0]
+            body = json.dumps(
+                [[[text.upper(), text, None, None, 1]], None, "pt"]
+            ).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def translate_server(local_server):
+    return local_server(
+        FakeTranslateHandler, lock=threading.Lock(), requests=[], statuses=[], delays=[]
+    )
+
+
+def endpoint_of(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/translate_a/single"
+
+
+def make_client(server, **kwargs):
+    client = GoogleTranslateClient(endpoint=endpoint_of(server), **kwargs)
+    client._sleep = lambda s: None  # sem espera real no backoff
+    return client
+
+
+class TestGoogleTranslate:
+    def setup_method(self):
+        metrics.reset()
+
+    def test_parse_translation(self):
+        payload = [[["Hello. ", "Olá. "], ["How are you?", "Tudo bem?"]], None, "pt"]
+
+        assert parse_translation(payload) == "Hello. How are you?"
+        with pytest.raises(TranslationError):
+            parse_translation(None)
+
+    def test_translate_reuses_pooled_connection(self, translate_server):
+        client = make_client(translate_server)
+
+        assert client.translate("olá") == "OLÁ"
+        assert client.translate("mundo") == "MUNDO"
+
+        (url, peer_a), (_, peer_b) = translate_server.requests
+        assert parse_qs(url.query)["sl"] == ["pt"]
+        assert peer_a == peer_b  # keep-alive: mesma conexão
+        assert metrics.percentile("translate.latency_s", 50) is not None
+        client.close()
+
+    def test_transient_errors_are_retried(self, translate_server):
+        translate_server.statuses = [503, 429]
+        client = make_client(translate_server, max_retries=2)
+
+        assert client.translate("olá") == "OLÁ"
+        assert metrics.counter("translate.retries") == 2
+        client.close()
+
+    def test_client_errors_are_not_retried(self, translate_server):
+        translate_server.statuses = [400]
+        client = make_client(translate_server, max_retries=2)
+
+        with pytest.raises(TranslationError):
+            client.translate("olá")
+        assert len(translate_server.requests) == 1
+        assert metrics.counter("translate.errors") == 1
+        client.close()
+
+    def test_read_timeout_is_bounded(self, translate_server):
+        translate_server.delays = [1.0]
+        client = make_client(translate_server, read_timeout=0.2, max_retries=0)
+
+        start = time.perf_counter()
+        with pytest.raises(TranslationError):
+            client.translate("olá")
+        assert time.perf_counter() - start < 0.8
+        client.close()
+
+    def test_hedged_request_wins_on_slow_primary(self, translate_server):
+        translate_server.delays = [1.0]  # só a primeira requisição é lenta
+        client = make_client(translate_server, hedge=True, hedge_delay_s=0.1)
+
+        start = time.perf_counter()
+        assert client.translate("olá") == "OLÁ"
+        assert time.perf_counter() - start < 0.8
+        assert metrics.counter("translate.hedge.fired") == 1
+        assert metrics.counter("translate.hedge.wins.hedge") == 1
+        client.close()
+
+    def test_translator_from_config_uses_endpoint(self, translate_server):
+        translator = Translator.from_config(
+            {
+                "translate_endpoint": endpoint_of(translate_server),
+                "translation_cache_enabled": False,
+                "translation_memory_enabled": False,
+                "translation_batch_window_ms": 0,
+            }
+        )
+
+        assert translator.translate("bom dia") == "BOM DIA"
+        assert translator.to_code == "en"
+
+    def test_translator_from_config_raises_on_failure(self, translate_server):
+        """Testa que a falha chega ao pipeline em vez de virar o texto original."""
+        translate_server.statuses = [400]
+        translator = Translator.from_config(
+            {
+                "translate_endpoint": endpoint_of(translate_server),
+                "translation_cache_enabled": False,
+            }
+        )
+
+        with pytest.raises(TranslationError):
+            translator.translate("bom dia")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
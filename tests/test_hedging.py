@@ -0,0 +1,168 @@
+"""
+Testes unitários para hedging.py
+"""
+
+import time
+
+import pytest
+
+from core.base_engine import AudioSegment, BaseAudioEngine
+from core.hedging import HedgedEngine
+from core.metrics import metrics
+from core.transcriber import Transcriber, WhisperEngine
+
+
+class DelayedEngine(BaseAudioEngine):
+    """Engine com latência e resultado configuráveis."""
+
+    def __init__(self, text, delay=0.0, error=None):
+        super().__init__(16000)
+        self.text = text
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def recognize(self, audio_data_bytes):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.text
+
+
+class FakeWhisperEngine(WhisperEngine):
+    """WhisperEngine sem modelo (só os atributos do modo direto)."""
+
+    def __init__(self, sample_rate=16000, **kwargs):
+        BaseAudioEngine.__init__(self, sample_rate)
+        self.direct_translation = False
+        self.direct_source_transcript = True
+
+
+SEGMENT = AudioSegment(b"\x00\x01" * 16000)
+
+
+class TestHedgedEngine:
+    """Testes para o wrapper de hedging."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_fast_primary_does_not_hedge(self):
+        """Testa que o secundário não é chamado se o primário responde a tempo."""
+        primary, secondary = DelayedEngine("primário"), DelayedEngine("secundário")
+        engine = HedgedEngine(primary, secondary, hedge_delay_s=0.2)
+
+        assert engine.recognize_segment(SEGMENT) == "primário"
+        assert secondary.calls == 0
+        assert metrics.counter("hedge.fired") == 0
+        assert metrics.counter("hedge.wins.primary") == 1
+
+    def test_slow_primary_loses_to_secondary(self):
+        """Testa que o secundário vence quando o primário está na cauda."""
+        primary = DelayedEngine("primário", delay=0.5)
+        secondary = DelayedEngine("secundário", delay=0.01)
+        engine = HedgedEngine(primary, secondary, hedge_delay_s=0.05)
+
+        start = time.perf_counter()
+        text = engine.recognize_segment(SEGMENT)
+
+        assert text == "secundário"
+        assert time.perf_counter() - start < 0.4
+        assert metrics.counter("hedge.fired") == 1
+        assert metrics.counter("hedge.wins.secondary") == 1
+        assert metrics.counter("hedge.losses.primary") == 1
+
+    def test_empty_result_waits_for_other(self):
+        """Testa que um resultado vazio não vence a corrida."""
+        primary = DelayedEngine("primário", delay=0.2)
+        secondary = DelayedEngine("", delay=0.0)
+        engine = HedgedEngine(primary, secondary, hedge_delay_s=0.01)
+
+        assert engine.recognize_segment(SEGMENT) == "primário"
+        assert metrics.counter("hedge.wins.primary") == 1
+
+    def test_primary_error_hedges_immediately(self):
+        """Testa que falha rápida do primário dispara o secundário."""
+        primary = DelayedEngine("", error=RuntimeError("offline"))
+        secondary = DelayedEngine("secundário")
+        engine = HedgedEngine(primary, secondary, hedge_delay_s=1.0)
+
+        start = time.perf_counter()
+        assert engine.recognize_segment(SEGMENT) == "secundário"
+        assert time.perf_counter() - start < 0.5
+
+    def test_both_empty(self):
+        engine = HedgedEngine(DelayedEngine(""), DelayedEngine(""), hedge_delay_s=0.0)
+
+        assert engine.recognize_segment(SEGMENT) == ""
+        assert metrics.counter("hedge.empty") == 1
+
+    def test_both_failing_raise(self):
+        """Testa que a falha dos dois reconhecedores chega a quem chama."""
+        engine = HedgedEngine(
+            DelayedEngine("", error=RuntimeError("offline")),
+            DelayedEngine("", error=RuntimeError("sem modelo")),
+            hedge_delay_s=1.0,
+        )
+
+        with pytest.raises(RuntimeError, match="offline"):
+            engine.recognize_segment(SEGMENT)
+        assert metrics.counter("hedge.errors") == 1
+
+    def test_adaptive_delay_uses_primary_p95(self):
+        """Testa o atraso automático a partir da latência do primário."""
+        engine = HedgedEngine(
+            DelayedEngine("a"), DelayedEngine("b"), initial_delay_s=0.7, min_samples=5
+        )
+        assert engine.current_delay() == 0.7
+
+        engine._primary_latencies.extend([0.1] * 18 + [0.9] * 2)
+
+        assert engine.current_delay() == pytest.approx(0.9)
+
+    def test_delegates_segmentation_to_primary(self):
+        primary = DelayedEngine("a")
+        engine = HedgedEngine(primary, DelayedEngine("b"))
+
+        assert engine.sample_rate == 16000
+        assert engine.segmenter is None
+        engine.process_audio(b"\x00\x01" * 480, is_speech=True)
+        assert len(primary.buffer) == 960
+
+
+class TestHedgedTranscriber:
+    def test_hedging_keeps_whisper_direct_translation(self, monkeypatch):
+        """Testa que o wrapper de hedge não desliga a tradução direta do Whisper."""
+        monkeypatch.setattr(
+            Transcriber,
+            "_create_engine",
+            lambda self, engine_type: (
+                FakeWhisperEngine()
+                if engine_type.startswith("whisper")
+                else DelayedEngine("vosk")
+            ),
+        )
+
+        transcriber = Transcriber(
+            "whisper",
+            options={
+                "hedging_enabled": True,
+                "hedge_secondary_engine": "google",
+                "target_lang": "en",
+            },
+        )
+
+        assert isinstance(transcriber.engine, HedgedEngine)
+        assert transcriber.whisper_engine().direct_translation
+        assert transcriber.engine.direct_translation  # visto pelo pipeline
+
+        # Troca de idioma sem recarregar: o Whisper só traduz para o inglês
+        transcriber.set_target_lang("es")
+        assert not transcriber.engine.direct_translation
+        transcriber.set_target_lang("en")
+        assert transcriber.engine.direct_translation
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+"""
+Testes unitários para o HybridEngine (transcriber.py)
+"""
+
+import pytest
+
+from core.base_engine import AudioSegment, BaseAudioEngine
+from core.metrics import metrics
+from core.transcriber import HybridEngine, vosk_confidence
+
+
+class ScriptedLiveEngine:
+    """Imita o VoskEngine: devolve finais roteirizados com confiança."""
+
+    def __init__(self, script, sample_rate=16000):
+        self.sample_rate = sample_rate
+        self.script = list(script)  # itens: None ou (texto, confiança)
+        self.segmenter = None
+        self.last_confidence = None
+
+    def process_audio(self, audio_bytes, is_speech, raw_speech=None):
+        step = self.script.pop(0) if self.script else None
+        if step is None:
+            return "parcial", None
+        text, self.last_confidence = step
+        return None, text
+
+
+class HeavyEngine(BaseAudioEngine):
+    def __init__(self):
+        super().__init__(16000)
+        self.recognized = []
+
+    def recognize(self, audio_data_bytes):
+        self.recognized.append(audio_data_bytes)
+        return "texto preciso"
+
+
+FRAME = b"\x01\x00" * 480  # 30ms
+
+
+class TestHybridEngine:
+    """Testes para o reconhecimento em duas passagens."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_vosk_confidence(self):
+        result = {"result": [{"word": "a", "conf": 0.5}, {"word": "b", "conf": 1.0}]}
+        assert vosk_confidence(result) == pytest.approx(0.75)
+        assert vosk_confidence({"text": "sem palavras"}) is None
+
+    def test_confident_final_is_not_refined(self):
+        """Testa que finais confiáveis custam só o Vosk."""
+        live = ScriptedLiveEngine([None] * 30 + [("frase clara", 0.95)])
+        engine = HybridEngine(live, HeavyEngine(), confidence_threshold=0.8)
+
+        for _ in range(31):
+            partial, final = engine.process_audio(FRAME, True)
+
+        assert final == "frase clara"
+        assert engine.take_refinement() is None
+        assert metrics.counter("hybrid.finals") == 1
+        assert metrics.counter("hybrid.refinements") == 0
+
+    def test_low_confidence_final_is_refined(self):
+        """Testa que o segmento incerto vai ao engine pesado com o áudio da fala."""
+        live = ScriptedLiveEngine([None] * 30 + [("frase confusa", 0.4)])
+        heavy = HeavyEngine()
+        engine = HybridEngine(live, heavy, confidence_threshold=0.8)
+
+        engine.process_audio(FRAME, False)  # silêncio antes da fala não entra
+        live.script.insert(0, None)
+        for _ in range(31):
+            engine.process_audio(FRAME, True)
+
+        draft, segment = engine.take_refinement()
+        assert draft == "frase confusa"
+        assert isinstance(segment, AudioSegment)
+        assert len(segment.audio) == 31 * len(FRAME)
+        assert engine.refine(segment) == "texto preciso"
+        assert heavy.recognized == [segment.audio]
+        assert engine.take_refinement() is None
+
+    def test_short_or_unknown_confidence_not_refined(self):
+        """Testa que segmentos curtos ou sem confiança não são reprocessados."""
+        live = ScriptedLiveEngine([("oi", 0.1), None, ("sem conf", None)])
+        engine = HybridEngine(
+            live, HeavyEngine(), confidence_threshold=0.8, min_refine_seconds=0.5
+        )
+
+        for _ in range(3):
+            engine.process_audio(FRAME, True)
+
+        assert engine.take_refinement() is None
+
+    def test_segmenter_delegates_to_live_engine(self):
+        live = ScriptedLiveEngine([])
+        engine = HybridEngine(live, HeavyEngine())
+
+        engine.segmenter = "seg"
+
+        assert live.segmenter == "seg"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,147 @@
+"""
+Testes unitários para incremental_translation.py
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from core.incremental_translation import IncrementalTranslator, stable_prefix
+from core.metrics import metrics
+from core.translation_cache import TranslationCache
+from core.translation_memory import TranslationMemory
+from core.translator import Translator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DeferredSubmit:
+    """Guarda as tarefas para o teste decidir quando a 'requisição' termina."""
+
+    def __init__(self):
+        self.tasks = []
+
+    def __call__(self, fn, *args):
+        self.tasks.append((fn, args))
+
+    def finish(self):
+        fn, args = self.tasks.pop(0)
+        fn(*args)
+
+
+def make_incremental(submit, clock, min_words=2):
+    shown = []
+    incremental = IncrementalTranslator(
+        lambda text: text.upper(),
+        submit,
+        lambda text, translation: shown.append((text, translation)),
+        min_interval_s=0.5,
+        min_words=min_words,
+        clock=clock,
+    )
+    return incremental, shown
+
+
+class TestStablePrefix:
+    def test_common_words_only(self):
+        assert stable_prefix(["eu", "vou", "pra"], ["eu", "vou", "para", "casa"]) == [
+            "eu",
+            "vou",
+        ]
+        assert stable_prefix([], ["eu"]) == []
+
+
+class TestIncrementalTranslator:
+    def setup_method(self):
+        metrics.reset()
+
+    def test_translates_stable_prefix(self):
+        submit, clock = DeferredSubmit(), FakeClock()
+        incremental, shown = make_incremental(submit, clock)
+
+        incremental.update("eu vou")
+        incremental.update("eu vou para")  # "eu vou" estável
+        submit.finish()
+
+        assert shown == [("eu vou", "EU VOU")]
+
+    def test_debounce_and_supersede(self):
+        submit, clock = DeferredSubmit(), FakeClock()
+        incremental, shown = make_incremental(submit, clock)
+
+        incremental.update("eu vou para")
+        incremental.update("eu vou para casa")
+        incremental.update("eu vou para casa agora")  # em andamento: fica pendente
+        incremental.update("eu vou para casa agora mesmo")  # substitui a pendente
+        clock.now = 0.6
+        submit.finish()  # libera a vaga: a pendente mais nova é enviada
+        submit.finish()
+
+        assert shown == [
+            ("eu vou para", "EU VOU PARA"),
+            ("eu vou para casa agora", "EU VOU PARA CASA AGORA"),
+        ]
+        assert metrics.counter("incremental.requests") == 2
+        assert metrics.counter("incremental.superseded") == 1
+
+    def test_interval_limits_request_rate(self):
+        submit, clock = DeferredSubmit(), FakeClock()
+        incremental, _ = make_incremental(submit, clock)
+
+        incremental.update("eu vou")
+        incremental.update("eu vou para")
+        submit.finish()
+        incremental.update("eu vou para casa")  # dentro do intervalo: espera
+
+        assert submit.tasks == []
+        clock.now = 0.6
+        incremental.update("eu vou para casa hoje")
+        assert len(submit.tasks) == 1
+
+    def test_revised_prefix_is_discarded(self):
+        submit, clock = DeferredSubmit(), FakeClock()
+        incremental, shown = make_incremental(submit, clock)
+
+        incremental.update("eu vou pra")
+        incremental.update("eu vou pra casa")
+        incremental.update("eu vou para casa")  # o reconhecedor revisou "pra"
+        submit.finish()
+
+        assert shown == []
+        assert metrics.counter("incremental.discarded") == 1
+
+    def test_reset_drops_in_flight_result(self):
+        submit, clock = DeferredSubmit(), FakeClock()
+        incremental, shown = make_incremental(submit, clock)
+
+        incremental.update("bom dia")
+        incremental.update("bom dia a todos")
+        incremental.reset()  # final chegou
+        submit.finish()
+
+        assert shown == []
+
+
+class TestPartialTranslation:
+    def test_partial_goes_to_cache_not_memory(self):
+        client = Mock()
+        client.translate.return_value = "good morning everyone"
+        memory = TranslationMemory(min_chars=4)
+        translator = Translator(cache=TranslationCache(), memory=memory, client=client)
+
+        translator.translate("bom dia a todos", fuzzy=False)
+
+        assert len(memory) == 0
+        # O final igual à última prévia não vai à rede
+        assert translator.translate("Bom dia a todos.") == "Good morning everyone."
+        assert client.translate.call_count == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,152 @@
+"""
+Testes unitários para libretranslate.py e o registro de backends do Translator
+(contra servidor local compatível com LibreTranslate)
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from core.google_translate import GoogleTranslateClient, TranslationError
+from core.libretranslate import LibreTranslateClient, parse_libre_response
+from core.translator import BACKENDS, Translator, register_backend
+
+
+class FakeLibreHandler(BaseHTTPRequestHandler):
+    """POST /translate: devolve "<target>:<texto>" (texto ou lista)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append(body)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        q = body["q"]
+        if isinstance(q, list):
+            translated = [f"{body['target']}:{t}" for t in q]
+        else:
+            translated = f"{body['target']}:{q}"
+        out = json.dumps({"translatedText": translated}).encode()
+        with server.lock:
+            server.in_flight -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def libre_server(local_server):
+    return local_server(
+        FakeLibreHandler,
+        lock=threading.Lock(),
+        requests=[],
+        in_flight=0,
+        max_in_flight=0,
+        delay=0.0,
+    )
+
+
+def url_of(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class TestLibreTranslate:
+    def test_parse_response(self):
+        assert parse_libre_response({"translatedText": "hi"}) == "hi"
+        assert parse_libre_response({"translatedText": ["a", "b"]}, 2) == ["a", "b"]
+        with pytest.raises(TranslationError):
+            parse_libre_response({"translatedText": ["a"]}, 2)
+        with pytest.raises(TranslationError):
+            parse_libre_response({"error": "Invalid request"})
+
+    def test_single_and_batch_requests(self, libre_server):
+        client = LibreTranslateClient(
+            "pt", "zh-CN", url=url_of(libre_server), api_key="segredo"
+        )
+
+        assert client.translate("olá") == "zh:olá"
+        assert client.translate_batch(["um", "dois"]) == ["zh:um", "zh:dois"]
+        first, second = libre_server.requests
+        assert first["source"] == "pt" and first["api_key"] == "segredo"
+        assert second["q"] == ["um", "dois"]
+        client.close()
+
+    def test_concurrency_limit_is_respected(self, libre_server):
+        libre_server.delay = 0.05
+        client = LibreTranslateClient(
+            url=url_of(libre_server), max_concurrency=2, max_retries=0
+        )
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(client.translate, [f"t{i}" for i in range(8)]))
+
+        assert results == [f"en:t{i}" for i in range(8)]
+        assert libre_server.max_in_flight <= 2
+        client.close()
+
+    def test_concurrent_load_is_batched_in_order(self, libre_server):
+        libre_server.delay = 0.05
+        translator = Translator.from_config(
+            {
+                "translation_backend": "libretranslate",
+                "libretranslate_url": url_of(libre_server),
+                "libretranslate_max_concurrency": 2,
+                "translation_cache_enabled": False,
+                "translation_memory_enabled": False,
+                "translation_batch_window_ms": 30,
+            }
+        )
+        texts = [f"frase {i}" for i in range(32)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(translator.translate, texts))
+        elapsed = time.perf_counter() - start
+
+        # Cada chamador recebe a sua tradução, apesar dos lotes
+        assert results == [f"en:{t}" for t in texts]
+        assert len(libre_server.requests) < len(texts)
+        # 32 requisições seriais levariam >= 1.6 s
+        assert elapsed < 32 * libre_server.delay / 2
+        assert libre_server.max_in_flight <= 2
+
+    def test_registry_selects_and_falls_back(self):
+        register_backend("indisponivel", lambda options, src, tgt: None)
+        try:
+            translator = Translator.from_config(
+                {
+                    "translation_backend": "indisponivel",
+                    "translation_cache_enabled": False,
+                    "translation_memory_enabled": False,
+                }
+            )
+        finally:
+            del BACKENDS["indisponivel"]
+
+        assert isinstance(translator._translator, GoogleTranslateClient)
+        assert not isinstance(translator._translator, LibreTranslateClient)
+
+    def test_backends_do_not_share_transport(self):
+        google = GoogleTranslateClient(pool_size=4)
+        libre = LibreTranslateClient(max_concurrency=4)
+
+        assert not isinstance(libre, GoogleTranslateClient)
+        assert libre.session is not google.session
+        assert libre.session is LibreTranslateClient(target="es").session
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,71 @@
+"""
+Testes unitários para metrics.py
+"""
+
+import threading
+
+import pytest
+
+from core.metrics import Metrics
+
+
+class TestMetrics:
+    """Testes para o registro de métricas."""
+
+    def test_counters_and_gauges(self):
+        """Testa contadores e gauges."""
+        m = Metrics()
+
+        m.increment("a")
+        m.increment("a", 2)
+        m.set_gauge("g", 1.5)
+
+        assert m.counter("a") == 3
+        assert m.counter("missing") == 0
+        assert m.gauge("g") == 1.5
+        assert m.gauge("missing") is None
+
+    def test_percentile_window(self):
+        """Testa percentis sobre a janela móvel."""
+        m = Metrics(window=10)
+        for v in range(100):
+            m.observe("lat", float(v))
+
+        # Apenas os 10 últimos valores (90..99) permanecem
+        assert m.percentile("lat", 0) == 90.0
+        assert m.percentile("lat", 100) == 99.0
+        assert m.percentile("lat", 50) in (94.0, 95.0)
+        assert m.percentile("missing", 50) is None
+
+    def test_snapshot_and_reset(self):
+        """Testa snapshot e reset."""
+        m = Metrics()
+        m.increment("x")
+        m.observe("lat", 0.2)
+
+        snap = m.snapshot()
+        assert snap["counters"] == {"x": 1}
+        assert snap["latency"]["lat"]["p50"] == 0.2
+
+        m.reset()
+        assert m.snapshot() == {"counters": {}, "gauges": {}, "latency": {}}
+
+    def test_thread_safety(self):
+        """Testa incrementos concorrentes."""
+        m = Metrics()
+
+        def work():
+            for _ in range(1000):
+                m.increment("n")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert m.counter("n") == 4000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
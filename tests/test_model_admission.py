@@ -0,0 +1,210 @@
+"""
+Testes unitários para model_admission.py
+"""
+
+import os
+
+import pytest
+
+import core.model_admission as model_admission
+from core.metrics import metrics
+from core.model_admission import (
+    AdmissionError,
+    ModelCache,
+    admit_model,
+    candidate_configs,
+    expected_resident_mb,
+    model_keys,
+)
+
+
+def installed(*types):
+    return lambda model_type: f"model_{model_type}" if model_type in types else False
+
+
+class Owner:
+    """Engine fictício que segura um modelo do cache."""
+
+
+class TestModelMetadata:
+    def test_model_keys_include_auxiliary_engines(self):
+        options = {
+            "model_type": "hybrid",
+            "hybrid_heavy_engine": "whisper",
+            "whisper_profile": "fast",
+            "routing_enabled": True,
+            "fallback_engine": "small",
+        }
+
+        # O Vosk small do híbrido e o de reserva são o mesmo modelo
+        assert model_keys(options) == ["small", "whisper-tiny"]
+
+    def test_expected_resident_mb(self):
+        assert expected_resident_mb({"model_type": "google"}) == 0
+        assert expected_resident_mb({"model_type": "big"}) > expected_resident_mb(
+            {"model_type": "small"}
+        )
+
+    def test_windows_without_psutil_uses_native_counters(self, monkeypatch):
+        """Testa que o Windows sem psutil mede a memória (admissão não fica cega)."""
+        monkeypatch.setattr(model_admission, "HAS_PSUTIL", False)
+        monkeypatch.setattr(model_admission.os, "name", "nt")
+        monkeypatch.setattr(model_admission, "_windows_available_mb", lambda: 2048.0)
+        monkeypatch.setattr(model_admission, "_windows_rss_mb", lambda: 512.0)
+
+        assert model_admission.available_memory_mb() == 2048.0
+        assert model_admission.process_rss_mb() == 512.0
+
+    def test_whisper_candidates_downgrade_profile(self):
+        candidates = candidate_configs(
+            {"model_type": "whisper", "whisper_profile": "accurate"}
+        )
+
+        assert [c["whisper_profile"] for c in candidates] == [
+            "accurate",
+            "balanced",
+            "fast",
+        ]
+
+
+class TestAdmission:
+    def setup_method(self):
+        metrics.reset()
+
+    def test_admits_when_model_fits(self):
+        decision = admit_model(
+            {"model_type": "big"}, "model_big", available=lambda: 8000
+        )
+
+        assert decision.model_type == "big"
+        assert decision.model_path == "model_big"
+        assert decision.message is None
+
+    def test_falls_back_to_smaller_model(self):
+        decision = admit_model(
+            {"model_type": "big"},
+            "model_big",
+            available=lambda: 1500,
+            resolve_path=installed("small"),
+            cache=ModelCache(),
+        )
+
+        assert decision.model_type == "small"
+        assert decision.model_path == "model_small"
+        assert "Memória insuficiente" in decision.message
+        assert metrics.counter("model.admission_fallbacks") == 1
+
+    def test_refuses_with_clear_message(self):
+        with pytest.raises(AdmissionError, match="escolha um modelo menor"):
+            admit_model(
+                {"model_type": "big", "memory_policy": "refuse"},
+                "model_big",
+                available=lambda: 1500,
+                resolve_path=installed("small"),
+                cache=ModelCache(),
+            )
+        assert metrics.counter("model.admission_refusals") == 1
+
+    def test_evicts_cold_models_before_falling_back(self):
+        cache = ModelCache(max_cold_mb=10000)
+        cache.get(("vosk", "model_small"), object)
+        cache._entries[("vosk", "model_small")].resident_mb = 2000
+
+        decision = admit_model(
+            {"model_type": "big"},
+            "model_big",
+            available=lambda: 2000,
+            resolve_path=installed("small"),
+            cache=cache,
+        )
+
+        assert decision.model_type == "big"
+        assert len(cache) == 0
+        assert metrics.counter("model.evictions") == 1
+
+    def test_resident_model_does_not_count(self):
+        cache = ModelCache()
+        owner = Owner()
+        cache.get(("vosk", os.path.abspath("model_big")), object, owner)
+
+        # Reiniciar no Vosk big já carregado não exige outros 3000 MB
+        decision = admit_model(
+            {"model_type": "big"},
+            "model_big",
+            available=lambda: 1000,
+            resolve_path=installed("small"),
+            cache=cache,
+        )
+
+        assert decision.model_type == "big"
+        assert decision.required_mb == 0
+
+    def test_cached_cold_model_is_kept_for_the_candidate(self):
+        cache = ModelCache(max_cold_mb=10000)
+        cache.get(("whisper", "base"), object)
+        cache.get(("vosk", os.path.abspath("model_small")), object)
+        cache._entries[("vosk", os.path.abspath("model_small"))].resident_mb = 2000
+
+        decision = admit_model(
+            {"model_type": "whisper", "whisper_profile": "balanced"},
+            "model_whisper",
+            available=lambda: 300,
+            cache=cache,
+        )
+
+        assert decision.model_type == "whisper"
+        assert cache.loaded_keys("whisper", "base")
+        assert not cache.loaded_keys("vosk", "model_small")
+
+    def test_disabled_admission_loads_as_configured(self):
+        decision = admit_model(
+            {"model_type": "big", "memory_admission": False},
+            "model_big",
+            available=lambda: 10,
+        )
+
+        assert decision.model_type == "big"
+
+
+class TestModelCache:
+    def test_shares_model_between_owners(self):
+        cache = ModelCache()
+        loads = []
+        a, b = Owner(), Owner()
+
+        first = cache.get(("vosk", "small"), lambda: loads.append(1) or object(), a)
+        second = cache.get(("vosk", "small"), lambda: loads.append(1) or object(), b)
+
+        assert first is second
+        assert loads == [1]
+
+    def test_only_cold_models_are_evicted(self):
+        cache = ModelCache()
+        owner = Owner()
+        cache.get(("vosk", "hot"), object, owner)
+        cache.get(("vosk", "cold"), object)
+
+        cache.evict_cold(float("inf"))
+
+        assert len(cache) == 1
+        del owner  # engine descartado: o modelo fica frio
+        cache.evict_cold(float("inf"))
+        assert len(cache) == 0
+
+    def test_trim_releases_model_left_cold_by_a_swap(self):
+        cache = ModelCache(max_cold_mb=1024)
+        engine = Owner()
+        engine.cycle = engine  # só sai com o coletor de ciclos
+        cache.get(("vosk", "big"), object, engine)
+        cache._entries[("vosk", "big")].resident_mb = 3000
+        cache.get(("vosk", "small"), object, Owner())  # dono já descartado
+
+        del engine
+        cache.trim()
+
+        assert not cache.loaded_keys("vosk", "big")
+        assert metrics.counter("model.evictions") >= 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
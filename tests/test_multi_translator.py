@@ -0,0 +1,136 @@
+"""
+Testes unitários para multi_translator.py
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from core.multi_translator import (
+    JsonlWriter,
+    MultiTranslator,
+    translator_from_config,
+)
+from core.translator import Translator
+
+
+class SlowClient:
+    """Cliente falso: 'traduz' prefixando o idioma, com latência fixa."""
+
+    def __init__(self, lang, delay=0.1):
+        self.lang = lang
+        self.delay = delay
+        self.calls = []
+
+    def translate(self, text):
+        self.calls.append(text)
+        time.sleep(self.delay)
+        return f"{self.lang}:{text}"
+
+
+def make_multi(langs=("en", "es", "fr"), primary="en", delay=0.1):
+    clients = {lang: SlowClient(lang, delay) for lang in langs}
+    translators = {
+        lang: Translator(to_code=lang, client=client)
+        for lang, client in clients.items()
+    }
+    return MultiTranslator(translators, primary), clients
+
+
+CONFIG = {
+    "target_lang": "en",
+    "extra_target_langs": ["es", "pt"],
+    "translation_memory_enabled": False,
+}
+
+
+class TestMultiTranslator:
+    def test_translate_all_runs_targets_concurrently(self):
+        multi, _ = make_multi(delay=0.2)
+
+        start = time.perf_counter()
+        results = multi.translate_all("bom dia")
+
+        assert results == {"en": "en:bom dia", "es": "es:bom dia", "fr": "fr:bom dia"}
+        assert time.perf_counter() - start < 0.4  # não 3 x 0.2 s
+        multi.close()
+
+    def test_translate_returns_primary_and_notifies_listeners(self):
+        multi, _ = make_multi()
+        received = []
+        done = threading.Event()
+        multi.add_listener(lambda text, results: (received.append(results), done.set()))
+
+        assert multi.translate("bom dia") == "en:bom dia"
+
+        assert done.wait(2)
+        assert received == [
+            {"en": "en:bom dia", "es": "es:bom dia", "fr": "fr:bom dia"}
+        ]
+        multi.close()
+
+    def test_complete_translates_only_missing_targets(self):
+        multi, clients = make_multi(delay=0)
+        received = []
+        done = threading.Event()
+        multi.add_listener(lambda text, results: (received.append(results), done.set()))
+
+        multi.complete("bom dia", {"en": "good morning"})
+
+        assert done.wait(2)
+        assert received == [
+            {"en": "good morning", "es": "es:bom dia", "fr": "fr:bom dia"}
+        ]
+        assert clients["en"].calls == []
+        multi.close()
+
+    def test_preview_and_primary_switch(self):
+        multi, clients = make_multi(delay=0)
+
+        assert multi.translate("bom dia", fuzzy=False) == "en:bom dia"
+        assert clients["es"].calls == []  # prévia só no idioma exibido
+        assert multi.set_primary("es")
+        assert not multi.set_primary("de")
+        assert multi.translate("boa noite") == "es:boa noite"
+        multi.close()
+
+    def test_jsonl_writer(self, tmp_path):
+        path = tmp_path / "traducoes.jsonl"
+        writer = JsonlWriter(str(path))
+
+        writer("olá", {"en": "hello", "es": "hola"})
+
+        line = json.loads(path.read_text(encoding="utf-8"))
+        assert line["text"] == "olá"
+        assert line["translations"] == {"en": "hello", "es": "hola"}
+
+
+class TestTranslatorFromConfig:
+    def test_single_target_stays_plain(self):
+        translator = translator_from_config({"target_lang": "es"})
+
+        assert isinstance(translator, Translator)
+        assert translator.to_code == "es"
+
+    def test_targets_share_cache_and_connection_pool(self):
+        multi = translator_from_config(CONFIG)
+
+        assert isinstance(multi, MultiTranslator)
+        assert multi.targets == ["en", "es"]  # origem fora dos destinos
+        en, es = multi.translators["en"], multi.translators["es"]
+        assert en.cache is es.cache
+        assert en._translator.session is es._translator.session
+        multi.close()
+
+    def test_to_code_overrides_primary(self):
+        multi = translator_from_config(CONFIG, to_code="es")
+
+        assert multi.primary == "es"
+        assert multi.targets == ["es"]
+        multi.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
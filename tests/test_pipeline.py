@@ -0,0 +1,203 @@
+"""
+Testes unitários para o pipeline assíncrono (pipeline.py)
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from core.base_engine import AudioSegment, BaseAudioEngine
+from core.http_translate import TranslationError
+from core.metrics import metrics
+from core.pipeline import ProcessingThread
+
+
+class FakeEngine(BaseAudioEngine):
+    def __init__(self, text="olá mundo"):
+        super().__init__(16000)
+        self.text = text
+
+    def recognize(self, audio_data_bytes):
+        return self.text
+
+
+class FakeDirectEngine(FakeEngine):
+    """Imita o WhisperEngine em modo de tradução direta."""
+
+    direct_translation = True
+    direct_source_transcript = True
+    source = "olá mundo"
+
+    def translate_segment(self, segment, with_source=False, on_translation=None):
+        on_translation("hello world")
+        return (self.source if with_source else ""), "hello world"
+
+
+class FakeMultiTranslator:
+    """Imita o MultiTranslator (inglês + idiomas extras)."""
+
+    targets = ["en", "es"]
+
+    def __init__(self):
+        self.completed = []
+
+    def translate(self, text, **kwargs):
+        raise AssertionError("o inglês vem do Whisper")
+
+    def complete(self, text, known):
+        self.completed.append((text, known))
+
+
+def make_thread(engine, translator=None):
+    transcriber = Mock()
+    transcriber.engine = engine
+    return ProcessingThread(
+        Mock(), transcriber, translator, has_translator_plugin=translator is not None
+    )
+
+
+def drain(thread):
+    results = []
+    while not thread._result_queue.empty():
+        results.append(thread._result_queue.get_nowait())
+    return [r for r in results if r["type"] != "thinking"]
+
+
+SEGMENT_AUDIO = b"\x00\x01" * 16000
+
+
+class TestAsyncPipeline:
+    def setup_method(self):
+        metrics.reset()
+
+    def test_recognize_then_translate(self):
+        translator = Mock()
+        translator.translate.return_value = "hello world"
+        thread = make_thread(FakeEngine(), translator)
+
+        thread._async_pipeline(AudioSegment(SEGMENT_AUDIO))
+
+        assert drain(thread) == [
+            {"type": "text", "text": "olá mundo", "translation": ""},
+            {"type": "text", "text": "olá mundo", "translation": "hello world"},
+        ]
+
+    def test_translation_failure_is_reported(self):
+        """Testa que a falha de tradução vira aviso, não uma tradução falsa."""
+        translator = Mock()
+        translator.translate.side_effect = TranslationError("HTTP 503 do tradutor")
+        thread = make_thread(FakeEngine(), translator)
+
+        thread._async_pipeline(AudioSegment(SEGMENT_AUDIO))
+
+        assert drain(thread) == [
+            {"type": "text", "text": "olá mundo", "translation": ""},
+            {"type": "translation_status", "ok": False},
+            {"type": "text", "text": "olá mundo", "translation": "olá mundo"},
+        ]
+
+        # Volta a traduzir: a UI é avisada uma vez
+        translator.translate.side_effect = None
+        translator.translate.return_value = "hello world"
+        thread._async_pipeline(AudioSegment(SEGMENT_AUDIO))
+        thread._async_pipeline(AudioSegment(SEGMENT_AUDIO))
+
+        statuses = [r for r in drain(thread) if r["type"] == "translation_status"]
+        assert statuses == [{"type": "translation_status", "ok": True}]
+
+    def test_direct_translation_skips_translator(self):
+        """Testa que o modo direto não passa pelo tradutor de rede."""
+        translator = Mock()
+        thread = make_thread(FakeDirectEngine(), translator)
+
+        thread._async_pipeline(AudioSegment(SEGMENT_AUDIO))
+
+        results = drain(thread)
+        translator.translate.assert_not_called()
+        # Inglês primeiro, depois a linha completada com o original
+        assert results[0] == {
+            "type": "text",
+            "text": "hello world",
+            "translation": "hello world",
+        }
+        assert results[1]["type"] == "replace"
+        assert results[1]["text"] == "olá mundo"
+        assert results[-1] == {
+            "type": "text",
+            "text": "olá mundo",
+            "translation": "hello world",
+        }
+        assert metrics.counter("direct_translation.segments") == 1
+
+    def test_direct_translation_stitches_chunks(self):
+        """Testa a costura do texto traduzido entre chunks de fala longa."""
+        engine = FakeDirectEngine()
+        engine.direct_source_transcript = False
+        thread = make_thread(engine)
+        previous = AudioSegment(SEGMENT_AUDIO)
+        previous.set_text("we say hello")
+
+        segment = AudioSegment(SEGMENT_AUDIO, previous=previous)
+        thread._async_pipeline(segment)
+
+        results = drain(thread)
+        assert results == [{"type": "text", "text": "world", "translation": "world"}]
+        assert segment.text == "hello world"
+
+    def test_direct_translation_stitches_source_transcript(self):
+        """Testa que a transcrição original também perde a sobreposição."""
+        engine = FakeDirectEngine()
+        engine.source = "olá mundo de novo"
+        thread = make_thread(engine)
+        previous = AudioSegment(SEGMENT_AUDIO)
+        previous.set_text("we say hello", source_text="sempre dizemos olá mundo")
+
+        segment = AudioSegment(SEGMENT_AUDIO, previous=previous)
+        thread._async_pipeline(segment)
+
+        assert drain(thread) == [
+            {"type": "text", "text": "de novo", "translation": "world"}
+        ]
+        assert segment.text == "hello world"
+        assert segment.source_text == "olá mundo de novo"
+
+    def test_direct_translation_fans_out_other_targets(self):
+        """Testa que os idiomas extras recebem a transcrição original no modo direto."""
+        engine = FakeDirectEngine()
+        engine.direct_source_transcript = False
+        translator = FakeMultiTranslator()
+        thread = make_thread(engine, translator)
+
+        thread._async_pipeline(AudioSegment(SEGMENT_AUDIO))
+
+        assert drain(thread)[-1] == {
+            "type": "text",
+            "text": "hello world",
+            "translation": "hello world",
+        }
+        assert translator.completed == [("olá mundo", {"en": "hello world"})]
+
+    def test_incremental_preview_is_queued(self):
+        translator = Mock()
+        translator.translate.return_value = "good morning"
+        transcriber = Mock()
+        transcriber.engine = FakeEngine()
+        thread = ProcessingThread(
+            Mock(),
+            transcriber,
+            translator,
+            options={"incremental_translation": True, "incremental_min_words": 2},
+        )
+        thread.incremental.submit = lambda fn, *args: fn(*args)
+
+        thread.incremental.update("bom dia")
+        thread.incremental.update("bom dia pessoal")
+
+        translator.translate.assert_called_once_with("bom dia", fuzzy=False)
+        assert drain(thread) == [
+            {"type": "live", "text": "bom dia", "translation": "good morning"}
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
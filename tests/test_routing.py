@@ -0,0 +1,230 @@
+"""
+Testes unitários para routing.py
+"""
+
+import time
+
+import pytest
+
+from core.base_engine import AudioSegment, BaseAudioEngine, RecognitionError
+from core.hedging import HedgedEngine
+from core.metrics import metrics
+from core.routing import CircuitBreaker, RoutedEngine
+from core.transcriber import Transcriber
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyEngine(BaseAudioEngine):
+    """Engine primário com falha/latência controladas."""
+
+    def __init__(self):
+        super().__init__(16000)
+        self.raise_errors = False
+        self.fail = False
+        self.delay = 0.0
+        self.calls = 0
+
+    def recognize(self, audio_data_bytes):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RecognitionError("rede indisponível")
+        return "online"
+
+
+class OfflineEngine:
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+
+    def recognize(self, audio_data_bytes):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return "offline"
+
+
+SEGMENT = AudioSegment(b"\x00\x01" * 8000)
+
+
+class TestCircuitBreaker:
+    """Testes para o circuit breaker."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_opens_on_error_rate(self):
+        breaker = CircuitBreaker(max_error_rate=0.5, min_samples=3, clock=FakeClock())
+
+        breaker.record(0.1, True)
+        breaker.record(0.1, False)
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record(0.1, False)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert metrics.counter("routing.circuit_opened") == 1
+
+    def test_opens_on_latency_slo(self):
+        breaker = CircuitBreaker(latency_slo_s=1.0, min_samples=3, clock=FakeClock())
+
+        for _ in range(3):
+            breaker.record(2.5, True)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_probe_after_wait_and_recovery(self):
+        """Testa a sondagem após o tempo de espera e o fechamento no sucesso."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(min_samples=1, open_seconds=10, clock=clock)
+        breaker.record(0.1, False)
+
+        assert breaker.try_probe() is False
+        clock.now = 10
+        assert breaker.try_probe() is True
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.try_probe() is False  # Só uma sondagem por vez
+
+        breaker.record_probe(0.2, True)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(
+            latency_slo_s=1.0, min_samples=1, open_seconds=5, clock=clock
+        )
+        breaker.record(0.1, False)
+        clock.now = 5
+        breaker.try_probe()
+
+        breaker.record_probe(3.0, True)  # Respondeu, mas fora do SLO
+
+        assert breaker.state == CircuitBreaker.OPEN
+        clock.now = 9
+        assert breaker.try_probe() is False
+
+
+class TestRoutedEngine:
+    """Testes para o roteamento primário/offline."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def make(self, **breaker_kwargs):
+        self.clock = FakeClock()
+        primary, fallback = FlakyEngine(), OfflineEngine()
+        breaker = CircuitBreaker(min_samples=2, clock=self.clock, **breaker_kwargs)
+        return RoutedEngine(primary, fallback, breaker=breaker), primary, fallback
+
+    def test_healthy_primary(self):
+        engine, primary, fallback = self.make()
+
+        assert engine.recognize_segment(SEGMENT) == "online"
+        assert engine.active_route == RoutedEngine.PRIMARY
+        assert primary.raise_errors is True
+        assert fallback.calls == 0
+
+    def test_failure_falls_back_and_opens(self):
+        """Testa que falhas ainda produzem legenda e abrem o circuito."""
+        engine, primary, fallback = self.make()
+        primary.fail = True
+
+        assert engine.recognize_segment(SEGMENT) == "offline"
+        assert engine.recognize_segment(SEGMENT) == "offline"
+        assert engine.active_route == RoutedEngine.FALLBACK
+
+        # Circuito aberto: o primário nem é chamado
+        calls = primary.calls
+        assert engine.recognize_segment(SEGMENT) == "offline"
+        assert primary.calls == calls
+        assert metrics.counter("routing.fallback_segments") == 3
+
+    def test_hanging_primary_times_out(self):
+        """Testa que um primário travado não congela a legenda."""
+        engine, primary, _ = self.make()
+        engine.request_timeout_s = 0.05
+        primary.delay = 0.3
+
+        start = time.perf_counter()
+        assert engine.recognize_segment(SEGMENT) == "offline"
+        assert time.perf_counter() - start < 0.25
+        assert metrics.counter("routing.primary_timeouts") == 1
+
+    def test_probe_restores_primary(self):
+        """Testa que a sondagem em segundo plano fecha o circuito."""
+        engine, primary, _ = self.make(open_seconds=10)
+        primary.fail = True
+        engine.recognize_segment(SEGMENT)
+        engine.recognize_segment(SEGMENT)
+        assert engine.active_route == RoutedEngine.FALLBACK
+
+        primary.fail = False
+        self.clock.now = 10
+        # O segmento atual ainda usa o offline; a sondagem roda em paralelo
+        assert engine.recognize_segment(SEGMENT) == "offline"
+        deadline = time.time() + 2
+        while engine.active_route != RoutedEngine.PRIMARY and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert engine.active_route == RoutedEngine.PRIMARY
+        assert engine.recognize_segment(SEGMENT) == "online"
+        assert metrics.counter("routing.probes") == 1
+
+
+class TestHedgedRouting:
+    """Roteamento por cima do hedging (os dois ativados)."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def make(self):
+        primary = FlakyEngine()
+        hedged = HedgedEngine(
+            primary, OfflineEngine(RecognitionError("sem modelo")), hedge_delay_s=0.0
+        )
+        breaker = CircuitBreaker(min_samples=2, clock=FakeClock())
+        return RoutedEngine(hedged, OfflineEngine(), breaker=breaker), hedged, primary
+
+    def test_raise_errors_reaches_wrapped_engine(self):
+        _, hedged, primary = self.make()
+
+        assert primary.raise_errors is True
+        assert "raise_errors" not in vars(hedged)
+
+    def test_failing_hedged_legs_open_circuit(self):
+        engine, _, primary = self.make()
+        primary.fail = True
+
+        assert engine.recognize_segment(SEGMENT) == "offline"
+        assert engine.recognize_segment(SEGMENT) == "offline"
+
+        assert engine.active_route == RoutedEngine.FALLBACK
+        assert metrics.counter("hedge.errors") == 2
+
+
+class TestRoutingSetup:
+    def test_missing_fallback_model_disables_routing(self, monkeypatch):
+        import download_models
+
+        monkeypatch.setattr(download_models, "is_model_installed", lambda _: False)
+        monkeypatch.setattr(
+            Transcriber, "_create_engine", lambda self, engine_type: FlakyEngine()
+        )
+        metrics.reset()
+
+        transcriber = Transcriber(
+            "google", options={"routing_enabled": True, "fallback_engine": "small"}
+        )
+
+        assert isinstance(transcriber.engine, FlakyEngine)
+        assert metrics.counter("engine.missing_auxiliary_model") == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,120 @@
+"""
+Testes unitários para segmenter.py
+"""
+
+import pytest
+
+from core.base_engine import BaseAudioEngine
+from core.metrics import metrics
+from core.segmenter import AdaptiveSegmenter
+
+
+class SilentEngine(BaseAudioEngine):
+    def recognize(self, audio_data_bytes: bytes) -> str:
+        return ""
+
+
+def speak(segmenter, speech_frames, pause_frames):
+    for _ in range(speech_frames):
+        segmenter.observe_frame(True)
+    for _ in range(pause_frames):
+        segmenter.observe_frame(False)
+
+
+class TestAdaptiveSegmenter:
+    """Testes para o segmentador adaptativo."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_keeps_defaults_without_data(self):
+        """Testa que os limiares iniciais valem até haver amostras."""
+        seg = AdaptiveSegmenter(initial_silence_frames=15, initial_max_segment_s=6.0)
+
+        speak(seg, 10, 5)
+
+        assert seg.silence_threshold_frames == 15
+        assert seg.max_segment_seconds == 6.0
+
+    def test_fast_speaker_lowers_endpoint(self):
+        """Testa que pausas internas curtas reduzem o endpoint."""
+        seg = AdaptiveSegmenter(initial_silence_frames=15, min_silence_frames=4)
+
+        for _ in range(20):
+            speak(seg, 10, 3)  # pausas de 90ms
+        seg.observe_frame(True)
+
+        assert seg.silence_threshold_frames == 3 + seg.margin_frames
+        assert metrics.gauge("segmenter.silence_frames") == 5
+
+    def test_slow_speaker_raises_endpoint(self):
+        """Testa que pausas internas longas aumentam o endpoint (até o máximo)."""
+        seg = AdaptiveSegmenter(initial_silence_frames=15, max_silence_frames=20)
+
+        for _ in range(20):
+            # Pausas abaixo do limiar atual, mas longas
+            speak(seg, 10, 14)
+        seg.observe_frame(True)
+
+        assert seg.silence_threshold_frames == 16
+
+        for _ in range(20):
+            speak(seg, 10, 15)
+        seg.observe_frame(True)
+        assert seg.silence_threshold_frames <= 20
+
+    def test_max_segment_follows_latency_target(self):
+        """Testa que o RTF medido limita o tamanho máximo do segmento."""
+        seg = AdaptiveSegmenter(latency_target_s=3.0, min_max_segment_s=1.0)
+
+        for _ in range(30):
+            seg.observe_recognition(audio_s=2.0, latency_s=1.0)  # RTF 0.5
+
+        assert seg.rtf == pytest.approx(0.5)
+        assert seg.max_segment_seconds == pytest.approx(2.0)
+        assert metrics.gauge("segmenter.max_segment_s") == pytest.approx(2.0)
+
+    def test_slow_engine_shrinks_segments_to_minimum(self):
+        """Testa o limite inferior quando o engine é muito lento."""
+        seg = AdaptiveSegmenter(latency_target_s=2.0, min_max_segment_s=1.5)
+
+        seg.observe_recognition(audio_s=1.0, latency_s=5.0)
+
+        assert seg.max_segment_seconds == 1.5
+
+    def test_engine_uses_segmenter_thresholds(self):
+        """Testa que o BaseAudioEngine segue os limiares do segmentador."""
+        engine = SilentEngine()
+        engine.segmenter = AdaptiveSegmenter(initial_silence_frames=4)
+        frame = b"\x00\x01" * 480
+
+        for _ in range(20):
+            engine.process_audio(frame, is_speech=True, raw_speech=True)
+
+        # Post-roll ainda ativo (is_speech=True), mas o VAD bruto já está em silêncio
+        result = (None, None)
+        for _ in range(4):
+            result = engine.process_audio(frame, is_speech=True, raw_speech=False)
+
+        status, segment = result
+        assert status == ""
+        assert segment is not None
+        assert engine.segmenter.segment_lengths[-1] == pytest.approx(0.72)
+
+    def test_discarded_segments_are_not_observed(self):
+        """Testa que o silêncio após o endpoint não encolhe o tamanho típico."""
+        engine = SilentEngine()
+        engine.segmenter = AdaptiveSegmenter(initial_silence_frames=4)
+        engine.min_segment_seconds = 0.4
+        frame = b"\x00\x01" * 480
+
+        for _ in range(20):
+            engine.process_audio(frame, is_speech=True, raw_speech=True)
+        for _ in range(40):
+            engine.process_audio(frame, is_speech=False, raw_speech=False)
+
+        assert list(engine.segmenter.segment_lengths) == [pytest.approx(0.72)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,173 @@
+"""
+Testes unitários para sentence_splitter.py e a tradução de textos longos em partes
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from core.http_translate import TranslationError
+from core.metrics import metrics
+from core.pipeline import ProcessingThread
+from core.sentence_splitter import join_sentences, split_sentences
+from core.translator import Translator
+
+LONG_PUNCTUATED = (
+    "Bom dia a todos e obrigado pela presença. "
+    "Hoje vamos falar sobre o orçamento do próximo ano. "
+    "Depois abrimos para as perguntas do público."
+)
+LONG_UNPUNCTUATED = (
+    "eu estava pensando que a gente poderia ir ao mercado amanhã cedo "
+    "mas a chuva pode atrapalhar porque a previsão indica tempestade forte"
+)
+
+
+class DelayClient:
+    """Cliente falso com latência por frase (a primeira é a mais rápida)."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delays.get(text.split()[0], 0.0))
+        with self._lock:
+            self.active -= 1
+        return text.upper()
+
+
+class TestSplitSentences:
+    def test_short_text_is_kept(self):
+        assert split_sentences("bom dia") == ["bom dia"]
+        assert split_sentences("   ") == []
+
+    def test_splits_on_sentence_punctuation(self):
+        assert split_sentences(LONG_PUNCTUATED) == [
+            "Bom dia a todos e obrigado pela presença.",
+            "Hoje vamos falar sobre o orçamento do próximo ano.",
+            "Depois abrimos para as perguntas do público.",
+        ]
+
+    def test_unpunctuated_text_splits_before_conjunctions(self):
+        assert split_sentences(LONG_UNPUNCTUATED) == [
+            "eu estava pensando que a gente poderia ir ao mercado amanhã cedo",
+            "mas a chuva pode atrapalhar",
+            "porque a previsão indica tempestade forte",
+        ]
+
+    def test_pieces_respect_limits(self):
+        text = " ".join(["palavra"] * 60)
+
+        pieces = split_sentences(text, max_chars=80, min_chars=20)
+
+        assert " ".join(pieces) == text
+        assert all(20 <= len(p) <= 80 for p in pieces)
+
+    def test_join_follows_target_script(self):
+        pieces = ["おはようございます。", "今日は予算の話です。"]
+
+        assert (
+            join_sentences(pieces, "ja") == "おはようございます。今日は予算の話です。"
+        )
+        assert join_sentences(["早上好。", "谢谢。"], "zh-CN") == "早上好。谢谢。"
+        assert join_sentences(["Good morning.", "Thanks."], "en") == (
+            "Good morning. Thanks."
+        )
+
+
+class TestSplitTranslation:
+    def setup_method(self):
+        metrics.reset()
+
+    def test_pieces_run_concurrently_and_keep_order(self):
+        client = DelayClient({"Bom": 0.05, "Hoje": 0.2, "Depois": 0.2})
+        translator = Translator(client=client, split_chars=80, split_concurrency=3)
+        prefixes = []
+
+        start = time.perf_counter()
+        translation = translator.translate(LONG_PUNCTUATED, on_piece=prefixes.append)
+
+        assert time.perf_counter() - start < 0.35  # não 0.45 s em série
+        assert client.max_active == 3
+        assert translation == LONG_PUNCTUATED.upper()
+        assert prefixes[0] == "BOM DIA A TODOS E OBRIGADO PELA PRESENÇA."
+        assert len(prefixes) == 2
+
+    def test_cjk_target_joins_without_spaces(self):
+        client = Mock()
+        client.translate.side_effect = lambda text: {
+            "Bom": "皆さん、おはようございます。"
+        }.get(text.split()[0], "次に質問を受け付けます。")
+        translator = Translator(to_code="ja", client=client, split_chars=80)
+
+        translation = translator.translate(LONG_PUNCTUATED)
+
+        assert " " not in translation
+        assert translation.startswith("皆さん、おはようございます。次に")
+
+    def test_concurrency_is_bounded(self):
+        client = DelayClient({"Bom": 0.05, "Hoje": 0.05, "Depois": 0.05})
+        translator = Translator(client=client, split_chars=80, split_concurrency=2)
+
+        translator.translate(LONG_PUNCTUATED)
+
+        assert client.max_active == 2
+
+    def test_split_disabled_by_default(self):
+        client = Mock()
+        client.translate.return_value = "ok"
+
+        Translator(client=client).translate(LONG_PUNCTUATED)
+
+        client.translate.assert_called_once_with(LONG_PUNCTUATED)
+        assert Translator.from_config({}).split_chars == 0
+
+    def test_failed_piece_fails_whole_text(self):
+        """Testa que uma parte com erro não gera uma linha meio traduzida."""
+
+        def translate(text):
+            if text.startswith("Hoje"):
+                raise TranslationError("HTTP 503 do tradutor")
+            return text.upper()
+
+        client = Mock()
+        client.translate.side_effect = translate
+        translator = Translator(client=client, split_chars=80)
+        assert translator.translate(LONG_PUNCTUATED) == LONG_PUNCTUATED
+
+        translator.raise_errors = True
+        with pytest.raises(TranslationError):
+            translator.translate(LONG_PUNCTUATED)
+
+
+class TestProgressivePipeline:
+    def test_first_sentence_shown_before_whole_block(self):
+        transcriber = Mock()
+        translator = Translator(
+            client=DelayClient({}), split_chars=80, split_concurrency=3
+        )
+        thread = ProcessingThread(Mock(), transcriber, translator)
+
+        translation, shown = thread._translate_progressive(
+            LONG_PUNCTUATED, thread._result_queue.put
+        )
+
+        assert shown
+        first = thread._result_queue.get_nowait()
+        assert first["type"] == "text"
+        assert first["translation"].startswith("BOM DIA")
+        assert first["translation"].endswith("…")
+        assert thread._result_queue.get_nowait()["type"] == "replace"
+        assert translation == LONG_PUNCTUATED.upper()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
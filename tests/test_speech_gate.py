@@ -0,0 +1,127 @@
+"""
+Testes unitários para speech_gate.py
+"""
+
+import numpy as np
+import pytest
+
+from core.base_engine import BaseAudioEngine
+from core.metrics import metrics
+from core.speech_gate import SpeechVerifier, segment_stats
+
+SR = 16000
+FRAME_BYTES = 480 * 2  # 30ms
+
+
+def frames_of(pattern, voiced_energy=3000.0, noise_energy=100.0):
+    """Monta frames (offset, energia, fala) a partir de uma string '1'/'0'."""
+    return [
+        (i * FRAME_BYTES, voiced_energy if c == "1" else noise_energy, c == "1")
+        for i, c in enumerate(pattern)
+    ]
+
+
+class CountingEngine(BaseAudioEngine):
+    def recognize(self, audio_data_bytes):
+        return "texto"
+
+
+class TestSpeechVerifier:
+    """Testes para o verificador de presença de fala."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_segment_stats(self):
+        frames = frames_of("0011111000")
+        stats = segment_stats(frames, len(frames) * FRAME_BYTES, SR)
+
+        assert stats.duration_s == pytest.approx(0.3)
+        assert stats.voiced_s == pytest.approx(0.15)
+        assert stats.speech_ratio == pytest.approx(1.0)
+        assert stats.longest_voiced_s == pytest.approx(0.15)
+        assert stats.energy_contrast == pytest.approx(30.0)
+
+    def test_accepts_speech(self):
+        verifier = SpeechVerifier()
+        frames = frames_of("1" * 30 + "0" * 15)
+
+        assert verifier.accept(frames, len(frames) * FRAME_BYTES, SR)
+        assert metrics.counter("verifier.accepted") == 1
+
+    def test_rejects_cough(self):
+        """Tosse curta seguida do post-roll: pouca fala no total."""
+        verifier = SpeechVerifier(min_voiced_seconds=0.25)
+        frames = frames_of("11111" + "0" * 15)
+
+        assert not verifier.accept(frames, len(frames) * FRAME_BYTES, SR)
+        assert metrics.counter("verifier.rejected.voiced_duration") == 1
+        assert metrics.counter("verifier.rejected_audio_s") == pytest.approx(0.6)
+
+    def test_rejects_keyboard_burst(self):
+        """Cliques isolados: frames de fala sem trecho contínuo."""
+        verifier = SpeechVerifier(min_speech_ratio=0.3)
+        frames = frames_of("10" * 20)
+
+        assert not verifier.accept(frames, len(frames) * FRAME_BYTES, SR)
+        assert metrics.counter("verifier.rejected.voiced_run") == 1
+
+    def test_rejects_low_speech_ratio(self):
+        """Dois estalos longe um do outro: pouca fala entre o primeiro e o último."""
+        verifier = SpeechVerifier(min_speech_ratio=0.3)
+        frames = frames_of("0" * 7 + "11111" + "0" * 30 + "11111" + "0" * 15)
+
+        assert not verifier.accept(frames, len(frames) * FRAME_BYTES, SR)
+        assert metrics.counter("verifier.rejected.speech_ratio") == 1
+
+    def test_accepts_short_answer_with_padding(self):
+        """Um "sim" de ~0,4 s com pre-roll, post-roll e silêncio do endpoint."""
+        verifier = SpeechVerifier()
+        frames = frames_of("0" * 7 + "1" * 13 + "0" * 15 + "0" * 15)
+
+        stats = segment_stats(frames, len(frames) * FRAME_BYTES, SR)
+        assert stats.speech_ratio == pytest.approx(1.0)
+        assert verifier.accept(frames, len(frames) * FRAME_BYTES, SR)
+
+    def test_rejects_flat_noise(self):
+        """Ruído estacionário marcado como fala: energia igual ao fundo."""
+        verifier = SpeechVerifier()
+        frames = frames_of("1" * 30 + "0" * 10, voiced_energy=400, noise_energy=380)
+
+        assert not verifier.accept(frames, len(frames) * FRAME_BYTES, SR)
+        assert metrics.counter("verifier.rejected.energy_contrast") == 1
+
+    def test_engine_drops_rejected_segment(self):
+        """Testa que o engine não despacha o segmento rejeitado."""
+        engine = CountingEngine(SR)
+        engine.silence_threshold_frames = 15
+        engine.verifier = SpeechVerifier()
+        loud = (np.ones(480, dtype=np.int16) * 3000).tobytes()
+        quiet = (np.ones(480, dtype=np.int16) * 50).tobytes()
+
+        # Clique isolado: alguns frames de fala e post-roll
+        result = (None, None)
+        for i in range(40):
+            raw = i in (0, 2, 4)
+            result = engine.process_audio(
+                loud if raw else quiet, is_speech=i < 20, raw_speech=raw
+            )
+            if result[1]:
+                break
+        assert result == (None, None)
+        assert metrics.counter("verifier.rejected") == 1
+
+        # Fala de verdade passa
+        for i in range(60):
+            raw = i < 30
+            status, segment = engine.process_audio(
+                loud if raw else quiet, is_speech=i < 45, raw_speech=raw
+            )
+            if segment:
+                break
+        assert segment is not None
+        assert metrics.counter("verifier.accepted") == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
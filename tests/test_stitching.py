@@ -0,0 +1,55 @@
+"""
+Testes unitários para stitching.py
+"""
+
+import pytest
+
+from core.stitching import normalize_word, stitch
+
+
+class TestStitching:
+    """Testes para a costura de transcrições sobrepostas."""
+
+    def test_normalize_word(self):
+        assert normalize_word("Ação,") == "acao"
+        assert normalize_word("MUNDO!") == "mundo"
+
+    def test_removes_duplicated_overlap(self):
+        """Testa remoção das palavras repetidas na borda."""
+        previous = "hoje nós vamos falar sobre o projeto"
+        current = "sobre o projeto e os próximos passos"
+
+        assert stitch(previous, current) == "e os próximos passos"
+
+    def test_tolerates_cut_word_and_punctuation(self):
+        """Testa tolerância a uma palavra cortada e a pontuação diferente."""
+        previous = "vamos falar sobre o Projeto, com"
+        current = "sobre o projeto com calma"
+
+        # Maiúsculas e pontuação não impedem o alinhamento
+        assert stitch(previous, current) == "calma"
+
+        previous = "o resultado foi muito bo"
+        current = "foi muito bom para todos"
+        assert stitch(previous, current) == "bom para todos"
+
+    def test_keeps_text_without_overlap(self):
+        """Testa que sem sobreposição o texto atual é mantido."""
+        assert stitch("primeira parte", "segunda parte aqui") == "segunda parte aqui"
+        assert stitch("", " texto ") == "texto"
+
+    def test_ignores_match_far_from_borders(self):
+        """Testa que um trecho comum no meio não é tratado como sobreposição."""
+        previous = "o projeto começou ontem à tarde"
+        current = "e hoje o projeto segue bem"
+
+        assert stitch(previous, current) == current
+
+    def test_short_single_word_not_trusted(self):
+        """Testa que uma palavra curta isolada não conta como sobreposição."""
+        assert stitch("eu disse que", "que bom") == "que bom"
+        assert stitch("falamos sobre tradução", "tradução simultânea") == "simultânea"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
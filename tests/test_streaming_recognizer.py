@@ -0,0 +1,180 @@
+"""
+Testes unitários para streaming_recognizer.py (servidor mock com upload chunked)
+"""
+
+import io
+import json
+import time
+from http.server import BaseHTTPRequestHandler
+
+import numpy as np
+import pytest
+
+sf = pytest.importorskip("soundfile")
+
+from core.base_engine import AudioSegment, RecognitionError, synthetic_audio
+from core.google_speech import GoogleSpeechClient
+from core.streaming_recognizer import FlacStreamEncoder, HttpStreamingClient
+from core.transcriber import GoogleEngine
+
+
+class ChunkedSpeechHandler(BaseHTTPRequestHandler):
+    """Mock do protocolo: lê o corpo chunked registrando a chegada de cada chunk."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        assert self.headers.get("Transfer-Encoding") == "chunked"
+        body = bytearray()
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                # Cliente fechou a conexão antes do chunk final
+                self.server.incomplete.append(bytes(body))
+                self.close_connection = True
+                return
+            size = int(line.strip(), 16)
+            if size == 0:
+                self.rfile.readline()
+                break
+            body.extend(self.rfile.read(size))
+            self.rfile.readline()
+            self.server.chunks.append(time.perf_counter())
+        self.server.bodies.append(bytes(body))
+
+        payload = (
+            json.dumps({"result": [{"alternative": [{"transcript": "frase longa"}]}]})
+            + "\n"
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stream_server(local_server):
+    return local_server(ChunkedSpeechHandler, chunks=[], bodies=[], incomplete=[])
+
+
+def client_for(server, **kwargs):
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/recognize"
+    return GoogleSpeechClient(endpoint=endpoint, **kwargs)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestStreamingRecognizer:
+    """Testes para o upload em streaming."""
+
+    def test_flac_stream_matches_file_encoding(self):
+        """Testa que o stream incremental é o FLAC final exceto pelo STREAMINFO."""
+        pcm = synthetic_audio(16000, 1.0)
+        encoder = FlacStreamEncoder(16000)
+        streamed = b""
+        for i in range(0, len(pcm), 960):
+            streamed += encoder.encode(pcm[i : i + 960])
+        streamed += encoder.finish()
+
+        reference = io.BytesIO()
+        sf.write(reference, np.frombuffer(pcm, dtype=np.int16), 16000, format="FLAC")
+        # 4 bytes "fLaC" + 4 de cabeçalho de bloco + 34 de STREAMINFO
+        assert streamed[:4] == b"fLaC"
+        assert len(streamed) == len(reference.getvalue())
+        assert streamed[42:] == reference.getvalue()[42:]
+
+    def test_five_second_sentence_only_last_chunk_in_flight(self, stream_server):
+        """Testa que ao fim da fala apenas o chunk final resta para enviar."""
+        stream = HttpStreamingClient(client_for(stream_server), chunk_ms=250)
+        stream.open()
+
+        pcm = synthetic_audio(16000, 5.0)
+        frame = 960  # 30ms
+        for i in range(0, len(pcm), frame):
+            stream.push(pcm[i : i + frame])
+            time.sleep(0.001)
+
+        # Antes do endpoint o servidor já recebeu tudo o que foi codificado
+        assert wait_for(lambda: len(stream_server.chunks) == stream.chunks_sent)
+        sent_before_end = stream.chunks_sent
+        assert sent_before_end >= 15
+
+        assert stream.finish() == "frase longa"
+        assert stream.chunks_sent == sent_before_end + 1
+        assert stream_server.bodies[0][:4] == b"fLaC"
+
+    def test_abort_discards_stream(self, stream_server):
+        """Testa que abort derruba o upload: o servidor não recebe um corpo completo."""
+        stream = HttpStreamingClient(client_for(stream_server))
+        stream.open()
+        stream.push(synthetic_audio(16000, 0.5))
+        assert wait_for(lambda: stream_server.chunks)
+
+        stream.abort()
+        stream.push(b"\x00\x00" * 100)  # Ignorado após abort
+
+        assert wait_for(lambda: len(stream_server.incomplete) == 1)
+        assert stream_server.incomplete[0][:4] == b"fLaC"
+        assert stream_server.bodies == []
+
+    def test_finish_raises_on_connection_error(self):
+        """Testa que falha de conexão vira RecognitionError no finish."""
+        client = GoogleSpeechClient(
+            endpoint="http://127.0.0.1:9/recognize", connect_timeout=0.5
+        )
+        stream = HttpStreamingClient(client)
+        stream.open()
+        stream.push(synthetic_audio(16000, 0.3))
+
+        with pytest.raises(RecognitionError):
+            stream.finish()
+
+    def test_google_engine_streams_from_speech_onset(self, stream_server):
+        """Testa que o GoogleEngine abre o stream no início da fala."""
+        endpoint = f"http://127.0.0.1:{stream_server.server_address[1]}/recognize"
+        engine = GoogleEngine(16000, endpoint=endpoint, streaming=True)
+        pcm = synthetic_audio(16000, 1.2)
+
+        result = (None, None)
+        for i in range(0, len(pcm), 960):
+            result = engine.process_audio(pcm[i : i + 960], is_speech=True)
+            assert engine.stream is not None
+        result = engine.process_audio(b"\x00\x00" * 480, is_speech=False)
+
+        status, segment = result
+        assert status == ""
+        assert isinstance(segment, AudioSegment)
+        assert segment.stream is not None
+        assert engine.stream is None
+        assert engine.recognize_segment(segment) == "frase longa"
+
+    def test_streaming_sentence_is_one_request(self, stream_server):
+        """Testa que uma frase de 5 s em streaming não é cortada em vários pedidos."""
+        endpoint = f"http://127.0.0.1:{stream_server.server_address[1]}/recognize"
+        engine = GoogleEngine(16000, endpoint=endpoint, streaming=True)
+        pcm = synthetic_audio(16000, 5.0)
+
+        segments = []
+        for i in range(0, len(pcm), 960):
+            _, segment = engine.process_audio(pcm[i : i + 960], is_speech=True)
+            segments += [segment] if segment else []
+        _, segment = engine.process_audio(b"\x00\x00" * 480, is_speech=False)
+        segments.append(segment)
+
+        assert len(segments) == 1
+        assert engine.recognize_segment(segments[0]) == "frase longa"
+        assert len(stream_server.bodies) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+"""
+Testes unitários para translation_batcher.py
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from core.metrics import metrics
+from core.translation_batcher import MicroBatcher, join_batch, split_batch
+from core.translator import Translator
+
+
+class TestBatchText:
+    def test_join_and_split_roundtrip(self):
+        joined = join_batch(["bom dia", "tudo  bem"])
+
+        assert joined == "bom dia\ntudo bem"
+        assert split_batch("good morning\n all good \n", 2) == [
+            "good morning",
+            "all good",
+        ]
+
+    def test_split_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            split_batch("good morning all good", 2)
+
+
+class TestMicroBatcher:
+    def setup_method(self):
+        metrics.reset()
+
+    def test_concurrent_submits_share_one_call(self):
+        calls = []
+
+        def batch_fn(texts):
+            calls.append(list(texts))
+            return [t.upper() for t in texts]
+
+        batcher = MicroBatcher(batch_fn, window_s=0.5, max_batch=4)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(batcher.submit, ["a", "b", "c", "d"]))
+
+        assert results == ["A", "B", "C", "D"]
+        assert len(calls) == 1  # lote cheio: enviado antes da janela acabar
+        assert metrics.counter("translation_batch.segments") == 4
+
+    def test_leftovers_beyond_max_batch_are_sent(self):
+        calls = []
+        barrier = threading.Barrier(3)
+
+        def batch_fn(texts):
+            calls.append(list(texts))
+            return list(texts)
+
+        batcher = MicroBatcher(batch_fn, window_s=0.2, max_batch=2)
+
+        def submit(text):
+            barrier.wait()
+            return batcher.submit(text)
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(submit, ["x", "y", "z"]))
+
+        assert results == ["x", "y", "z"]
+        assert sorted(len(c) for c in calls) == [1, 2]
+
+    def test_errors_reach_every_caller(self):
+        batcher = MicroBatcher(Mock(side_effect=OSError("rede")), window_s=0.01)
+
+        with pytest.raises(OSError):
+            batcher.submit("oi")
+
+
+class TestTranslatorBatching:
+    def setup_method(self):
+        metrics.reset()
+
+    def test_concurrent_translations_use_one_request(self):
+        translator = Translator("pt", "en", batch_window_s=0.5, batch_max=3)
+        translator._translator = Mock()
+        translator._translator.translate.side_effect = lambda text: text.replace(
+            "olá", "hello"
+        )
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(translator.translate, ["olá a", "olá b", "olá c"]))
+
+        assert results == ["hello a", "hello b", "hello c"]
+        translator._translator.translate.assert_called_once()
+
+    def test_batching_is_opt_in(self):
+        """Testa que, por padrão, uma frase isolada não espera a janela."""
+        assert Translator.from_config({}).batcher is None
+        translator = Translator.from_config({"translation_batch_window_ms": 30})
+        assert translator.batcher.window_s == pytest.approx(0.03)
+
+    def test_split_failure_falls_back_to_single_requests(self):
+        translator = Translator("pt", "en")
+        translator._translator = Mock()
+        translator._translator.translate.side_effect = ["merged line", "one", "two"]
+
+        assert translator._translate_batch(["um", "dois"]) == ["one", "two"]
+        assert metrics.counter("translation_batch.split_fallbacks") == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,162 @@
+"""
+Testes unitários para translation_cache.py
+"""
+
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+
+from core.metrics import metrics
+from core.translation_cache import (
+    TranslationCache,
+    cache_from_config,
+    normalize_text,
+    restore_surface,
+)
+from core.translator import Translator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestNormalization:
+    def test_normalize_text(self):
+        assert normalize_text("  Bom   DIA!  ") == "bom dia"
+        assert normalize_text("bom dia") == "bom dia"
+
+    def test_restore_surface(self):
+        assert restore_surface("Bom dia!", "good morning.") == "Good morning!"
+        assert restore_surface("bom dia", "Good morning.") == "Good morning"
+
+
+class TestTranslationCache:
+    def setup_method(self):
+        metrics.reset()
+
+    def test_hit_and_miss_counters(self):
+        cache = TranslationCache()
+
+        assert cache.get("pt", "en", "obrigado") is None
+        cache.put("pt", "en", "obrigado", "thank you")
+
+        assert cache.get("pt", "en", "Obrigado.") == "Thank you."
+        assert cache.get("pt", "es", "obrigado") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert metrics.counter("translation_cache.hits") == 1
+        assert cache.hit_rate() == pytest.approx(1 / 3)
+
+    def test_lru_eviction(self):
+        cache = TranslationCache(max_entries=2)
+        cache.put("pt", "en", "um", "one")
+        cache.put("pt", "en", "dois", "two")
+        cache.get("pt", "en", "um")  # "dois" passa a ser o menos recente
+        cache.put("pt", "en", "três", "three")
+
+        assert cache.get("pt", "en", "dois") is None
+        assert cache.get("pt", "en", "um") == "one"
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = TranslationCache(ttl_seconds=60, clock=clock)
+        cache.put("pt", "en", "oi", "hi")
+
+        clock.now += 61
+        assert cache.get("pt", "en", "oi") is None
+
+    def test_survives_restart_on_disk(self, tmp_path):
+        path = str(tmp_path / "cache" / "translations.db")
+        cache = TranslationCache(path=path)
+        cache.put("pt", "en", "bom dia", "good morning")
+        cache.close()
+
+        reopened = TranslationCache(path=path)
+        assert reopened.get("pt", "en", "bom dia") == "good morning"
+        assert metrics.counter("translation_cache.disk_hits") == 1
+        reopened.close()
+
+    def test_expired_rows_are_purged_on_open(self, tmp_path):
+        path = str(tmp_path / "translations.db")
+        clock = FakeClock()
+        cache = TranslationCache(ttl_seconds=60, path=path, clock=clock)
+        cache.put("pt", "en", "oi", "hi")
+        cache.close()
+
+        clock.now += 61
+        reopened = TranslationCache(ttl_seconds=60, path=path, clock=clock)
+        assert (
+            reopened._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0] == 0
+        )
+
+    def test_backends_do_not_share_entries(self, tmp_path):
+        """Testa que trocar de backend não serve a tradução do anterior."""
+        path = str(tmp_path / "translations.db")
+        cache = TranslationCache(path=path)
+        cache.put("pt", "en", "bom dia", "good morning", backend="google")
+        cache.close()
+
+        reopened = TranslationCache(path=path)
+        assert reopened.get("pt", "en", "bom dia", backend="argos") is None
+        assert reopened.get("pt", "en", "bom dia", backend="google") == "good morning"
+        reopened.close()
+
+    def test_old_disk_cache_without_backend_is_dropped(self, tmp_path):
+        path = str(tmp_path / "translations.db")
+        db = sqlite3.connect(path)
+        db.execute(
+            "CREATE TABLE translations (source TEXT, target TEXT, text TEXT, "
+            "translation TEXT, created_at REAL, PRIMARY KEY (source, target, text))"
+        )
+        db.execute("INSERT INTO translations VALUES ('pt', 'en', 'oi', 'hi', 0)")
+        db.commit()
+        db.close()
+
+        cache = TranslationCache(ttl_seconds=0, path=path)
+        assert cache.get("pt", "en", "oi", backend="google") is None
+        cache.put("pt", "en", "oi", "hello", backend="google")
+        assert cache.get("pt", "en", "oi", backend="google") == "hello"
+        cache.close()
+
+    def test_cache_from_config(self):
+        assert cache_from_config({"translation_cache_enabled": False}) is None
+        assert cache_from_config({}) is cache_from_config({})
+
+
+class TestTranslatorCache:
+    def test_repeated_phrase_skips_network(self):
+        translator = Translator("pt", "en", cache=TranslationCache())
+        translator._translator = Mock()
+        translator._translator.translate.return_value = "good morning"
+
+        assert translator.translate("bom dia") == "good morning"
+        assert translator.translate("Bom dia") == "Good morning"
+        translator._translator.translate.assert_called_once()
+
+    def test_translator_keys_cache_by_backend(self):
+        cache = TranslationCache()
+        google = Translator("pt", "en", cache=cache, client=Mock(), backend="google")
+        google._translator.translate.return_value = "good morning"
+        argos = Translator("pt", "en", cache=cache, client=Mock(), backend="argos")
+        argos._translator.translate.return_value = "good day"
+
+        assert google.translate("bom dia") == "good morning"
+        assert argos.translate("bom dia") == "good day"
+        argos._translator.translate.assert_called_once()
+
+    def test_errors_are_not_cached(self):
+        translator = Translator("pt", "en", cache=TranslationCache())
+        translator._translator = Mock()
+        translator._translator.translate.side_effect = [OSError("rede"), "hello"]
+
+        assert translator.translate("olá") == "olá"
+        assert translator.translate("olá") == "hello"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,155 @@
+"""
+Testes unitários para translation_memory.py
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from core.metrics import metrics
+from core.translation_memory import (
+    TranslationMemory,
+    char_ngrams,
+    dice,
+    memory_from_config,
+)
+from core.translator import Translator
+
+SENTENCE = "vamos revisar o orçamento do projeto amanhã"
+TRANSLATION = "let's review the project budget tomorrow"
+
+
+class TestSimilarity:
+    def test_identical_and_disjoint(self):
+        grams = char_ngrams("bom dia")
+
+        assert dice(grams, grams) == 1.0
+        assert dice(grams, char_ngrams("xyz")) == 0.0
+
+
+class TestTranslationMemory:
+    def setup_method(self):
+        metrics.reset()
+
+    def test_near_duplicate_is_served(self):
+        memory = TranslationMemory(threshold=0.85)
+        memory.add("pt", "en", SENTENCE, TRANSLATION)
+
+        match = memory.lookup(
+            "pt", "en", "então vamos revisar o orçamento do projeto amanhã"
+        )
+
+        assert match is not None
+        assert match.translation == TRANSLATION
+        assert match.similarity >= 0.85
+        assert metrics.counter("translation_memory.hits") == 1
+
+    def test_different_sentence_misses(self):
+        memory = TranslationMemory(threshold=0.85)
+        memory.add("pt", "en", SENTENCE, TRANSLATION)
+
+        assert memory.lookup("pt", "en", "o servidor caiu durante a noite toda") is None
+        assert memory.lookup("pt", "es", SENTENCE) is None  # outro par de idiomas
+        assert memory.hit_rate() == 0.0
+
+    def test_negation_is_never_ignored(self):
+        memory = TranslationMemory()
+        memory.add(
+            "pt",
+            "en",
+            "eu não quero ir embora para casa agora",
+            "I don't want to go home now",
+        )
+
+        assert memory.lookup("pt", "en", "eu quero ir embora para casa agora") is None
+
+    def test_antonym_is_not_served(self):
+        memory = TranslationMemory()
+        memory.add(
+            "pt",
+            "en",
+            "o projeto foi aprovado pela diretoria ontem",
+            "the project was approved by the board yesterday",
+        )
+        text = "o projeto foi reprovado pela diretoria ontem"
+
+        assert (
+            dice(
+                char_ngrams(text),
+                char_ngrams("o projeto foi aprovado pela diretoria ontem"),
+            )
+            >= memory.threshold
+        )
+        assert memory.lookup("pt", "en", text) is None
+
+    def test_punctuation_and_fillers_are_ignored(self):
+        memory = TranslationMemory(threshold=0.85)
+        memory.add("pt", "en", SENTENCE, TRANSLATION)
+
+        match = memory.lookup(
+            "pt", "en", "Vamos, né, revisar o orçamento do projeto amanhã"
+        )
+
+        assert match is not None
+        assert match.translation == TRANSLATION
+
+    def test_short_sentences_are_not_fuzzy_matched(self):
+        memory = TranslationMemory(min_chars=16)
+        memory.add("pt", "en", "eu quero", "I want")
+
+        assert memory.lookup("pt", "en", "eu não quero") is None
+        assert len(memory) == 0
+
+    def test_oldest_entries_are_evicted(self):
+        memory = TranslationMemory(max_entries=1)
+        memory.add("pt", "en", SENTENCE, TRANSLATION)
+        memory.add("pt", "en", "o servidor caiu durante a noite toda", "the server")
+
+        assert memory.lookup("pt", "en", SENTENCE) is None
+        assert len(memory) == 1
+        assert memory._index  # índice só com a entrada restante
+
+    def test_threshold_from_config(self):
+        memory = memory_from_config(
+            {"translation_memory_enabled": True, "translation_memory_threshold": 0.95}
+        )
+
+        assert memory.threshold == 0.95
+        assert memory_from_config({}) is None  # desligada por padrão
+
+
+class TestTranslatorMemory:
+    def test_fuzzy_hit_skips_network_and_refreshes(self):
+        translator = Translator("pt", "en", memory=TranslationMemory(threshold=0.85))
+        translator._translator = Mock()
+        translator._translator.translate.side_effect = [
+            TRANSLATION,
+            "so let's review the project budget tomorrow",
+        ]
+        variant = "Então vamos revisar o orçamento do projeto amanhã"
+
+        translator.translate(SENTENCE)
+        result = translator.translate(variant)
+
+        assert result == "Let's review the project budget tomorrow"
+        # Retradução exata em segundo plano passa a servir a própria frase
+        translator._refresh_executor.shutdown(wait=True)
+        assert translator._translator.translate.call_count == 2
+        match = translator.memory.lookup("pt", "en", variant)
+        assert match.translation == "so let's review the project budget tomorrow"
+
+    def test_refresh_can_be_disabled(self):
+        translator = Translator(
+            "pt", "en", memory=TranslationMemory(threshold=0.85), refresh_fuzzy=False
+        )
+        translator._translator = Mock()
+        translator._translator.translate.return_value = TRANSLATION
+
+        translator.translate(SENTENCE)
+        translator.translate("então vamos revisar o orçamento do projeto amanhã")
+
+        translator._translator.translate.assert_called_once()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
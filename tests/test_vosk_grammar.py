@@ -0,0 +1,93 @@
+"""
+Testes unitários para o modo gramática do VoskEngine (transcriber.py)
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from core.transcriber import (
+    Transcriber,
+    VoskEngine,
+    grammar_json,
+    load_grammar,
+    strip_unk,
+)
+
+
+class FakeRecognizer:
+    """Imita o vosk.KaldiRecognizer, registrando a gramática recebida."""
+
+    def __init__(self, model, sample_rate, grammar=None):
+        self.model = model
+        self.grammar = grammar
+
+    def SetWords(self, enabled):
+        pass
+
+
+class TestGrammarHelpers:
+    def test_grammar_json_normalizes_and_adds_unk(self):
+        grammar = json.loads(grammar_json(["Abrir Menu", "abrir  menu", " ajuda "]))
+
+        assert grammar == ["abrir menu", "ajuda", "[unk]"]
+
+    def test_empty_grammar_means_open_vocabulary(self):
+        assert grammar_json(None) is None
+        assert grammar_json(["", "  "]) is None
+
+    def test_load_grammar_merges_list_and_file(self, tmp_path):
+        path = tmp_path / "frases.txt"
+        path.write_text("pagar\n\ncancelar\n", encoding="utf-8")
+
+        phrases = load_grammar({"vosk_grammar": ["ajuda"], "vosk_grammar_file": path})
+
+        assert phrases == ["ajuda", "pagar", "cancelar"]
+
+    def test_missing_grammar_file_is_ignored(self, tmp_path):
+        assert load_grammar({"vosk_grammar_file": tmp_path / "nada.txt"}) == []
+
+    def test_strip_unk(self):
+        assert strip_unk("[unk] abrir menu [unk]") == "abrir menu"
+
+
+class TestVoskGrammarMode:
+    """Testes para a troca de gramática sem recarregar o modelo."""
+
+    def make_engine(self, grammar=None):
+        engine = VoskEngine("missing", 16000, grammar=grammar)
+        engine.model = object()  # modelo "carregado"
+        engine.recognizer = engine._new_recognizer()
+        return engine
+
+    @patch("core.transcriber.vosk.KaldiRecognizer", FakeRecognizer)
+    def test_grammar_recognizer(self):
+        engine = self.make_engine(["sim", "não"])
+
+        assert json.loads(engine.recognizer.grammar) == ["sim", "não", "[unk]"]
+
+    @patch("core.transcriber.vosk.KaldiRecognizer", FakeRecognizer)
+    def test_set_grammar_keeps_model(self):
+        engine = self.make_engine()
+        model = engine.model
+        assert engine.recognizer.grammar is None
+
+        engine.set_grammar(["pagar"])
+        assert engine.model is model
+        assert json.loads(engine.recognizer.grammar) == ["pagar", "[unk]"]
+
+        engine.set_grammar(None)
+        assert engine.recognizer.grammar is None
+
+    @patch("core.transcriber.vosk.KaldiRecognizer", FakeRecognizer)
+    def test_transcriber_forwards_to_vosk(self):
+        transcriber = Transcriber("missing")
+        transcriber.engine.model = object()
+
+        assert transcriber.set_grammar(["ajuda"]) is True
+        assert json.loads(transcriber.engine.recognizer.grammar) == ["ajuda", "[unk]"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -7,6 +7,9 @@ import json
 class OverlayWindow(QWidget):
     request_restart_audio = Signal(int) # Signal to main thread to restart audio
     request_full_restart = Signal() # New signal for model/lang changes
+    request_language_change = Signal(str) # Target language only: no model reload
+    request_pipeline_pause = Signal(bool) # Calibration running: pause live decoding
+    request_grammar_change = Signal() # Vosk grammar only: no model reload
     closed_signal = Signal() # New signal to tell main to quit
 
     def __init__(self, config=None, audio_handler=None):
@@ -44,6 +47,11 @@ class OverlayWindow(QWidget):
         self.status_label.setFont(QFont("Segoe UI Emoji", 16))
         self.status_label.setStyleSheet("color: red;")
         
+        # True while recognition is routed to the offline engine (network outage)
+        self._offline_route = False
+        # True while translation fails (lines show only the transcript)
+        self._translation_down = False
+
         self.pause_label = QLabel("⏸", self)
         self.pause_label.setFont(QFont("Segoe UI Emoji", 16))
         self.pause_label.setStyleSheet("color: orange;")
@@ -78,6 +86,7 @@ class OverlayWindow(QWidget):
 
         from collections import deque
         self.history = deque(maxlen=2) # Initialize early
+        self._live = None # (stable prefix, preview translation) of the current partial
         self.max_display_chars = 300 
         
         # Apply styles (this uses self.history now)
@@ -198,10 +207,14 @@ class OverlayWindow(QWidget):
         # SNAPSHOT categorical values to check for changes
         old_dev = self.config.get("audio_device_index")
         old_model = self.config.get("model_type", "small")
+        old_profile = self.config.get("whisper_profile", "balanced")
         old_lang = self.config.get("target_lang", "en")
+        old_backend = self.config.get("translation_backend", "google")
         old_vad = self.config.get("vad_threshold", 300)
+        old_grammar = list(self.config.get("vosk_grammar", []))
         
         dialog = SettingsDialog(self, self.config, self.audio_handler, current_version=self.version)
+        dialog.calibration_running.connect(self.request_pipeline_pause.emit)
         if dialog.exec():
             # Settings were saved to self.config in-place
             self.apply_font_style()
@@ -211,14 +224,24 @@ class OverlayWindow(QWidget):
             # Now compare with snapshot
             new_dev = self.config.get("audio_device_index")
             new_model = self.config.get("model_type", "small")
+            new_profile = self.config.get("whisper_profile", "balanced")
             new_lang = self.config.get("target_lang", "en")
+            new_backend = self.config.get("translation_backend", "google")
             new_vad = self.config.get("vad_threshold", 300)
+            new_grammar = list(self.config.get("vosk_grammar", []))
             
             if new_vad != old_vad and self.audio_handler:
                  self.audio_handler.update_threshold(new_vad)
 
-            if new_model != old_model or new_lang != old_lang:
+            full_restart = new_model != old_model or new_profile != old_profile or new_backend != old_backend
+            if not full_restart and new_grammar != old_grammar:
+                 # A full restart reloads the grammar anyway
+                 self.request_grammar_change.emit()
+
+            if full_restart:
                  self.request_full_restart.emit()
+            elif new_lang != old_lang:
+                 self.request_language_change.emit(new_lang)
             elif new_dev != old_dev:
                  # ONLY restart audio if the device index actually changed
                  self.request_restart_audio.emit(new_dev)
@@ -245,6 +268,7 @@ class OverlayWindow(QWidget):
         
         # 1. Handle "Clear" or empty calls
         if not transcription and not translation:
+             self._live = None
              self.text_label.setText("")
              return
 
@@ -259,7 +283,8 @@ class OverlayWindow(QWidget):
                      break
 
         if translation:
-            # 2. Final result with translation
+            # 2. Final result with translation (replaces any live preview)
+            self._live = None
             # Vertical Block Layout:
             # [ TRANSLATION (GREEN, BIG) ]
             # [ Original (Secondary, Small) ]
@@ -309,10 +334,69 @@ class OverlayWindow(QWidget):
                 while len(self.history) > 2:
                     self.history.popleft()
                 
-                full_html = "".join(self.history)
+                full_html = "".join(self.history) + self._live_html(transcription)
             
             self.text_label.setText(f"<html><body>{full_html}</body></html>")
 
+    def _live_html(self, partial):
+        """Preview translation line, while its prefix is still part of the partial."""
+        if not self._live:
+            return ""
+        prefix, translation = self._live
+        if not (partial + " ").lower().startswith(prefix.lower() + " "):
+            return ""
+        t_color = self.config.get("trans_color", "#39FF14")
+        return f"<div style='color: {t_color}; font-style: italic; font-size: 16px; opacity: 0.8;'>{translation} ...</div>"
+
+    @Slot(str, str)
+    def update_live_translation(self, prefix, translation):
+        """Shows the translation of the stable prefix under the current partial."""
+        marker = "<div style='color: orange; font-style: italic; font-size: 14px;'>... "
+        if not self.history or not self.history[-1].startswith(marker):
+            return  # Final already shown
+        self._live = (prefix, translation)
+        partial = self.history[-1][len(marker):-len("</div>")]
+        full_html = "".join(self.history) + self._live_html(partial)
+        self.text_label.setText(f"<html><body>{full_html}</body></html>")
+
+
+    @Slot(str, str, str)
+    def replace_text(self, old_transcription, transcription, translation):
+        """Replaces a line already shown (e.g. a low-confidence Vosk result refined by the heavy engine)."""
+        t_color = self.config.get("trans_color", "#39FF14")
+        t_size = self.config.get("trans_font_size", 24)
+        o_color = self.config.get("orig_color", "white")
+        o_size = self.config.get("orig_font_size", 16)
+
+        marker = f">{old_transcription}</div>"
+        for i in range(len(self.history) - 1, -1, -1):
+            if marker in self.history[i]:
+                break
+        else:
+            return  # Line already scrolled out
+
+        if translation.strip().lower() == transcription.strip().lower():
+            segment = f"<div style='margin-bottom: 20px;'><div style='color: {t_color}; font-size: {t_size}px; font-weight: bold;'>{translation}</div></div>"
+        else:
+            segment = (
+                f"<div style='margin-bottom: 20px;'>"
+                f"  <div style='color: {t_color}; font-size: {t_size}px; font-weight: bold;'>{translation}</div>"
+                f"  <div style='color: {o_color}; font-size: {o_size}px; opacity: 0.8;'>{transcription}</div>"
+                f"</div>"
+            )
+        self.history[i] = segment
+        self.text_label.setText(f"<html><body>{''.join(self.history)}</body></html>")
+
+    def _set_idle_icon(self):
+        if self._offline_route:
+            self.status_label.setText("📴")
+            self.status_label.setStyleSheet("color: orange;")
+        elif self._translation_down:
+            self.status_label.setText("⚠")
+            self.status_label.setStyleSheet("color: orange;")
+        else:
+            self.status_label.setText("👂")
+            self.status_label.setStyleSheet("color: #888888;") # Gray
 
     @Slot(bool)
     def update_status(self, is_listening):
@@ -321,8 +405,27 @@ class OverlayWindow(QWidget):
             self.status_label.setText("🎤")
             self.status_label.setStyleSheet("color: #00FF00;") # Green
         else:
-            self.status_label.setText("👂")
-            self.status_label.setStyleSheet("color: #888888;") # Gray
+            self._set_idle_icon()
+
+    @Slot(str)
+    def update_route(self, route):
+        self._offline_route = route == "fallback"
+        self._update_status_tooltip()
+
+    @Slot(bool)
+    def update_translation_status(self, ok):
+        self._translation_down = not ok
+        self._update_status_tooltip()
+
+    def _update_status_tooltip(self):
+        notes = []
+        if self._offline_route:
+            notes.append("Sem conexão estável: usando reconhecimento offline (Vosk)")
+        if self._translation_down:
+            notes.append("Tradução indisponível: exibindo só a transcrição")
+        self.status_label.setToolTip("\n".join(notes))
+        if not getattr(self, "_is_listening", False) and not getattr(self, "_is_thinking", False):
+            self._set_idle_icon()
 
     @Slot(bool)
     def update_pause(self, is_paused):
@@ -338,8 +441,7 @@ class OverlayWindow(QWidget):
                  self.status_label.setStyleSheet("color: cyan;")
         else:
             if self.status_label.text() == "🌀":
-                 self.status_label.setText("👂")
-                 self.status_label.setStyleSheet("color: #888888;")
+                 self._set_idle_icon()
             
     def clear_history(self):
         self.history.clear()
@@ -26,6 +26,13 @@ from PySide6.QtCore import Qt, QThread, Signal, QTimer
 from PySide6.QtGui import QColor, QPalette, QFont
 import os
 from download_models import setup_vosk, is_model_installed
+from core.calibration import (
+    calibration_clip,
+    engine_options,
+    format_results,
+    recommend,
+)
+from core.pipeline import CalibrationWorker
 from core.updater import AppUpdater
 
 
@@ -68,6 +75,7 @@ class SettingsDialog(QDialog):
     """Dialog de configurações melhorado com abas e preview ao vivo."""
 
     settings_changed = Signal(dict)  # Sinal para preview ao vivo
+    calibration_running = Signal(bool)  # Pausa o pipeline durante a medição
 
     def __init__(
         self, parent=None, config=None, audio_handler=None, current_version="1.0.0"
@@ -89,7 +97,9 @@ class SettingsDialog(QDialog):
         self.default_config = {
             "source_lang": "pt",
             "target_lang": "en",
+            "translation_backend": "google",
             "model_type": "google",
+            "whisper_profile": "balanced",
             "opacity": 0.69,
             "font_size": 14,
             "always_on_top": True,
@@ -355,6 +365,8 @@ class SettingsDialog(QDialog):
         self.model_combo.addItem("Rápido (Vosk Small)", "small")
         self.model_combo.addItem("Preciso (Vosk Big)", "big")
         self.model_combo.addItem("Ultra (Google Online)", "google")
+        self.model_combo.addItem("Local (Whisper)", "whisper")
+        self.model_combo.addItem("Híbrido (Vosk + revisão)", "hybrid")
         curr_model = self.config.get("model_type", "small")
         idx = self.model_combo.findData(curr_model)
         if idx >= 0:
@@ -370,6 +382,57 @@ class SettingsDialog(QDialog):
         self.progress_bar.setVisible(False)
         audio_lyt.addWidget(self.progress_bar)
 
+        profile_lbl = QLabel("⚡ Perfil do Whisper:")
+        profile_lbl.setToolTip(
+            "Rápido = modelo tiny, sem buscas extras. Preciso = modelo small com beam search "
+            "(mais lento). Meça o desempenho com: python -m core.benchmark whisper"
+        )
+        audio_lyt.addWidget(profile_lbl)
+        self.whisper_profile_combo = NoWheelComboBox()
+        self.whisper_profile_combo.addItem("Rápido (tiny)", "fast")
+        self.whisper_profile_combo.addItem("Equilibrado (base)", "balanced")
+        self.whisper_profile_combo.addItem("Preciso (small)", "accurate")
+        idx = self.whisper_profile_combo.findData(
+            self.config.get("whisper_profile", "balanced")
+        )
+        if idx >= 0:
+            self.whisper_profile_combo.setCurrentIndex(idx)
+        audio_lyt.addWidget(self.whisper_profile_combo)
+
+        grammar_lbl = QLabel("📝 Vocabulário restrito (Vosk):")
+        grammar_lbl.setToolTip(
+            "Frases separadas por ponto e vírgula (ex.: comandos ou termos da "
+            "reunião). O Vosk passa a reconhecer só essas frases; vazio = "
+            "vocabulário completo. Troca sem recarregar o modelo."
+        )
+        audio_lyt.addWidget(grammar_lbl)
+        self.grammar_edit = QLineEdit("; ".join(self.config.get("vosk_grammar", [])))
+        self.grammar_edit.setPlaceholderText("Vocabulário completo")
+        audio_lyt.addWidget(self.grammar_edit)
+
+        calib_lbl = QLabel("📊 Desempenho nesta CPU (RTF):")
+        calib_lbl.setToolTip(
+            "Fator de tempo real medido para cada motor instalado: tempo de "
+            "reconhecimento / duração do áudio. Acima do alvo a legenda atrasa."
+        )
+        audio_lyt.addWidget(calib_lbl)
+        self.calibration_label = QLabel(
+            format_results(
+                self.config.get("calibration_rtf", {}),
+                self.config.get("calibration_target_rtf", 0.5),
+            )
+        )
+        self.calibration_label.setStyleSheet("font-family: monospace;")
+        audio_lyt.addWidget(self.calibration_label)
+        calib_row = QHBoxLayout()
+        self.calibrate_btn = QPushButton("Calibrar agora")
+        self.calibrate_btn.clicked.connect(self.start_calibration)
+        calib_row.addWidget(self.calibrate_btn)
+        self.use_recommended_btn = QPushButton("Usar recomendado")
+        self.use_recommended_btn.clicked.connect(self.use_recommended_engine)
+        calib_row.addWidget(self.use_recommended_btn)
+        audio_lyt.addLayout(calib_row)
+
         vad_lbl = QLabel("🎚️ Sensibilidade Manual (VAD Threshold):")
         vad_lbl.setToolTip(
             "Ajuste a sensibilidade de detecção de voz. Valores menores = mais sensível (detecta sussurros), valores maiores = menos sensível (ignora ruídos)"
@@ -480,6 +543,22 @@ class SettingsDialog(QDialog):
             self.lang_combo.setCurrentIndex(idx)
         trans_lyt.addWidget(self.lang_combo)
 
+        backend_lbl = QLabel("🔌 Motor de Tradução:")
+        backend_lbl.setToolTip(
+            "Offline traduz no próprio computador (sem internet); o modelo é baixado na primeira vez"
+        )
+        trans_lyt.addWidget(backend_lbl)
+        self.backend_combo = NoWheelComboBox()
+        self.backend_combo.addItem("Online (Google)", "google")
+        self.backend_combo.addItem("Offline (Argos)", "argos")
+        self.backend_combo.addItem("Servidor local (LibreTranslate)", "libretranslate")
+        idx = self.backend_combo.findData(
+            self.config.get("translation_backend", "google")
+        )
+        if idx >= 0:
+            self.backend_combo.setCurrentIndex(idx)
+        trans_lyt.addWidget(self.backend_combo)
+
         layout.addWidget(trans_card)
 
         # --- VISUAL CARD ---
@@ -702,6 +781,13 @@ class SettingsDialog(QDialog):
                 self, "Google Mode", "O modo Google Online não precisa de download."
             )
             return
+        if m_type == "whisper":
+            QMessageBox.information(
+                self,
+                "Whisper",
+                "O Whisper baixa o modelo do perfil escolhido no primeiro uso.",
+            )
+            return
 
         self.download_btn.setEnabled(False)
         self.progress_bar.setVisible(True)
@@ -721,6 +807,59 @@ class SettingsDialog(QDialog):
         else:
             QMessageBox.critical(self, "Erro no Download", message)
 
+    def start_calibration(self):
+        if calibration_clip(self.config) is None:
+            QMessageBox.information(
+                self,
+                "Calibração",
+                "Fale por alguns segundos com a tradução ativa para gravar o "
+                "clipe de fala usado na calibração e tente de novo.",
+            )
+            return
+        self.calibrate_btn.setEnabled(False)
+        self.calibrate_btn.setText("Calibrando...")
+        self.calib_thread = CalibrationWorker(options=self.config)
+        self.calib_thread.finished_signal.connect(self.finish_calibration)
+        self.calibration_running.emit(True)
+        self.calib_thread.start()
+
+    def finish_calibration(self, rtfs):
+        self.calibration_running.emit(False)
+        self.calibrate_btn.setEnabled(True)
+        self.calibrate_btn.setText("Calibrar agora")
+        if not rtfs:
+            QMessageBox.warning(
+                self, "Calibração", "Nenhum motor local instalado pôde ser medido."
+            )
+            return
+        # Medições valem mesmo se o diálogo for cancelado
+        self.config["calibration_rtf"] = rtfs
+        self.calibration_label.setText(
+            format_results(rtfs, self.config.get("calibration_target_rtf", 0.5))
+        )
+
+    def use_recommended_engine(self):
+        best = recommend(
+            self.config.get("calibration_rtf", {}),
+            self.config.get("calibration_target_rtf", 0.5),
+        )
+        if not best:
+            QMessageBox.information(
+                self,
+                "Calibração",
+                "Nenhum motor local ficou abaixo do alvo. Use o Google Online "
+                "ou calibre novamente.",
+            )
+            return
+        options = engine_options(best)
+        self.model_combo.setCurrentIndex(
+            self.model_combo.findData(options["model_type"])
+        )
+        if "whisper_profile" in options:
+            self.whisper_profile_combo.setCurrentIndex(
+                self.whisper_profile_combo.findData(options["whisper_profile"])
+            )
+
     def _update_download_btn_visibility(self):
         m_type = self.model_combo.currentData()
         installed = is_model_installed(m_type)
@@ -875,7 +1014,14 @@ class SettingsDialog(QDialog):
         self.config["opacity"] = self.opacity_slider.value() / 100.0
         self.config["audio_device_index"] = self.device_combo.currentData()
         self.config["model_type"] = self.model_combo.currentData()
+        self.config["whisper_profile"] = self.whisper_profile_combo.currentData()
         self.config["target_lang"] = self.lang_combo.currentData()
+        self.config["translation_backend"] = self.backend_combo.currentData()
+        self.config["vosk_grammar"] = [
+            phrase.strip()
+            for phrase in self.grammar_edit.text().split(";")
+            if phrase.strip()
+        ]
         self.config["vad_threshold"] = self.vad_slider.value()
         self.config["trans_color"] = self.trans_color_combo.currentData()
         self.config["trans_font_size"] = self.trans_font_slider.value()
@@ -1023,12 +1169,23 @@ class SettingsDialog(QDialog):
         idx = self.model_combo.findData(model_type)
         if idx >= 0:
             self.model_combo.setCurrentIndex(idx)
+        idx = self.whisper_profile_combo.findData(
+            self.config.get("whisper_profile", "balanced")
+        )
+        if idx >= 0:
+            self.whisper_profile_combo.setCurrentIndex(idx)
+        self.grammar_edit.setText("; ".join(self.config.get("vosk_grammar", [])))
 
         # Idioma
         target_lang = self.config.get("target_lang", "en")
         idx = self.lang_combo.findData(target_lang)
         if idx >= 0:
             self.lang_combo.setCurrentIndex(idx)
+        idx = self.backend_combo.findData(
+            self.config.get("translation_backend", "google")
+        )
+        if idx >= 0:
+            self.backend_combo.setCurrentIndex(idx)
 
         # Visual
         self.width_slider.setValue(self.config.get("win_width", 1000))